@@ -0,0 +1,35 @@
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from apps.accounts.utils.tokens import (
+    get_organization_claims,
+    is_organization_token_current,
+)
+
+
+class OrganizationJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that also validates the organization claims of organization
+    scoped tokens, rejecting them once the member role, member, user or
+    organization changed.
+    """
+
+    def authenticate(self, request):
+        if (result := super().authenticate(request)) is None:
+            return None
+
+        user, token = result
+        if get_organization_claims(token) and not is_organization_token_current(
+            token, user.id
+        ):
+            raise AuthenticationFailed(
+                _('Organization token is no longer valid, log in again.'),
+                code='organization_token_not_valid',
+            )
+        return user, token
+
+
+class OrganizationJWTScheme(SimpleJWTScheme):
+    target_class = 'apps.accounts.authentication.OrganizationJWTAuthentication'
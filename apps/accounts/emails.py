@@ -6,6 +6,7 @@ from apps.generics.mails.bases import CTAEmail, EmailBase
 
 class PasswordResetRequestEmail(EmailBase):
     template_name = 'accounts/emails/base.html'
+    recipient_fields = (*EmailBase.recipient_fields, 'cta.url')
 
     subject = _('Password Reset')
     preheader = _('Use the link below to reset your password.')
@@ -1,4 +1,5 @@
-from django_filters.rest_framework import filterset
+from django.utils.translation import gettext_lazy as _
+from django_filters.rest_framework import filters, filterset
 
 from apps.accounts.models.invitation import Invitation
 from apps.generics.filters.mixins import FilterSetMixin
@@ -7,12 +8,20 @@ from apps.generics.filters.mixins import FilterSetMixin
 class InvitationFilter(FilterSetMixin, filterset.FilterSet):
     """Filter for the Invitation model."""
 
+    is_expired = filters.BooleanFilter(
+        method='filter_is_expired',
+        label=_('Is expired or past its expiration date'),
+    )
+
     class Meta:
         model = Invitation
         fields = {
             'email': ['exact', 'icontains'],
             'is_accepted': ['exact'],
-            'is_expired': ['exact'],
             'expired_at': ['exact', 'gt', 'lt'],
             'role': ['exact', 'in'],
         }
+
+    def filter_is_expired(self, queryset, name, value):
+        """Filter by the effective expiry, computed at query time."""
+        return queryset.annotate_expired().filter(is_effectively_expired=value)
@@ -1,5 +1,7 @@
+from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import filters, filterset
 
+from apps.accounts.choices import MemberRoleChoices
 from apps.accounts.models.member import Member
 from apps.generics.filters.mixins import FilterSetMixin
 
@@ -15,6 +17,11 @@ class MemberFilter(FilterSetMixin, filterset.FilterSet):
         field_name='user__email',
         lookup_expr='icontains',
     )
+    min_role = filters.ChoiceFilter(
+        choices=MemberRoleChoices.choices,
+        method='filter_min_role',
+        label=_('Ranks at least as the role, superusers ranking as owners'),
+    )
 
     class Meta:
         model = Member
@@ -25,3 +32,7 @@ class MemberFilter(FilterSetMixin, filterset.FilterSet):
             'user': ['exact'],
             'role': ['exact', 'in'],
         }
+
+    def filter_min_role(self, queryset, name, value):
+        """Filter by the effective rank of the members, computed in SQL."""
+        return queryset.filter_min_role(value)
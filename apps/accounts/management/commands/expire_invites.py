@@ -1,19 +1,66 @@
+import time
+
+from django.conf import settings
 from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 
 from apps.accounts.models.invitation import Invitation
+from apps.generics.models.counters import reconcile_counters
 
 
 class Command(BaseCommand):
-    help = 'Expire all pending invites that are past their expiration date.'
-
-    def handle(self, *args, **options):
-        from django.utils import timezone
+    help = (
+        'Flag the pending invites that are past their expiration date, in bounded '
+        'batches. Expiry is computed at query time, so this job keeps the '
+        'is_expired flag and the pending indexes tidy, and brings the pending '
+        'invitations counters down as invites pass their expiration date.'
+    )
 
-        expired_invites = Invitation.objects.filter(
-            is_active=True,
-            is_expired=False,
-            expired_at__lt=timezone.now(),
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EXPIRE_INVITES_BATCH_SIZE,
+            help='Number of invites flagged per UPDATE.',
         )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=settings.EXPIRE_INVITES_SLEEP,
+            help='Seconds to wait between batches, to let other writers through.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size, sleep = options['batch_size'], options['sleep']
+        now = timezone.now()
+        count_expired = 0
+        while True:
+            # Each batch is its own short transaction, locking at most batch_size rows
+            ids = list(
+                Invitation.objects.filter(
+                    is_active=True,
+                    is_expired=False,
+                    expired_at__lt=now,
+                ).values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                organization_ids = set(
+                    Invitation.objects.select_for_update()
+                    .filter(id__in=ids)
+                    .values_list('organization_id', flat=True)
+                )
+                count_expired += Invitation.objects.filter(
+                    id__in=ids, is_expired=False
+                ).update(is_expired=True, updated_at=timezone.now())
+                # Past due invitations are no longer pending, but were counted
+                # until now, as nothing wrote them
+                for counter in Invitation.counters:
+                    reconcile_counters(Invitation, counter, organization_ids)
+            if len(ids) < batch_size:
+                break
+            time.sleep(sleep)
 
-        count_expired = expired_invites.update(is_expired=True)
         self.stdout.write(self.style.SUCCESS(f'Expired {count_expired} invites.'))
@@ -1,3 +1,43 @@
+from datetime import datetime
+
+from django.db import models
+from django.utils import timezone
+
 from apps.generics.managers.querysets import BaseManager, BaseQuerySet
 
-InvitationManager = BaseManager.from_queryset(BaseQuerySet)
+
+class InvitationQueryset(BaseQuerySet):
+    @staticmethod
+    def get_expired_condition(now: datetime | None = None) -> models.Q:
+        """
+        Get the condition of the invitations that are effectively expired: flagged
+        as expired or past their expiration date, even if not flagged yet.
+        """
+        return models.Q(is_expired=True) | models.Q(
+            expired_at__isnull=False, expired_at__lte=now or timezone.now()
+        )
+
+    def annotate_expired(self, now: datetime | None = None):
+        """Annotate whether each invitation is effectively expired."""
+        return self.annotate(
+            is_effectively_expired=models.Case(
+                models.When(self.get_expired_condition(now), then=True),
+                default=False,
+                output_field=models.BooleanField(),
+            )
+        )
+
+    def filter_expired(self, now: datetime | None = None):
+        return self.filter(self.get_expired_condition(now))
+
+    def filter_unexpired(self, now: datetime | None = None):
+        return self.filter(is_expired=False).exclude(
+            expired_at__lte=now or timezone.now()
+        )
+
+    def filter_pending(self, now: datetime | None = None):
+        """Filter the active invitations that are neither accepted nor expired."""
+        return self.filter(is_active=True, is_accepted=False).filter_unexpired(now)
+
+
+InvitationManager = BaseManager.from_queryset(InvitationQueryset)
@@ -1,3 +1,28 @@
+from django.db import models
+
+from apps.accounts.choices import MemberRoleChoices
 from apps.generics.managers.querysets import BaseManager, BaseQuerySet
 
-MemberManager = BaseManager.from_queryset(BaseQuerySet)
+
+class MemberQuerySet(BaseQuerySet):
+    @staticmethod
+    def get_role_rank_expression() -> models.Case:
+        """
+        Get the SQL expression of the effective rank of the members, superusers
+        ranking as owners.
+        """
+        return MemberRoleChoices.rank_expression(
+            field='role', promote=models.Q(user__is_superuser=True)
+        )
+
+    def annotate_role_rank(self):
+        return self.annotate(role_rank=self.get_role_rank_expression())
+
+    def filter_min_role(self, role: str):
+        """Filter the members that rank at least as the role, e.g. managers."""
+        return self.annotate_role_rank().filter(
+            role_rank__gte=MemberRoleChoices(role).rank
+        )
+
+
+MemberManager = BaseManager.from_queryset(MemberQuerySet)
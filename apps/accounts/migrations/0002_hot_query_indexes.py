@@ -0,0 +1,33 @@
+# Generated by Django 6.0.3 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['key'], name='invitation_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['organization', '-id'], name='invitation_org_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('is_accepted', False), ('is_active', True), ('is_expired', False)), fields=['email'], name='invitation_pending_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_expired', False)), fields=['expired_at'], name='invitation_pending_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['organization', '-id'], name='member_org_active_idx'),
+        ),
+    ]
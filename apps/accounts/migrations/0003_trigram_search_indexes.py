@@ -0,0 +1,32 @@
+# Generated by Django 6.0.3 on 2026-10-18 02:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+import apps.generics.utils.migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        apps.generics.utils.migrations.AddPostgreSQLIndex(
+            model_name='member',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('nickname', output_field=models.TextField())), name='gin_trgm_ops'), name='member_nickname_trgm_idx'),
+        ),
+        apps.generics.utils.migrations.AddPostgreSQLIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('full_name', output_field=models.TextField())), name='gin_trgm_ops'), name='user_full_name_trgm_idx'),
+        ),
+        apps.generics.utils.migrations.AddPostgreSQLIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('email', output_field=models.TextField())), name='gin_trgm_ops'), name='user_email_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.3 on 2026-10-18 03:22
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+import apps.generics.utils.migrations
+
+
+def count(model, relation: str, **condition):
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(**{relation: models.OuterRef('pk')}, **condition)
+            .order_by()
+            .values(relation)
+            .annotate(count=models.Count('pk'))
+            .values('count'),
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    """Count the members and pending invitations of the existing organizations."""
+    Organization = apps.get_model('accounts', 'Organization')
+    Member = apps.get_model('accounts', 'Member')
+    Invitation = apps.get_model('accounts', 'Invitation')
+    Organization.objects.update(
+        members_count=count(Member, 'organization', is_active=True),
+        pending_invitations_count=count(
+            Invitation,
+            'organization',
+            is_active=True,
+            is_accepted=False,
+            is_expired=False,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        apps.generics.utils.migrations.AddCounterField(
+            model_name='organization',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active members of the organization', verbose_name='Members count'),
+        ),
+        apps.generics.utils.migrations.AddCounterField(
+            model_name='organization',
+            name='pending_invitations_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of invitations neither accepted nor flagged as expired', verbose_name='Pending invitations count'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
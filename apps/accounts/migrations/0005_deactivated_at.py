@@ -0,0 +1,38 @@
+# Generated by Django 6.0.3 on 2026-10-18 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invitation',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+        migrations.AddField(
+            model_name='organizationprofile',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+    ]
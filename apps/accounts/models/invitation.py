@@ -6,12 +6,13 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.accounts.choices import MemberRoleChoices
-from apps.accounts.managers.invitation import InvitationManager
+from apps.accounts.managers.invitation import InvitationManager, InvitationQueryset
 from apps.generics.models.abstracts import BaseModel
+from apps.generics.models.counters import CountedModelMixin, Counter
 from apps.generics.utils.shortcuts import get_object_or_none
 
 
-class Invitation(BaseModel):
+class Invitation(CountedModelMixin, BaseModel):
     email = models.EmailField(
         verbose_name=_('Email'),
         help_text=_('Email of the user to invite'),
@@ -65,28 +66,68 @@ class Invitation(BaseModel):
 
     objects = InvitationManager()
 
+    # Pending until accepted or effectively expired. Nothing writes the rows when
+    # they pass their expiration date, so the `expire_invites` job reconciles the
+    # counters of their organizations
+    counters = (Counter('organization', 'pending_invitations_count'),)
+    counted_fields = ('is_active', 'is_accepted', 'is_expired', 'expired_at')
+
     class Meta:
         ordering = ['-id']
         verbose_name = _('Invitation')
         verbose_name_plural = _('Invitations')
+        indexes = [
+            models.Index(fields=['key'], name='invitation_key_idx'),
+            models.Index(
+                fields=['organization', '-id'],
+                condition=models.Q(is_active=True),
+                name='invitation_org_active_idx',
+            ),
+            models.Index(
+                fields=['email'],
+                condition=models.Q(is_active=True, is_expired=False, is_accepted=False),
+                name='invitation_pending_email_idx',
+            ),
+            models.Index(
+                fields=['expired_at'],
+                condition=models.Q(is_active=True, is_expired=False),
+                name='invitation_pending_expiry_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.email
 
+    @classmethod
+    def get_counted_condition(cls) -> models.Q:
+        return (
+            models.Q(is_active=True, is_accepted=False)
+            & ~InvitationQueryset.get_expired_condition()
+        )
+
+    def is_counted(self) -> bool:
+        return self.is_active and not self.is_accepted and not self.has_expired()
+
     def get_user(self):
         """Get the user associated with the invitation email."""
         return get_object_or_none(get_user_model(), email=self.email, is_active=True)
 
+    def has_expired(self) -> bool:
+        """
+        Check if the invitation is effectively expired, i.e. flagged as expired or
+        past its expiration date, even if the `expire_invites` job has not flagged
+        it yet.
+        """
+        return self.is_expired or bool(
+            self.expired_at and self.expired_at <= timezone.now()
+        )
+
     def is_acceptable(self) -> tuple[bool, str]:
         """
-        Check if the invitation is acceptable or not.
+        Check if the invitation is acceptable or not, without writing to it.
         :return: Tuple of boolean and message.
         """
-        if self.is_expired:
-            return False, str(_('Invitation is expired'))
-        elif self.expired_at and self.expired_at <= timezone.now():
-            self.is_expired = True
-            self.save()
+        if self.has_expired():
             return False, str(_('Invitation is expired'))
         elif (user := self.get_user()) and self.organization.members.filter(
             user=user
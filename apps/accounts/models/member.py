@@ -2,14 +2,17 @@ from django.conf import settings
 from django.db import models
 from django.db.models.expressions import Case, Value, When
 from django.db.models.functions import Concat
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from apps.accounts.choices import MemberRoleChoices
 from apps.accounts.managers.member import MemberManager
 from apps.generics.models.abstracts import BaseModel
+from apps.generics.models.counters import CountedModelMixin, Counter
+from apps.generics.models.indexes import upper_trigram_index
 
 
-class Member(BaseModel):
+class Member(CountedModelMixin, BaseModel):
     nickname = models.CharField(
         max_length=100,
         verbose_name=_('Nickname'),
@@ -41,11 +44,22 @@ class Member(BaseModel):
 
     objects = MemberManager()
 
+    counters = (Counter('organization', 'members_count'),)
+    cascade_relations = ('teams',)
+
     class Meta:
         ordering = ['-id']
         verbose_name = _('Member')
         verbose_name_plural = _('Members')
         unique_together = [['user', 'organization'], ['nickname', 'organization']]
+        indexes = [
+            models.Index(
+                fields=['organization', '-id'],
+                condition=models.Q(is_active=True),
+                name='member_org_active_idx',
+            ),
+            upper_trigram_index('nickname', name='member_nickname_trgm_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} - {self.organization}'
@@ -66,21 +80,34 @@ class Member(BaseModel):
     def is_member(self) -> bool:
         return self.role == MemberRoleChoices.MEMBER
 
+    @cached_property
+    def is_superuser(self) -> bool:
+        """Whether the user of the member is a superuser, loaded once per member."""
+        return self.user.is_superuser
+
+    def has_rank(self, role: str) -> bool:
+        """
+        Check if the member ranks at least as the role. The user is only loaded
+        when the role of the member ranks lower, for the superuser override.
+        """
+        rank = MemberRoleChoices(role).rank
+        return MemberRoleChoices.get_rank(self.role) >= rank or self.is_superuser
+
     @property
     def has_owner_permission(self) -> bool:
-        return self.is_owner or self.user.is_superuser
+        return self.has_rank(MemberRoleChoices.OWNER)
 
     @property
     def has_admin_permission(self) -> bool:
-        return self.is_admin or self.has_owner_permission
+        return self.has_rank(MemberRoleChoices.ADMIN)
 
     @property
     def has_manager_permission(self) -> bool:
-        return self.is_manager or self.has_admin_permission
+        return self.has_rank(MemberRoleChoices.MANAGER)
 
     @property
     def has_member_permission(self) -> bool:
-        return self.is_member or self.has_manager_permission
+        return self.has_rank(MemberRoleChoices.MEMBER)
 
     @classmethod
     def label_expression(
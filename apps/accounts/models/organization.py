@@ -6,9 +6,10 @@ from apps.accounts.managers.organization import (
     OrganizationProfileManager,
 )
 from apps.generics.models.abstracts import BaseModel
+from apps.generics.models.counters import CounterFieldsMixin
 
 
-class Organization(BaseModel):
+class Organization(CounterFieldsMixin, BaseModel):
     name = models.CharField(
         max_length=255, verbose_name=_('Name'), help_text=_('Organization name')
     )
@@ -24,9 +25,24 @@ class Organization(BaseModel):
         null=True,
         blank=True,
     )
+    members_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Members count'),
+        help_text=_('Number of active members of the organization'),
+    )
+    pending_invitations_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Pending invitations count'),
+        help_text=_('Number of invitations neither accepted nor flagged as expired'),
+    )
 
     objects = OrganizationManager()
 
+    counter_fields = ('members_count', 'pending_invitations_count')
+    cascade_relations = ('members', 'teams', 'invitations')
+
     class Meta:
         ordering = ['-id']
         verbose_name = _('Organization')
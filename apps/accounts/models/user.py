@@ -7,6 +7,7 @@ from django.utils.translation import gettext_lazy as _
 
 from apps.accounts.managers.user import UserManager
 from apps.generics.models.abstracts import BaseModel
+from apps.generics.models.indexes import upper_trigram_index
 
 
 def _get_user_full_name_expression() -> models.Expression:
@@ -69,3 +70,9 @@ class User(AbstractUser, BaseModel):
     )
 
     objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            upper_trigram_index('full_name', name='user_full_name_trgm_idx'),
+            upper_trigram_index('email', name='user_email_trgm_idx'),
+        ]
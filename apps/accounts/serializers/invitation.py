@@ -1,10 +1,18 @@
-from django.utils import timezone
+import uuid
+
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.organization import Organization
 from apps.accounts.serializers.mixins import ValidateRoleSerializerMixin
+from apps.generics.choices import BulkResultStatusChoices
+from apps.generics.fields.fields import FieldMixin
+from apps.generics.models.counters import add_to_counters
+from apps.generics.serializers.bulk import BulkListSerializer, BulkResultSerializer
 from apps.generics.serializers.mixins import ModelSerializerMixin
+from apps.generics.utils.cache import invalidate_choices
 
 
 class InvitationSerializer(
@@ -28,16 +36,134 @@ class InvitationSerializer(
 
     def validate_email(self, value):
         if value and not self.instance:
-            invitation_queryset = Invitation.objects.filter(
-                email=value,
-                is_active=True,
-                is_expired=False,
-                is_accepted=False,
-            ).exclude(
-                expired_at__lt=timezone.now(),
-            )
-            if invitation_queryset.exists():
+            if Invitation.objects.filter_pending().filter(email=value).exists():
                 raise serializers.ValidationError(
                     _('An invitation with this email already exists.')
                 )
         return value
+
+
+class InvitationBulkItemSerializer(
+    ValidateRoleSerializerMixin, ModelSerializerMixin, serializers.ModelSerializer
+):
+    """Serializer for a row of a bulk invitation."""
+
+    class Meta:
+        model = Invitation
+        fields = ['email', 'role', 'expired_at']
+        list_serializer_class = BulkListSerializer
+
+
+class InvitationBulkCreateSerializer(FieldMixin, serializers.Serializer):
+    """
+    Serializer to invite many users at once.
+    Rows are validated on their own, deduplicated against the pending invitations
+    with a single query and inserted with bulk inserts.
+    """
+
+    default_error_messages = {
+        'duplicate_email': _('An invitation with this email already exists.'),
+    }
+
+    invitations = InvitationBulkItemSerializer(
+        many=True, allow_empty=False, max_length=settings.BULK_MAX_ROWS
+    )
+    atomic = serializers.BooleanField(
+        default=True,
+        help_text=_(
+            'Whether no invitation is created if any row is invalid, otherwise the '
+            'valid rows are created.'
+        ),
+    )
+
+    @staticmethod
+    def get_pending_emails(emails: set[str]) -> set[str]:
+        """Get the emails, among the given ones, with a pending invitation."""
+        return set(
+            Invitation.objects.filter_pending()
+            .filter(email__in=emails)
+            .values_list('email', flat=True)
+        )
+
+    def get_row_email(self, index: int) -> str | None:
+        row = self.initial_data['invitations'][index]
+        return row.get('email') if isinstance(row, dict) else None
+
+    def create(self, validated_data) -> dict:
+        rows = validated_data['invitations']
+        errors = dict(self.fields['invitations'].row_errors)
+        seen = self.get_pending_emails(
+            {row['email'] for row in rows if row is not None}
+        )
+        for index, row in enumerate(rows):
+            if row is None:
+                continue
+            if row['email'] in seen:
+                errors[index] = {'email': [self.error_messages['duplicate_email']]}
+            seen.add(row['email'])
+
+        invitations = {}
+        if not (errors and validated_data['atomic']):
+            invitations = {
+                index: Invitation(
+                    **row,
+                    key=uuid.uuid4(),
+                    organization=self.auth_organization,
+                    created_by=self.auth_user,
+                    updated_by=self.auth_user,
+                )
+                for index, row in enumerate(rows)
+                if row is not None and index not in errors
+            }
+            Invitation.objects.bulk_create(
+                invitations.values(), batch_size=settings.BULK_BATCH_SIZE
+            )
+            if invitations:
+                invalidate_choices(Invitation, self.auth_organization_id)
+                add_to_counters(
+                    Organization,
+                    'pending_invitations_count',
+                    {
+                        self.auth_organization_id: sum(
+                            invitation.is_counted()
+                            for invitation in invitations.values()
+                        )
+                    },
+                )
+
+        results = []
+        for index in range(len(rows)):
+            if invitation := invitations.get(index):
+                status, email, key = (
+                    BulkResultStatusChoices.CREATED,
+                    invitation.email,
+                    invitation.key,
+                )
+            else:
+                status = (
+                    BulkResultStatusChoices.INVALID
+                    if index in errors
+                    else BulkResultStatusChoices.SKIPPED
+                )
+                email, key = self.get_row_email(index), None
+            results.append(
+                {
+                    'index': index,
+                    'status': status,
+                    'email': email,
+                    'key': key,
+                    'errors': errors.get(index),
+                }
+            )
+        return {'created': len(invitations), 'failed': len(errors), 'results': results}
+
+
+class InvitationBulkResultSerializer(BulkResultSerializer):
+    email = serializers.CharField(allow_null=True)
+    key = serializers.UUIDField(allow_null=True)
+
+
+class InvitationBulkResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = InvitationBulkResultSerializer(many=True)
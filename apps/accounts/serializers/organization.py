@@ -14,6 +14,9 @@ class OrganizationSerializer(ModelSerializerMixin, serializers.ModelSerializer):
         model = Organization
         fields = '__all__'
         read_only_fields = ModelSerializerMixin._default_read_only_fields + ['owner']
+        expandable_fields = {
+            'owner': 'apps.accounts.serializers.member.MemberModelSerializer'
+        }
 
     def create(self, validated_data):
         """
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.member import Member
+from apps.accounts.models.organization import Organization
+from apps.accounts.utils.cache import (
+    invalidate_organization_member_context,
+    invalidate_user_member_context,
+)
+from apps.generics.models.cascades import rows_active_changed
+from apps.generics.utils.cache import invalidate_choices
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_member_context_on_member_change(sender, instance: Member, **kwargs):
+    """Invalidate the cached context when a member changes role or is deactivated."""
+    invalidate_user_member_context(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Organization)
+def invalidate_member_context_on_organization_change(
+    sender, instance: Organization, **kwargs
+):
+    """Invalidate the cached context of every member of a changed organization."""
+    invalidate_organization_member_context(instance.id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_member_context_on_user_change(sender, instance, **kwargs):
+    """Invalidate the cached context when a user changes, e.g. a superuser flip."""
+    invalidate_user_member_context(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_choices_on_member_change(sender, instance: Member, **kwargs):
+    """Invalidate the cached choices that read the members of the organization."""
+    invalidate_choices(Member, instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=Invitation)
+def invalidate_choices_on_invitation_change(sender, instance: Invitation, **kwargs):
+    """Invalidate the cached choices that read the invitations of the organization."""
+    invalidate_choices(Invitation, instance.organization_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_choices_on_user_change(sender, instance, **kwargs):
+    """Invalidate the cached choices that read the user, e.g. its full name."""
+    for organization_id in instance.members.values_list('organization_id', flat=True):
+        invalidate_choices(User, organization_id)
+
+
+@receiver(rows_active_changed, sender=Member)
+def invalidate_on_members_active_changed(sender, pks: list[int], **kwargs):
+    """Invalidate the cached context and choices of members flagged in bulk."""
+    organization_ids = set(
+        Member._base_manager.filter(pk__in=pks).values_list(
+            'organization_id', flat=True
+        )
+    )
+    for organization_id in organization_ids:
+        invalidate_organization_member_context(organization_id)
+        invalidate_choices(Member, organization_id)
+
+
+@receiver(rows_active_changed, sender=Invitation)
+def invalidate_choices_on_invitations_active_changed(sender, pks: list[int], **kwargs):
+    """Invalidate the cached choices of the invitations flagged in bulk."""
+    organization_ids = set(
+        Invitation._base_manager.filter(pk__in=pks).values_list(
+            'organization_id', flat=True
+        )
+    )
+    for organization_id in organization_ids:
+        invalidate_choices(Invitation, organization_id)
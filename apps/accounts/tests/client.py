@@ -3,9 +3,30 @@ from rest_framework.test import APIClient
 
 from apps.accounts.factories.members import MemberFactory
 from apps.accounts.models.member import Member
+from apps.accounts.tests.queries import QueryLog
 
 
 class CustomAPIClient(APIClient):
+    def generic(self, method, path, *args, max_queries: int | None = None, **extra):
+        """
+        Make a request, failing if it runs more than `max_queries` queries, e.g.
+        `client.get(url, max_queries=4)`.
+        """
+        if max_queries is None:
+            return super().generic(method, path, *args, **extra)
+        with self.record_queries(max_queries=max_queries, label=f'{method} {path}'):
+            return super().generic(method, path, *args, **extra)
+
+    @staticmethod
+    def record_queries(
+        max_queries: int | None = None, label: str | None = None
+    ) -> QueryLog:
+        """
+        Record the queries of a block, e.g. several requests:
+        `with client.record_queries(max_queries=10) as queries: ...`.
+        """
+        return QueryLog(max_queries=max_queries, label=label)
+
     def force_authenticate(
         self,
         user=None,
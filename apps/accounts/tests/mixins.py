@@ -1,6 +1,15 @@
+import tempfile
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+
 from apps.accounts.factories.organizations import OrganizationFactory
 from apps.accounts.models.organization import Organization
 from apps.accounts.tests.client import CustomAPIClient
+from apps.accounts.utils.cache import member_context_cache
+from apps.generics.utils.cache import choices_cache
+from apps.teams.utils.cache import team_roles_cache
 
 
 class APITestCaseMixin:
@@ -17,3 +26,54 @@ class APITestCaseMixin:
             else:
                 self.client.force_authenticate(user=organization.owner.user)
         return organization
+
+
+class SharedCacheTestCaseMixin:
+    """
+    Mixin for test cases of the versioned caches, which are bypassed without a
+    cache shared by the workers. A file based cache in a temporary directory
+    stands in for Redis: the processes of a host share it, and it runs no query.
+    The invalidations run once the transaction commits, so wrap the writes of a
+    test in `captureOnCommitCallbacks(execute=True)`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        backend = 'django.core.cache.backends.filebased.FileBasedCache'
+        cls.enterClassContext(
+            override_settings(
+                CACHES={'default': {'BACKEND': backend, 'LOCATION': directory.name}}
+            )
+        )
+        super().setUpClass()
+
+    def setUp(self):
+        # The invalidations of the writes of a test only run if it commits, so
+        # nothing cached by a previous test is kept
+        cache.clear()
+        for versioned_cache in [member_context_cache, team_roles_cache, choices_cache]:
+            versioned_cache.clear_local()
+        super().setUp()
+
+
+class QueryPlanTestCaseMixin:
+    def assertUsesIndex(self, queryset, index_name: str):
+        """
+        Assert the query plan of the queryset searches its table through an index.
+        On PostgreSQL, where sequential scans are disabled because the planner
+        prefers them on small tables, the given index must be the one used. SQLite
+        appends the rowid to every index, so a foreign key index already serves
+        `WHERE fk = ? ORDER BY id` and may be picked instead.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        if connection.vendor == 'postgresql':
+            self.assertIn(index_name, plan, msg=f'{index_name} not used:\n{plan}')
+        else:
+            table = queryset.model._meta.db_table
+            self.assertRegex(plan, rf'SEARCH {table} USING (COVERING )?INDEX')
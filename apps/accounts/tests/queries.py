@@ -0,0 +1,138 @@
+import os
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connections
+
+from apps.generics.utils.cache import CacheCallLog
+
+
+class RecordedQuery(NamedTuple):
+    sql: str
+    frames: tuple[str, ...]
+
+
+class QueryLog:
+    """
+    Context manager that records the SQL executed on every database connection,
+    and the calls to the Django caches, with the stack frames of the project code
+    that ran each of them. Both are round trips, so both count in the budget.
+    With a budget, exceeding it fails with the statements that repeated and where
+    from, which points at the N+1 that crept in.
+    """
+
+    # Frames of the project code, outside of the tests
+    frames_root = Path(settings.BASE_DIR) / 'apps'
+    frames_limit = 4
+    # Frames of the ORM, and of the Django cache backends, whose statements are
+    # recorded as the cache call that ran them
+    orm_frames = f'{os.sep}django{os.sep}db{os.sep}'
+    cache_frames = f'{os.sep}django{os.sep}core{os.sep}cache{os.sep}'
+    # Frames of the cache utilities, whose caller made the cache call
+    cache_utils_frames = f'{os.sep}apps{os.sep}generics{os.sep}utils{os.sep}cache.py'
+
+    def __init__(self, max_queries: int | None = None, label: str | None = None):
+        """
+        Initializes a QueryLog instance.
+        :param max_queries: Budget of queries, not checked if not provided.
+        :param label: Description of what runs the queries, e.g. the request.
+        """
+        self.max_queries = max_queries
+        self.label = label or 'The block'
+        self.queries: list[RecordedQuery] = []
+        self._stack = ExitStack()
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def __call__(self, execute, sql, params, many, context):
+        stack = traceback.extract_stack()
+        if not any(self.cache_frames in frame.filename for frame in stack):
+            frames = self.get_frames(stack, self.orm_frames)
+            self.queries.append(RecordedQuery(sql=sql, frames=frames))
+        return execute(sql, params, many, context)
+
+    def record_cache_call(self, description: str):
+        frames = self.get_frames(traceback.extract_stack(), self.cache_utils_frames)
+        self.queries.append(RecordedQuery(sql=f'CACHE {description}', frames=frames))
+
+    def __enter__(self) -> 'QueryLog':
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        self._stack.enter_context(CacheCallLog(on_call=self.record_cache_call))
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._stack.close()
+        if exc_type is None and self.max_queries is not None:
+            if len(self) > self.max_queries:
+                raise AssertionError(self.get_report())
+
+    @staticmethod
+    def format_frame(frame: traceback.FrameSummary) -> str:
+        path = Path(frame.filename)
+        if path.is_relative_to(settings.BASE_DIR):
+            path = path.relative_to(settings.BASE_DIR)
+        elif 'site-packages' in path.parts:
+            path = Path(*path.parts[path.parts.index('site-packages') + 1 :])
+        return f'{path}:{frame.lineno} in {frame.name}'
+
+    def get_frames(
+        self, stack: traceback.StackSummary, library: str
+    ) -> tuple[str, ...]:
+        """
+        Get the frames that ran a statement or a cache call: the innermost one
+        outside of the library that made it, e.g. the serializer field that loaded
+        a relation through the ORM, then the innermost ones of the project code.
+        :param library: Part of the path of the frames of the library.
+        """
+        frames, in_library = [], False
+        for frame in reversed(stack):
+            path = Path(frame.filename)
+            # The innermost frames are the library, and the wrappers within it
+            if not frames:
+                is_library = library in frame.filename
+                in_library = in_library or is_library
+                if not in_library or is_library:
+                    continue
+            elif not path.is_relative_to(self.frames_root) or 'tests' in path.parts:
+                continue
+            frames.append(self.format_frame(frame))
+            if len(frames) == self.frames_limit:
+                break
+        return tuple(frames)
+
+    def get_repeated(self) -> list[tuple[str, int, Counter]]:
+        """Get the statements run more than once, with the frames that ran them."""
+        counts = Counter(query.sql for query in self.queries)
+        return [
+            (
+                sql,
+                count,
+                Counter(query.frames for query in self.queries if query.sql == sql),
+            )
+            for sql, count in counts.most_common()
+            if count > 1
+        ]
+
+    def get_report(self) -> str:
+        lines = [
+            f'{self.label} ran {len(self)} queries, over the budget of '
+            f'{self.max_queries}.'
+        ]
+        if repeated := self.get_repeated():
+            lines.append('Repeated statements:')
+            for sql, count, frames in repeated:
+                lines.append(f'  {count}x {sql}')
+                for stack, stack_count in frames.most_common():
+                    lines.append(f'    {stack_count}x from:')
+                    lines.extend(f'      {frame}' for frame in stack or ['<no frame>'])
+        lines.append('Statements:')
+        lines.extend(
+            f'  {index}. {query.sql}' for index, query in enumerate(self.queries, 1)
+        )
+        return '\n'.join(lines)
@@ -1,5 +1,10 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
@@ -8,6 +13,8 @@ from rest_framework.test import APITestCase
 
 from apps.accounts.factories.users import DEFAULT_PASSWORD
 from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.generics.choices import EmailOutboxStatusChoices
+from apps.generics.models.outbox import EmailOutbox
 
 username_field = get_user_model().USERNAME_FIELD
 
@@ -144,6 +151,28 @@ class AuthAPITestCase(APITestCaseMixin, APITestCase):
         self.assertEqual(response.status_code, http_status.HTTP_200_OK)
         self.assertIn('detail', response.data)
 
+    @override_settings(EMAIL_OUTBOX_ENABLED=True)
+    def test_password_reset_queued_in_outbox(self):
+        """Test the password reset email is queued and sent by the worker."""
+        member = self.organization.owner
+        response = self.client.post(
+            path=self.password_reset_url,
+            data={'email': member.user.email},
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.to, [member.user.email])
+
+        call_command('deliver_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [member.user.email])
+        self.assertEqual(mail.outbox[0].subject, entry.subject)
+        self.assertEqual(mail.outbox[0].alternatives[0].mimetype, 'text/html')
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, EmailOutboxStatusChoices.SENT)
+
     def test_password_reset_invalid_email(self):
         """Test the password reset request view with an invalid email."""
         payload = {
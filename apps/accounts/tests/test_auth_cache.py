@@ -0,0 +1,204 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status as http_status
+from rest_framework.test import APITestCase
+
+from apps.accounts.choices import MemberRoleChoices
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.tests.mixins import APITestCaseMixin, SharedCacheTestCaseMixin
+from apps.accounts.utils.cache import (
+    USER_SCOPE,
+    get_member_context,
+    member_context_cache,
+)
+from apps.generics.utils.cache import CacheCallLog, VersionedTwoTierCache
+
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-context-cache-tests',
+    }
+}
+
+
+class AuthContextCacheAPITestCase(
+    SharedCacheTestCaseMixin, APITestCaseMixin, APITestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        cls.members_url = reverse('accounts:members-list')
+        cls.invitations_url = reverse('accounts:invitations-list')
+        cls.teams_url = reverse('teams:teams-list')
+
+    def setUp(self):
+        super().setUp()
+        member_context_cache.clear_local()
+        self.organization = self.new_account()
+
+    def _count_queries(self, url, requests: int = 5) -> int:
+        """
+        Count the round trips, queries and cache calls, of a number of requests to
+        a list endpoint.
+        """
+        with self.client.record_queries() as queries:
+            for _ in range(requests):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        return len(queries)
+
+    def test_benchmark_list_queries_per_request(self):
+        """
+        Test a cached request makes a single cache call in place of the query of
+        the member, and no round trip within the timeout of the in-process tier.
+        """
+        MemberFactory.create_batch(size=5, organization=self.organization)
+
+        for url in [self.members_url, self.invitations_url, self.teams_url]:
+            with self.settings(AUTH_CONTEXT_CACHE_ENABLED=False):
+                uncached = self._count_queries(url, requests=1)
+            # Another worker filled the shared tier
+            self.client.get(url)
+            member_context_cache.clear_local()
+            self.assertEqual(self._count_queries(url, requests=1), uncached)
+            self.assertEqual(self._count_queries(url, requests=1), uncached - 1)
+
+    def test_member_is_cached_across_requests(self):
+        """Test that the member is loaded once for consecutive requests."""
+        self.client.get(self.members_url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertFalse(
+            any(
+                'WHERE ("accounts_member"."organization_id"' in query['sql']
+                and '"accounts_member"."user_id" =' in query['sql']
+                for query in context.captured_queries
+            )
+        )
+
+    def test_role_change_invalidates_cache(self):
+        """Test that changing the role of the member invalidates the cache."""
+        member = MemberFactory.create(
+            organization=self.organization, role=MemberRoleChoices.ADMIN
+        )
+        self.client.force_authenticate(member=member)
+        response = self.client.get(self.invitations_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+        member.role = MemberRoleChoices.MEMBER
+        with self.captureOnCommitCallbacks(execute=True):
+            member.save()
+
+        response = self.client.get(self.invitations_url)
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+
+    def test_deactivation_invalidates_cache(self):
+        """Test that deactivating the member invalidates the cache."""
+        member = self.organization.owner
+        response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member.inactivate()
+
+        response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+
+    def test_superuser_flip_invalidates_cache(self):
+        """Test that flipping the superuser flag of the user invalidates the cache."""
+        member = MemberFactory.create(
+            organization=self.organization, role=MemberRoleChoices.MEMBER
+        )
+        self.client.force_authenticate(member=member)
+        response = self.client.get(self.invitations_url)
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+
+        member.user.is_superuser = True
+        with self.captureOnCommitCallbacks(execute=True):
+            member.user.save()
+
+        response = self.client.get(self.invitations_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+    def test_organization_change_invalidates_cache(self):
+        """Test that changing the organization invalidates the cached members."""
+        owner = self.organization.owner
+        cached_member = get_member_context(owner.user_id, self.organization.id)
+        self.assertEqual(cached_member.organization.name, self.organization.name)
+
+        self.organization.name = 'Renamed organization'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organization.save()
+
+        cached_member = get_member_context(owner.user_id, self.organization.id)
+        self.assertEqual(cached_member.organization.name, 'Renamed organization')
+
+
+class SharedCacheTestCase(SharedCacheTestCaseMixin, TestCase):
+    def get_worker_caches(self) -> list[VersionedTwoTierCache]:
+        """Get the caches of two workers, without the local tier of each."""
+        return [
+            VersionedTwoTierCache(prefix='workers', local_timeout=0) for _ in range(2)
+        ]
+
+    def test_invalidation_reaches_other_workers(self):
+        """Test an invalidation through a worker is seen by the other worker."""
+        worker, other_worker = self.get_worker_caches()
+        scopes = {USER_SCOPE: 1}
+        self.assertEqual(worker.get_or_set(scopes, lambda: 'stale'), 'stale')
+        self.assertEqual(other_worker.get_or_set(scopes, lambda: 'fresh'), 'stale')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            worker.invalidate(USER_SCOPE, 1)
+        self.assertEqual(other_worker.get_or_set(scopes, lambda: 'fresh'), 'fresh')
+
+    def test_invalidation_waits_for_commit(self):
+        """Test a value cached before the write commits is not served after."""
+        worker, other_worker = self.get_worker_caches()
+        scopes = {USER_SCOPE: 1}
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            worker.invalidate(USER_SCOPE, 1)
+            # Another worker still reads the rows as they were before the commit
+            self.assertEqual(other_worker.get_or_set(scopes, lambda: 'stale'), 'stale')
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(other_worker.get_or_set(scopes, lambda: 'fresh'), 'fresh')
+
+    def test_miss_single_round_trip(self):
+        """Test a miss of the in-process tier makes a single cache call."""
+        worker, other_worker = self.get_worker_caches()
+        scopes = {USER_SCOPE: 1}
+        worker.get_or_set(scopes, lambda: 'value')
+        with CacheCallLog() as cache_calls:
+            self.assertEqual(other_worker.get_or_set(scopes, lambda: None), 'value')
+        self.assertEqual(len(cache_calls), 1)
+
+    def test_database_cache_is_bypassed(self):
+        """Test nothing is cached over the database cache, as costly as a query."""
+        database_caches = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                'LOCATION': 'cache_table',
+            }
+        }
+        with self.settings(CACHES=database_caches):
+            worker = VersionedTwoTierCache(prefix='workers')
+            self.assertFalse(worker.is_enabled)
+            with self.assertNumQueries(0):
+                self.assertEqual(worker.get_or_set({USER_SCOPE: 1}, lambda: 1), 1)
+                worker.invalidate(USER_SCOPE, 1)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_process_local_cache_is_bypassed(self):
+        """Test nothing is cached over a cache the workers do not share."""
+        worker, other_worker = self.get_worker_caches()
+        scopes = {USER_SCOPE: 1}
+        self.assertFalse(worker.is_enabled)
+        self.assertEqual(worker.get_or_set(scopes, lambda: 'stale'), 'stale')
+        self.assertEqual(other_worker.get_or_set(scopes, lambda: 'fresh'), 'fresh')
+
+        member = MemberFactory.create()
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                get_member_context(member.user_id, member.organization_id)
@@ -0,0 +1,148 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.test import APITestCase
+
+from apps.accounts.factories.invitations import InvitationFactory
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.factories.organizations import OrganizationFactory
+from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.member import Member
+from apps.accounts.models.organization import Organization
+from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.teams.factories.team_members import TeamMemberFactory
+from apps.teams.factories.teams import TeamFactory
+from apps.teams.models.team import Team
+from apps.teams.models.team_member import TeamMember
+
+
+class CascadesAPITestCase(APITestCaseMixin, APITestCase):
+    def setUp(self):
+        self.organization = self.new_account()
+
+    def assertActive(self, model, pks, is_active: bool):
+        """Assert the active flag of rows, as saved."""
+        self.assertEqual(
+            set(model.objects.filter(pk__in=pks).values_list('is_active', flat=True)),
+            {is_active},
+        )
+
+    def test_organization_cascade(self):
+        """Test an organization deactivates and reactivates its rows with it."""
+        organization = OrganizationFactory.create()
+        team = TeamFactory.create(organization=organization)
+        team_members = TeamMemberFactory.create_batch(
+            size=2, team=team, organization=organization
+        )
+        invitation = InvitationFactory.create(
+            organization=organization,
+            expired_at=timezone.now() + datetime.timedelta(days=1),
+        )
+        left = MemberFactory.create(organization=organization)
+        left.inactivate()
+        member_ids = [tm.member_id for tm in team_members] + [organization.owner_id]
+
+        with self.client.record_queries(max_queries=30):
+            organization.inactivate()
+        self.assertActive(Member, member_ids, False)
+        self.assertActive(Team, [team.id], False)
+        self.assertActive(TeamMember, [tm.id for tm in team_members], False)
+        self.assertActive(Invitation, [invitation.id], False)
+        organization.refresh_from_db()
+        team.refresh_from_db()
+        self.assertEqual(organization.members_count, 0)
+        self.assertEqual(organization.pending_invitations_count, 0)
+        self.assertEqual(team.members_count, 0)
+
+        organization.activate()
+        self.assertActive(Member, member_ids, True)
+        self.assertActive(TeamMember, [tm.id for tm in team_members], True)
+        self.assertActive(Invitation, [invitation.id], True)
+        # A member deactivated before the organization stays inactive
+        self.assertActive(Member, [left.id], False)
+        organization.refresh_from_db()
+        team.refresh_from_db()
+        self.assertEqual(organization.members_count, 3)
+        self.assertEqual(organization.pending_invitations_count, 1)
+        self.assertEqual(team.members_count, 2)
+
+    def test_reactivation_after_intervening_writes(self):
+        """Test a reactivation restores the rows whose counters moved meanwhile."""
+        organization = OrganizationFactory.create()
+        team = TeamFactory.create(organization=organization)
+        team_member = TeamMemberFactory.create(team=team, organization=organization)
+        organization.inactivate()
+
+        # The counters of the inactive rows are repaired, and the organization
+        # edited, which rewrites their `updated_at`
+        Team.objects.filter(id=team.id).update(members_count=42)
+        Organization.objects.filter(id=organization.id).update(members_count=42)
+        call_command('reconcile_counters', sleep=0, stdout=StringIO())
+        organization.refresh_from_db()
+        organization.name = 'Renamed'
+        organization.save()
+
+        organization.activate()
+        self.assertActive(Member, [organization.owner_id], True)
+        self.assertActive(Team, [team.id], True)
+        self.assertActive(TeamMember, [team_member.id], True)
+        self.assertFalse(
+            Team.objects.filter(id=team.id, deactivated_at__isnull=False).exists()
+        )
+
+    def test_destroy_cascades_to_team_members(self):
+        """Test removing a member or a team deactivates its team memberships."""
+        team = TeamFactory.create(organization=self.organization)
+        team_member, other = TeamMemberFactory.create_batch(
+            size=2, team=team, organization=self.organization
+        )
+        response = self.client.get(reverse('teams:team_members-list'))
+        self.assertEqual(response.data.get('count'), 2)
+
+        response = self.client.delete(
+            reverse('accounts:members-detail', args=[team_member.member_id])
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_204_NO_CONTENT)
+        self.assertActive(TeamMember, [team_member.id], False)
+        team.refresh_from_db()
+        self.assertEqual(team.members_count, 1)
+        response = self.client.get(reverse('teams:team_members-list'))
+        self.assertEqual(response.data.get('count'), 1)
+
+        response = self.client.delete(reverse('teams:teams-detail', args=[team.id]))
+        self.assertEqual(response.status_code, http_status.HTTP_204_NO_CONTENT)
+        self.assertActive(TeamMember, [other.id], False)
+        response = self.client.get(reverse('teams:team_members-list'))
+        self.assertEqual(response.data.get('count'), 0)
+
+    def test_reconcile_cascades(self):
+        """Test the reconcile_cascades command deactivates the stragglers."""
+        teams = TeamFactory.create_batch(size=2, organization=self.organization)
+        team_members = [
+            TeamMemberFactory.create(team=team, organization=self.organization)
+            for team in teams
+        ]
+        inactive_member = MemberFactory.create(organization=self.organization)
+        straggler = TeamMemberFactory.create(
+            member=inactive_member, team=teams[1], organization=self.organization
+        )
+        # Bypass the cascade, as a bulk write would
+        Team.objects.filter(id=teams[0].id).update(is_active=False)
+        Member.objects.filter(id=inactive_member.id).update(is_active=False)
+
+        out = StringIO()
+        call_command('reconcile_cascades', chunk_size=1, sleep=0, stdout=out)
+        self.assertIn('teams.Team.members: deactivated 1 rows.', out.getvalue())
+        self.assertIn('accounts.Member.teams: deactivated 1 rows.', out.getvalue())
+        self.assertActive(TeamMember, [team_members[0].id, straggler.id], False)
+        self.assertActive(TeamMember, [team_members[1].id], True)
+        counts = dict(
+            Team.objects.filter(id__in=[team.id for team in teams]).values_list(
+                'id', 'members_count'
+            )
+        )
+        self.assertEqual(counts, {teams[0].id: 0, teams[1].id: 1})
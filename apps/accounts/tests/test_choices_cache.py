@@ -0,0 +1,93 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status as http_status
+from rest_framework.test import APITestCase
+
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.tests.mixins import APITestCaseMixin, SharedCacheTestCaseMixin
+from apps.generics.utils.cache import choices_cache
+
+
+class ChoicesCacheAPITestCase(SharedCacheTestCaseMixin, APITestCaseMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.choices_url = reverse('accounts:members-choices')
+
+    def setUp(self):
+        super().setUp()
+        choices_cache.clear_local()
+        self.organization = self.new_account()
+        self.member = MemberFactory.create(organization=self.organization)
+
+    def _get_labels(self, url: str | None = None, **params) -> dict[str, str]:
+        response = self.client.get(url or self.choices_url, data=params)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        return {row['value']: row['label'] for row in response.data['results']}
+
+    def test_choices_are_cached(self):
+        """Test that repeated choices requests do not query the choices again."""
+        labels = self._get_labels()
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self._get_labels(), labels)
+        queries = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('_choice_label', queries)
+        # The validators are cached with the choices, so no aggregate runs either
+        self.assertNotIn('COUNT(', queries)
+
+        response = self.client.get(self.choices_url)
+        etag = response.headers['ETag']
+        response = self.client.get(self.choices_url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, http_status.HTTP_304_NOT_MODIFIED)
+
+    def test_choices_are_cached_per_params(self):
+        """Test that filters and pages are cached apart."""
+        MemberFactory.create_batch(size=10, organization=self.organization)
+
+        first_page = self._get_labels()
+        second_page = self._get_labels(page=2)
+        self.assertFalse(set(first_page) & set(second_page))
+        nickname = self.member.nickname
+        self.assertEqual(
+            list(self._get_labels(nickname=nickname)), [str(self.member.id)]
+        )
+
+    def test_choices_invalidated_on_member_change(self):
+        """Test that writing a member invalidates the choices of its organization."""
+        self._get_labels()
+
+        self.member.nickname = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.save()
+        self.assertIn('(renamed)', self._get_labels()[str(self.member.id)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.inactivate()
+        self.assertNotIn(str(self.member.id), self._get_labels())
+
+    def test_choices_invalidated_on_user_change(self):
+        """Test that writing a user invalidates the member choices reading it."""
+        self._get_labels()
+
+        user = self.member.user
+        user.first_name, user.last_name = 'Renamed', 'User'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertIn('Renamed User', self._get_labels()[str(self.member.id)])
+
+    def test_choices_not_shared_across_organizations(self):
+        """Test that the choices of an organization are not served to another."""
+        labels = self._get_labels()
+
+        self.new_account()
+        self.assertFalse(set(labels) & set(self._get_labels()))
+
+    def test_choices_cache_disabled(self):
+        """Test that the choices are queried every time with the cache disabled."""
+        with self.settings(CHOICES_CACHE_ENABLED=False):
+            self._get_labels()
+            with CaptureQueriesContext(connection) as context:
+                self._get_labels()
+        queries = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertIn('_choice_label', queries)
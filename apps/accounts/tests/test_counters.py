@@ -0,0 +1,174 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.test import APITestCase
+
+from apps.accounts.factories.invitations import InvitationFactory
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.member import Member
+from apps.accounts.models.organization import Organization
+from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.teams.factories.team_members import TeamMemberFactory
+from apps.teams.factories.teams import TeamFactory
+from apps.teams.models.team import Team
+
+
+class CountersAPITestCase(APITestCaseMixin, APITestCase):
+    def setUp(self):
+        self.organization = self.new_account()
+
+    def assertCounters(self, instance, **counters):
+        """Assert the counters of an instance, as saved."""
+        instance.refresh_from_db(fields=list(counters))
+        self.assertEqual(
+            {field: getattr(instance, field) for field in counters}, counters
+        )
+
+    def test_organization_members_count(self):
+        """Test the members count follows creations, deactivations and deletes."""
+        self.assertCounters(self.organization, members_count=1)
+
+        member = MemberFactory.create(organization=self.organization)
+        self.assertCounters(self.organization, members_count=2)
+        member.inactivate()
+        self.assertCounters(self.organization, members_count=1)
+        member.activate()
+        self.assertCounters(self.organization, members_count=2)
+
+        # A stale instance does not write its counters back
+        stale = Organization.objects.get(id=self.organization.id)
+        MemberFactory.create(organization=self.organization)
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertCounters(self.organization, members_count=3)
+
+        # The counters move from the row as saved, not as the instance loaded it
+        other = Member.objects.get(id=member.id)
+        member.inactivate()
+        other.is_active = False
+        other.save()
+        self.assertCounters(self.organization, members_count=2)
+        member.activate()
+        self.assertCounters(self.organization, members_count=3)
+
+        member.delete()
+        self.assertCounters(self.organization, members_count=2)
+
+        response = self.client.get(
+            reverse('accounts:organizations-detail', args=[self.organization.id])
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data.get('members_count'), 2)
+
+    def test_organization_pending_invitations_count(self):
+        """Test the pending invitations count follows acceptances and bulk creates."""
+        expired_at = timezone.now() + datetime.timedelta(days=1)
+        invitation = InvitationFactory.create(
+            organization=self.organization, expired_at=expired_at
+        )
+        InvitationFactory.create(
+            organization=self.organization, is_accepted=True, expired_at=expired_at
+        )
+        self.assertCounters(self.organization, pending_invitations_count=1)
+
+        invitation.accept(
+            member=MemberFactory.create(organization=self.organization), check=False
+        )
+        self.assertCounters(self.organization, pending_invitations_count=0)
+
+        response = self.client.post(
+            reverse('accounts:invitations-bulk-create'),
+            data={
+                'invitations': [
+                    {'email': f'invitee{index}@example.com'} for index in range(3)
+                ]
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_201_CREATED)
+        self.assertCounters(self.organization, pending_invitations_count=3)
+
+    def test_organization_pending_invitations_count_expiry(self):
+        """Test the pending invitations count leaves out the expired invitations."""
+        now = timezone.now()
+        soon = InvitationFactory.create(
+            organization=self.organization, expired_at=now + datetime.timedelta(days=1)
+        )
+        InvitationFactory.create(
+            organization=self.organization, expired_at=now + datetime.timedelta(days=2)
+        )
+        # Past due, but not flagged yet by the expire_invites job
+        InvitationFactory.create(
+            organization=self.organization, expired_at=now - datetime.timedelta(days=1)
+        )
+        pending = Invitation.objects.filter(organization=self.organization)
+        self.assertEqual(pending.filter_pending().count(), 2)
+        self.assertCounters(self.organization, pending_invitations_count=2)
+
+        # The invitation passes its expiration date, without any write
+        Invitation.objects.filter(id=soon.id).update(
+            expired_at=now - datetime.timedelta(hours=1)
+        )
+        call_command('expire_invites', sleep=0, stdout=StringIO())
+        self.assertEqual(pending.filter_pending().count(), 1)
+        self.assertCounters(self.organization, pending_invitations_count=1)
+
+        call_command('reconcile_counters', sleep=0, stdout=StringIO())
+        self.assertCounters(self.organization, pending_invitations_count=1)
+
+    def test_team_members_count(self):
+        """Test the team members count follows single and bulk writes."""
+        team = TeamFactory.create(organization=self.organization)
+        team_member, removed, inactive = (
+            TeamMemberFactory.create(
+                team=team, organization=self.organization, is_active=is_active
+            )
+            for is_active in [True, True, False]
+        )
+        self.assertCounters(team, members_count=2)
+
+        team_member.inactivate()
+        self.assertCounters(team, members_count=1)
+
+        response = self.client.post(
+            reverse('teams:team_members-bulk'),
+            data={
+                'team': team.id,
+                'members': [
+                    {'member': inactive.member_id},
+                    {'member': MemberFactory.create(organization=self.organization).id},
+                ],
+                'remove': [removed.member_id],
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertCounters(team, members_count=2)
+
+        response = self.client.get(reverse('teams:teams-detail', args=[team.id]))
+        self.assertEqual(response.data.get('members_count'), 2)
+
+    def test_reconcile_counters(self):
+        """Test the reconcile_counters command repairs the drifted counters."""
+        teams = TeamFactory.create_batch(size=3, organization=self.organization)
+        for team in teams:
+            TeamMemberFactory.create(team=team)
+        Team.objects.filter(id__in=[team.id for team in teams[:2]]).update(
+            members_count=42
+        )
+        Organization.objects.filter(id=self.organization.id).update(members_count=0)
+
+        out = StringIO()
+        call_command('reconcile_counters', chunk_size=2, sleep=0, stdout=out)
+        self.assertIn('teams.Team.members_count: repaired 2 rows.', out.getvalue())
+        self.assertIn(
+            'accounts.Organization.members_count: repaired 1 rows.', out.getvalue()
+        )
+        for team in teams:
+            self.assertCounters(team, members_count=1)
+        self.assertCounters(self.organization, members_count=1)
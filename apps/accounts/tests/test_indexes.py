@@ -0,0 +1,79 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.factories.invitations import InvitationFactory
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.factories.organizations import OrganizationFactory
+from apps.accounts.filters.members import MemberFilter
+from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.member import Member
+from apps.accounts.tests.mixins import QueryPlanTestCaseMixin
+
+
+class AccountsIndexTestCase(QueryPlanTestCaseMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizations = OrganizationFactory.create_batch(size=3)
+        for organization in organizations:
+            MemberFactory.create_batch(size=5, organization=organization)
+            InvitationFactory.create_batch(size=5, organization=organization)
+        cls.organization = organizations[0]
+        cls.invitation = cls.organization.invitations.first()
+
+    def test_member_list_uses_index(self):
+        """Test the organization scoped member list uses an index."""
+        queryset = Member.objects.filter(
+            organization_id=self.organization.id, is_active=True
+        )
+        self.assertUsesIndex(queryset, 'member_org_active_idx')
+
+    def test_invitation_list_uses_index(self):
+        """Test the organization scoped invitation list uses an index."""
+        queryset = Invitation.objects.filter(
+            organization_id=self.organization.id, is_active=True
+        )
+        self.assertUsesIndex(queryset, 'invitation_org_active_idx')
+
+    def test_invitation_key_lookup_uses_index(self):
+        """Test the invitation lookups by key use an index."""
+        queryset = Invitation.objects.filter(
+            key=self.invitation.key,
+            is_active=True,
+            is_expired=False,
+            is_accepted=False,
+        ).exclude(expired_at__lt=timezone.now())
+        self.assertUsesIndex(queryset, 'invitation_key_idx')
+
+    def test_pending_invitation_email_lookup_uses_index(self):
+        """Test the pending invitation lookup by email uses an index."""
+        queryset = Invitation.objects.filter(
+            email=self.invitation.email,
+            is_active=True,
+            is_expired=False,
+            is_accepted=False,
+        ).exclude(expired_at__lt=timezone.now())
+        self.assertUsesIndex(queryset, 'invitation_pending_email_idx')
+
+    def test_expire_invites_uses_index(self):
+        """Test the lookup of the invitations to expire uses an index."""
+        queryset = Invitation.objects.filter(
+            is_active=True, is_expired=False, expired_at__lt=timezone.now()
+        ).order_by()
+        self.assertUsesIndex(queryset, 'invitation_pending_expiry_idx')
+
+    @skipUnless(connection.vendor == 'postgresql', 'Trigram indexes need PostgreSQL')
+    def test_member_search_uses_trigram_indexes(self):
+        """Test the member substring filters use the trigram indexes."""
+        member = self.organization.owner
+        for field, value, index_name in [
+            ('full_name__icontains', member.user.full_name, 'user_full_name_trgm_idx'),
+            ('email__icontains', member.user.email, 'user_email_trgm_idx'),
+            ('nickname__icontains', member.nickname, 'member_nickname_trgm_idx'),
+        ]:
+            queryset = MemberFilter(
+                data={field: value[1:-1]}, queryset=Member.objects.all()
+            ).qs
+            self.assertUsesIndex(queryset, index_name)
@@ -1,5 +1,9 @@
 import datetime
+from io import StringIO
 
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status as http_status
@@ -14,12 +18,17 @@ from apps.accounts.tests.mixins import APITestCaseMixin
 
 
 class InvitationAPITestCase(APITestCaseMixin, APITestCase):
+    # Query budgets of the list and detail calls, whatever the number of rows
+    list_max_queries = 5
+    detail_max_queries = 3
+
     @classmethod
     def setUpTestData(cls):
         cls.detail_url_name = 'accounts:invitations-detail'
         cls.list_url_name = 'accounts:invitations-list'
         cls.list_url = reverse(cls.list_url_name)
         cls.choices_url = reverse('accounts:invitations-choices')
+        cls.bulk_url = reverse('accounts:invitations-bulk-create')
 
     def setUp(self):
         self.organization = self.new_account()
@@ -29,7 +38,7 @@ class InvitationAPITestCase(APITestCaseMixin, APITestCase):
         InvitationFactory.create_batch(size=5, organization=self.organization)
 
         for url in [self.list_url, self.choices_url]:
-            response = self.client.get(url)
+            response = self.client.get(url, max_queries=self.list_max_queries)
             self.assertEqual(response.status_code, http_status.HTTP_200_OK)
             self.assertEqual(response.data.get('count'), 5)
 
@@ -66,7 +75,7 @@ class InvitationAPITestCase(APITestCaseMixin, APITestCase):
             self.detail_url_name,
             kwargs={'key': invitation.key},
         )
-        response = self.client.get(url)
+        response = self.client.get(url, max_queries=self.detail_max_queries)
         self.assertEqual(response.status_code, http_status.HTTP_200_OK)
         self.assertEqual(response.data.get('email'), invitation.email)
         self.assertEqual(response.data.get('role'), invitation.role)
@@ -220,6 +229,78 @@ class InvitationAPITestCase(APITestCaseMixin, APITestCase):
             invitation.expired_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
         )
 
+    def test_filter_invitations_by_effective_expiry(self):
+        """Test the is_expired filter covers invitations not flagged yet."""
+        past = timezone.now() - datetime.timedelta(days=1)
+        future = timezone.now() + datetime.timedelta(days=1)
+        flagged = InvitationFactory.create(
+            organization=self.organization, is_expired=True, expired_at=future
+        )
+        past_due = InvitationFactory.create(
+            organization=self.organization, expired_at=past
+        )
+        pending = InvitationFactory.create(
+            organization=self.organization, expired_at=future
+        )
+        no_expiry = InvitationFactory.create(
+            organization=self.organization, expired_at=None
+        )
+
+        for value, expected in [
+            ('true', {flagged.email, past_due.email}),
+            ('false', {pending.email, no_expiry.email}),
+        ]:
+            response = self.client.get(self.list_url, {'is_expired': value})
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+            self.assertEqual(
+                {invitation['email'] for invitation in response.data['results']},
+                expected,
+            )
+
+    def test_is_acceptable_does_not_write(self):
+        """Test checking a past due invitation does not flag it."""
+        invitation = InvitationFactory.create(
+            organization=self.organization,
+            expired_at=timezone.now() - datetime.timedelta(days=1),
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(invitation.is_acceptable()[0], False)
+        invitation.refresh_from_db()
+        self.assertEqual(invitation.is_expired, False)
+
+    def test_expire_invites_in_batches(self):
+        """Test the expire_invites command flags past due invites in batches."""
+        InvitationFactory.create_batch(
+            size=7,
+            organization=self.organization,
+            expired_at=timezone.now() - datetime.timedelta(days=1),
+        )
+        pending = InvitationFactory.create(
+            organization=self.organization,
+            expired_at=timezone.now() + datetime.timedelta(days=1),
+        )
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as context:
+            call_command('expire_invites', batch_size=3, sleep=0, stdout=out)
+        updates = [
+            query
+            for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "accounts_invitation"')
+        ]
+        self.assertEqual(len(updates), 3)
+        self.assertIn('Expired 7 invites.', out.getvalue())
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.pending_invitations_count, 1)
+        self.assertEqual(
+            Invitation.objects.filter(
+                organization=self.organization, is_expired=True
+            ).count(),
+            7,
+        )
+        pending.refresh_from_db()
+        self.assertEqual(pending.is_expired, False)
+
     def test_accepted_invitation(self):
         """Test the accepted invitations."""
         invitation = InvitationFactory.create(
@@ -416,3 +497,118 @@ class InvitationAPITestCase(APITestCaseMixin, APITestCase):
             format='json',
         )
         self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+
+    @staticmethod
+    def _bulk_rows(size: int, prefix: str = 'bulk') -> list[dict]:
+        expired_at = timezone.now() + datetime.timedelta(days=7)
+        return [
+            {
+                'email': f'{prefix}{index}@example.com',
+                'role': MemberRoleChoices.MEMBER,
+                'expired_at': expired_at,
+            }
+            for index in range(size)
+        ]
+
+    def test_bulk_create_invitations(self):
+        """Test the bulk create view of the invitations."""
+        response = self.client.post(
+            path=self.bulk_url,
+            data={'invitations': self._bulk_rows(20)},
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 20)
+        self.assertEqual(response.data['failed'], 0)
+        self.assertEqual(
+            {result['status'] for result in response.data['results']}, {'created'}
+        )
+        invitations = Invitation.objects.filter(organization=self.organization)
+        self.assertEqual(invitations.count(), 20)
+        self.assertEqual(len({invitation.key for invitation in invitations}), 20)
+        self.assertEqual(
+            {str(invitation.key) for invitation in invitations},
+            {result['key'] for result in response.data['results']},
+        )
+
+    def test_bulk_create_invitations_atomic(self):
+        """Test no invitation is created when any row of an atomic bulk fails."""
+        pending = InvitationFactory.create(
+            organization=self.organization,
+            expired_at=timezone.now() + datetime.timedelta(days=1),
+        )
+        rows = self._bulk_rows(3)
+        rows += [
+            {**rows[0]},
+            {**rows[1], 'email': pending.email},
+            {**rows[2], 'email': 'not-an-email'},
+        ]
+
+        response = self.client.post(
+            path=self.bulk_url, data={'invitations': rows}, format='json'
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual(response.data['failed'], 3)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['skipped'] * 3 + ['invalid'] * 3,
+        )
+        self.assertIn('email', response.data['results'][-1]['errors'])
+        self.assertEqual(
+            Invitation.objects.filter(organization=self.organization).count(), 1
+        )
+
+    def test_bulk_create_invitations_partial(self):
+        """Test the valid rows are created when the bulk is not atomic."""
+        rows = self._bulk_rows(3)
+        rows.append({**rows[0], 'role': MemberRoleChoices.OWNER})
+        rows.append({**rows[0]})
+        self.client.force_authenticate(
+            member=MemberFactory.create(
+                organization=self.organization, role=MemberRoleChoices.ADMIN
+            )
+        )
+
+        response = self.client.post(
+            path=self.bulk_url,
+            data={'invitations': rows, 'atomic': False},
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['failed'], 2)
+        results = response.data['results']
+        self.assertIn('role', results[3]['errors'])
+        self.assertIn('email', results[4]['errors'])
+        self.assertEqual(
+            Invitation.objects.filter(organization=self.organization).count(), 3
+        )
+
+    def test_bulk_create_invitations_constant_queries(self):
+        """Test the number of queries of the bulk create does not grow with rows."""
+        query_counts = []
+        for size, prefix in [(1, 'warmup'), (2, 'small'), (40, 'large')]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    path=self.bulk_url,
+                    data={'invitations': self._bulk_rows(size, prefix)},
+                    format='json',
+                )
+            self.assertEqual(response.status_code, http_status.HTTP_201_CREATED)
+            query_counts.append(len(context.captured_queries))
+        self.assertEqual(query_counts[1], query_counts[2])
+
+    def test_not_permission_invitation_bulk_create(self):
+        """Test the bulk create view of the invitations without admin permission."""
+        member = MemberFactory.create(
+            organization=self.organization,
+            role=MemberRoleChoices.MEMBER,
+        )
+        self.client.force_authenticate(member=member)
+        response = self.client.post(
+            path=self.bulk_url,
+            data={'invitations': self._bulk_rows(2)},
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
@@ -1,3 +1,6 @@
+import json
+from base64 import urlsafe_b64encode
+
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
@@ -8,12 +11,17 @@ from apps.accounts.choices import MemberRoleChoices
 from apps.accounts.factories.invitations import InvitationFactory
 from apps.accounts.factories.members import MemberFactory
 from apps.accounts.factories.users import UserFactory
+from apps.accounts.models.member import Member
 from apps.accounts.tests.mixins import APITestCaseMixin
 
 User = get_user_model()
 
 
 class MemberAPITestCase(APITestCaseMixin, APITestCase):
+    # Query budgets of the list and detail calls, whatever the number of rows
+    list_max_queries = 5
+    detail_max_queries = 4
+
     @classmethod
     def setUpTestData(cls):
         cls.detail_url_name = 'accounts:members-detail'
@@ -77,10 +85,176 @@ class MemberAPITestCase(APITestCaseMixin, APITestCase):
         MemberFactory.create_batch(size=5, organization=self.organization)
 
         for url in [self.list_url, self.choices_url]:
-            response = self.client.get(url)
+            response = self.client.get(url, max_queries=self.list_max_queries)
             self.assertEqual(response.status_code, http_status.HTTP_200_OK)
             self.assertEqual(response.data.get('count'), 6)
 
+    def test_list_and_choices_members_keyset_pagination(self):
+        """Test the keyset pagination of the list and choices views."""
+        MemberFactory.create_batch(size=24, organization=self.organization)
+
+        for url, key in [(self.list_url, 'id'), (self.choices_url, 'value')]:
+            ids = []
+            next_url = f'{url}?cursor='
+            while next_url:
+                response = self.client.get(next_url)
+                self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+                self.assertNotIn('count', response.data)
+                ids.extend(int(row[key]) for row in response.data.get('results'))
+                next_url = response.data.get('next')
+            self.assertEqual(len(ids), 25)
+            self.assertEqual(ids, sorted(set(ids), reverse=True))
+
+            response = self.client.get(f'{url}?cursor=&count=true')
+            self.assertEqual(response.data.get('count'), 25)
+
+            response = self.client.get(response.data.get('next'))
+            response = self.client.get(response.data.get('previous'))
+            page_ids = [int(row[key]) for row in response.data.get('results')]
+            self.assertEqual(page_ids, ids[:10])
+
+    def test_list_members_keyset_conditional_get(self):
+        """Test keyset pages get an ETag without any query besides the page."""
+        MemberFactory.create_batch(size=14, organization=self.organization)
+        url = f'{self.list_url}?cursor='
+
+        with self.client.record_queries() as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertFalse(any('MAX(' in query.sql for query in queries.queries))
+        etag = response.headers['ETag']
+        with self.client.record_queries() as next_queries:
+            response = self.client.get(response.data['next'])
+        self.assertEqual(len(next_queries), len(queries))
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+        with self.client.record_queries() as not_modified_queries:
+            response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, http_status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(not_modified_queries), len(queries))
+
+    def test_query_budget(self):
+        """Test exceeding a query budget reports the repeated statements."""
+        MemberFactory.create_batch(size=3, organization=self.organization)
+        members = Member.objects.filter(organization=self.organization)
+
+        with self.client.record_queries() as queries:
+            self.assertEqual(len([member.user for member in members]), 4)
+        self.assertEqual(len(queries), 5)
+
+        with self.assertRaisesMessage(AssertionError, 'Repeated statements:\n  4x'):
+            with self.client.record_queries(max_queries=1):
+                [member.user for member in members.all()]
+
+    def test_list_members_search(self):
+        """Test the substring filters of the list view of the members."""
+        member = MemberFactory.create(organization=self.organization)
+        MemberFactory.create_batch(size=3, organization=self.organization)
+
+        for field, value in [
+            ('full_name__icontains', member.user.full_name),
+            ('email__icontains', member.user.email),
+            ('nickname__icontains', member.nickname),
+        ]:
+            response = self.client.get(
+                self.list_url,
+                data={field: value[1:-1].swapcase()},
+                max_queries=self.list_max_queries,
+            )
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+            self.assertIn(
+                member.id, [row['id'] for row in response.data.get('results')]
+            )
+
+    def test_list_members_min_role(self):
+        """Test the min_role filter, computed from the role ranks in SQL."""
+        members = {
+            role: MemberFactory.create(organization=self.organization, role=role)
+            for role in MemberRoleChoices
+        }
+        superuser = MemberFactory.create(
+            organization=self.organization,
+            role=MemberRoleChoices.MEMBER,
+            user__is_superuser=True,
+        )
+
+        response = self.client.get(
+            self.list_url,
+            data={'min_role': MemberRoleChoices.MANAGER},
+            max_queries=self.list_max_queries,
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(
+            {row['id'] for row in response.data.get('results')},
+            {
+                self.organization.owner.id,
+                members[MemberRoleChoices.OWNER].id,
+                members[MemberRoleChoices.ADMIN].id,
+                members[MemberRoleChoices.MANAGER].id,
+                superuser.id,
+            },
+        )
+
+    def test_role_rank_permissions(self):
+        """Test the permissions compare ranks, loading the user only if needed."""
+        self.assertGreater(MemberRoleChoices.OWNER.rank, MemberRoleChoices.ADMIN.rank)
+        self.assertGreater(
+            MemberRoleChoices.MANAGER.rank, MemberRoleChoices.MEMBER.rank
+        )
+        member_id = MemberFactory.create(
+            organization=self.organization, role=MemberRoleChoices.MANAGER
+        ).id
+
+        member = Member.objects.get(id=member_id)
+        with self.assertNumQueries(0):
+            self.assertTrue(member.has_manager_permission)
+            self.assertTrue(member.has_member_permission)
+        with self.assertNumQueries(1):
+            self.assertFalse(member.has_admin_permission)
+            self.assertFalse(member.has_owner_permission)
+
+        member.user.is_superuser = True
+        member.user.save()
+        member = Member.objects.get(id=member_id)
+        self.assertTrue(member.has_owner_permission)
+        self.assertEqual(
+            Member.objects.annotate_role_rank().get(id=member_id).role_rank,
+            MemberRoleChoices.OWNER.rank,
+        )
+
+    def test_retrieve_member_conditional_get(self):
+        """Test the ETag and Last-Modified of the retrieve view of the members."""
+        member = MemberFactory(organization=self.organization)
+        url = reverse(self.detail_url_name, args=[member.id])
+
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, http_status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, http_status.HTTP_304_NOT_MODIFIED)
+
+        member.user.first_name = 'Renamed'
+        member.user.save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['first_name'], 'Renamed')
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_list_members_invalid_cursor(self):
+        """Test the list view of the members with an invalid cursor."""
+        response = self.client.get(f'{self.list_url}?cursor=invalid')
+        self.assertEqual(response.status_code, http_status.HTTP_404_NOT_FOUND)
+
+        # Well formed cursors whose values do not fit the `-id` ordering
+        for position in [['x'], [None], [[1]]]:
+            payload = json.dumps({'p': position}).encode()
+            cursor = urlsafe_b64encode(payload).decode()
+            response = self.client.get(f'{self.list_url}?cursor={cursor}')
+            self.assertEqual(response.status_code, http_status.HTTP_404_NOT_FOUND)
+
     def test_create_member_with_invite(self):
         """Test the create view of the members."""
         user_data = UserFactory.build()
@@ -104,6 +278,7 @@ class MemberAPITestCase(APITestCaseMixin, APITestCase):
 
         response = self.client.get(
             path=reverse(self.detail_url_name, args=[member.id]),
+            max_queries=self.detail_max_queries,
         )
         self.assertEqual(response.status_code, http_status.HTTP_200_OK)
         self._assert_data(response, member.user, member)
@@ -1,12 +1,19 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status as http_status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 from apps.accounts.choices import MemberRoleChoices
 from apps.accounts.factories.members import MemberFactory
 from apps.accounts.factories.organizations import OrganizationFactory
 from apps.accounts.factories.users import UserFactory
-from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.accounts.tests.mixins import APITestCaseMixin, SharedCacheTestCaseMixin
+from apps.accounts.utils.cache import member_context_cache
+from apps.generics.utils.requests import AUTH_CONTEXT_ATTRIBUTE
 
 
 class OrganizationAPITestCase(APITestCaseMixin, APITestCase):
@@ -240,3 +247,137 @@ class OrganizationAPITestCase(APITestCaseMixin, APITestCase):
             format='json',
         )
         self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(ORGANIZATION_TOKEN_MODE=True)
+class OrganizationTokenModeAPITestCase(
+    SharedCacheTestCaseMixin, APITestCaseMixin, APITestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        cls.login_url_name = 'accounts:organizations-login'
+        cls.members_url = reverse('accounts:members-list')
+        cls.invitations_url = reverse('accounts:invitations-list')
+        cls.refresh_url = reverse('accounts:token_refresh')
+
+    def _login(self, member) -> dict:
+        """Log in to the organization of the member and use the returned token."""
+        self.client.force_authenticate(user=member.user)
+        response = self.client.post(
+            path=reverse(self.login_url_name, args=[member.organization_id]),
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}')
+        return response.data
+
+    def test_login_organization_returns_scoped_tokens(self):
+        """Test that the login issues tokens carrying the organization claims."""
+        organization = OrganizationFactory.create()
+        member = organization.owner
+        data = self._login(member)
+
+        self.assertNotIn('organization_id', self.client.session)
+        access = AccessToken(data['access'])
+        self.assertEqual(access['organization_id'], organization.id)
+        self.assertEqual(access['member_id'], member.id)
+        self.assertEqual(access['member_role'], member.role)
+        self.assertEqual(
+            RefreshToken(data['refresh'])['organization_id'], organization.id
+        )
+
+    def test_scoped_token_does_not_use_session(self):
+        """
+        Test that scoped requests do not read the session, and that the member and
+        organization come from the member context the token was checked against.
+        """
+        organization = OrganizationFactory.create()
+        self._login(organization.owner)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data.get('count'), 1)
+        self.assertFalse(
+            any(
+                'django_session' in query['sql']
+                or f'"accounts_member"."user_id" = {organization.owner.user_id}'
+                in query['sql']
+                for query in context.captured_queries
+            )
+        )
+        auth_context = getattr(response.wsgi_request, AUTH_CONTEXT_ATTRIBUTE)
+        with self.assertNumQueries(0):
+            self.assertEqual(auth_context.organization.name, organization.name)
+
+    def test_scoped_token_refresh_keeps_claims(self):
+        """Test that refreshing a scoped token keeps the organization claims."""
+        organization = OrganizationFactory.create()
+        data = self._login(organization.owner)
+
+        response = self.client.post(
+            path=self.refresh_url,
+            data={'refresh': data['refresh']},
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        access = AccessToken(response.data['access'])
+        self.assertEqual(access['organization_id'], organization.id)
+
+    def test_scoped_token_invalidated_on_role_change(self):
+        """Test that the scoped token is rejected after a role change."""
+        organization = OrganizationFactory.create()
+        member = MemberFactory.create(
+            organization=organization, role=MemberRoleChoices.ADMIN
+        )
+        self._login(member)
+        response = self.client.get(self.invitations_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+        member.role = MemberRoleChoices.MEMBER
+        with self.captureOnCommitCallbacks(execute=True):
+            member.save()
+
+        response = self.client.get(self.invitations_url)
+        self.assertEqual(response.status_code, http_status.HTTP_401_UNAUTHORIZED)
+
+    def test_scoped_token_invalidated_on_deactivation(self):
+        """Test that the scoped token is rejected after the member is deactivated."""
+        organization = OrganizationFactory.create()
+        member = MemberFactory.create(organization=organization)
+        self._login(member)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member.inactivate()
+
+        response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_401_UNAUTHORIZED)
+
+    def test_scoped_token_accepted_by_other_workers(self):
+        """
+        Test that a scoped token is accepted by a worker whose caches never saw it,
+        e.g. after a restart, or over a cache the workers do not share.
+        """
+        organization = OrganizationFactory.create()
+        self._login(organization.owner)
+
+        cache.clear()
+        member_context_cache.clear_local()
+        response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+        locmem_caches = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        }
+        with self.settings(CACHES=locmem_caches):
+            response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+    def test_unscoped_token_has_no_organization(self):
+        """Test that tokens without organization claims are not organization scoped."""
+        organization = OrganizationFactory.create()
+        self.client.force_authenticate(user=organization.owner.user)
+
+        response = self.client.get(self.members_url)
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,46 @@
+from django.conf import settings
+
+from apps.accounts.models.member import Member
+from apps.generics.utils.cache import VersionedTwoTierCache
+
+USER_SCOPE = 'user'
+ORGANIZATION_SCOPE = 'organization'
+
+member_context_cache = VersionedTwoTierCache(
+    prefix='auth_member',
+    timeout=settings.AUTH_CONTEXT_CACHE_TIMEOUT,
+    local_timeout=settings.AUTH_CONTEXT_CACHE_LOCAL_TIMEOUT,
+    local_maxsize=settings.AUTH_CONTEXT_CACHE_LOCAL_MAXSIZE,
+)
+
+
+def load_member(user_id: int, organization_id: int) -> Member | None:
+    """Load the member of a user in an organization, with user and organization."""
+    return (
+        Member.objects.select_related('user', 'organization')
+        .filter(user_id=user_id, organization_id=organization_id)
+        .get_or_none()
+    )
+
+
+def get_member_context(user_id: int, organization_id: int) -> Member | None:
+    """
+    Get the member of a user in an organization from the cache, loading it from
+    the database on a miss.
+    """
+    if not settings.AUTH_CONTEXT_CACHE_ENABLED:
+        return load_member(user_id, organization_id)
+    return member_context_cache.get_or_set(
+        scopes={USER_SCOPE: user_id, ORGANIZATION_SCOPE: organization_id},
+        default=lambda: load_member(user_id, organization_id),
+    )
+
+
+def invalidate_user_member_context(user_id: int):
+    """Invalidate the cached members of a user in every organization."""
+    member_context_cache.invalidate(USER_SCOPE, user_id)
+
+
+def invalidate_organization_member_context(organization_id: int):
+    """Invalidate the cached members of every user in an organization."""
+    member_context_cache.invalidate(ORGANIZATION_SCOPE, organization_id)
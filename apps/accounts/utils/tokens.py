@@ -0,0 +1,83 @@
+import hashlib
+
+from django.conf import settings
+from django.db import models
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from apps.accounts.models.member import Member
+from apps.accounts.utils.cache import get_member_context
+
+ORGANIZATION_ID_CLAIM = 'organization_id'
+MEMBER_ID_CLAIM = 'member_id'
+MEMBER_ROLE_CLAIM = 'member_role'
+CONTEXT_VERSION_CLAIM = 'context_version'
+
+
+def is_organization_token_mode() -> bool:
+    """Check whether the organization scope is carried by tokens, not sessions."""
+    return settings.ORGANIZATION_TOKEN_MODE
+
+
+def get_context_values(instance: models.Model) -> list[str]:
+    """
+    Get the persisted values of a row of the member context. The counters, and the
+    `updated_at` they touch, are left out, so a member joining the organization
+    does not reject the tokens of the others.
+    """
+    excluded = {'updated_at', *getattr(instance, 'counter_fields', ())}
+    return [
+        field.value_to_string(instance)
+        for field in instance._meta.concrete_fields
+        if field.name not in excluded
+    ]
+
+
+def get_member_context_version(user_id: int, organization_id: int) -> str:
+    """
+    Get the version of the member context of a user in an organization, a hash of
+    the persisted rows of the member, its user and organization. Every worker
+    derives the same version, restarts included, and it changes whenever one of
+    the rows is written, e.g. a role change or a deactivation.
+    """
+    if not (member := get_member_context(user_id, organization_id)):
+        return ''
+    values = [
+        get_context_values(instance)
+        for instance in (member, member.user, member.organization)
+    ]
+    return hashlib.sha1(repr(values).encode()).hexdigest()
+
+
+def get_organization_refresh_token(member: Member) -> RefreshToken:
+    """
+    Get a refresh token scoped to the organization of the member.
+    Access tokens created from it carry the same organization claims.
+    """
+    refresh = RefreshToken.for_user(member.user)
+    refresh[ORGANIZATION_ID_CLAIM] = member.organization_id
+    refresh[MEMBER_ID_CLAIM] = member.id
+    refresh[MEMBER_ROLE_CLAIM] = member.role
+    refresh[CONTEXT_VERSION_CLAIM] = get_member_context_version(
+        member.user_id, member.organization_id
+    )
+    return refresh
+
+
+def get_organization_claims(token: Token | None) -> dict | None:
+    """Get the organization claims of a token, if it is organization scoped."""
+    if not isinstance(token, Token) or token.get(ORGANIZATION_ID_CLAIM) is None:
+        return None
+    return {
+        ORGANIZATION_ID_CLAIM: token.get(ORGANIZATION_ID_CLAIM),
+        MEMBER_ID_CLAIM: token.get(MEMBER_ID_CLAIM),
+        MEMBER_ROLE_CLAIM: token.get(MEMBER_ROLE_CLAIM),
+        CONTEXT_VERSION_CLAIM: token.get(CONTEXT_VERSION_CLAIM),
+    }
+
+
+def is_organization_token_current(token: Token, user_id: int) -> bool:
+    """Check that the member context did not change since the token was issued."""
+    claims = get_organization_claims(token)
+    return bool(claims) and claims[CONTEXT_VERSION_CLAIM] == (
+        get_member_context_version(user_id, claims[ORGANIZATION_ID_CLAIM])
+    )
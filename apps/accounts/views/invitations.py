@@ -1,15 +1,41 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import backends
+from drf_spectacular.utils import extend_schema
+from rest_framework import status as http_status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from apps.accounts.filters.invitation import InvitationFilter
 from apps.accounts.models.invitation import Invitation
 from apps.accounts.permissions.invitation import InvitationPermission
-from apps.accounts.serializers.invitation import InvitationSerializer
+from apps.accounts.serializers.invitation import (
+    InvitationBulkCreateSerializer,
+    InvitationBulkResponseSerializer,
+    InvitationSerializer,
+)
+from apps.generics.utils.models import get_verbose_name_plural
 from apps.generics.utils.schema import extend_schema_model_view_set
 from apps.generics.views.mixins import ModelViewSetMixin, OrganizationScopedViewSetMixin
 
 
-@extend_schema_model_view_set(model=Invitation)
+@extend_schema_model_view_set(
+    model=Invitation,
+    bulk_create=extend_schema(
+        request=InvitationBulkCreateSerializer,
+        responses={
+            http_status.HTTP_201_CREATED: InvitationBulkResponseSerializer,
+            http_status.HTTP_400_BAD_REQUEST: InvitationBulkResponseSerializer,
+        },
+        tags=Invitation.schema_tags(),
+        description=_(
+            'Create many %(name_plural)s at once, with a result per row. Nothing is '
+            'created if any row is invalid, unless `atomic` is false.'
+            % {'name_plural': get_verbose_name_plural(Invitation).lower()}
+        ),
+    ),
+)
 class InvitationViewSet(
     OrganizationScopedViewSetMixin, ModelViewSetMixin, viewsets.ModelViewSet
 ):
@@ -21,3 +47,26 @@ class InvitationViewSet(
     filterset_class = InvitationFilter
     filter_backends = [backends.DjangoFilterBackend]
     label_expression = 'email'
+    keyset_ordering = ('-id',)
+
+    def get_serializer_class(self):
+        """Get the serializer class for the view."""
+        if self.action == 'bulk_create':
+            return InvitationBulkCreateSerializer
+        return super().get_serializer_class()
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request, *args, **kwargs):
+        """Create many invitations at once."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            result = serializer.save()
+        return Response(
+            data=InvitationBulkResponseSerializer(result).data,
+            status=(
+                http_status.HTTP_201_CREATED
+                if result['created']
+                else http_status.HTTP_400_BAD_REQUEST
+            ),
+        )
@@ -1,4 +1,4 @@
-from django.utils import timezone
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import backends
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
@@ -73,6 +73,10 @@ class MemberViewSet(
     filterset_class = MemberFilter
     filter_backends = [backends.DjangoFilterBackend]
     label_expression = Member.label_expression()
+    keyset_ordering = ('-id',)
+    choices_cache_models = (settings.AUTH_USER_MODEL,)
+    last_modified_fields = ('updated_at', 'user__updated_at')
+    fast_read = True
 
     base_filters = {'is_active': True}
 
@@ -87,19 +91,14 @@ class MemberViewSet(
         return MemberModelSerializer
 
     def get_invitation(self) -> Invitation | None:
-        """Get the invitation object."""
-        return (
-            Invitation.objects.filter(
-                key=self.kwargs.get('invitation_key'),
-                is_active=True,
-                is_expired=False,
-                is_accepted=False,
+        """Get the pending invitation of the request, loaded once per request."""
+        if not hasattr(self, '_invitation'):
+            self._invitation = (
+                Invitation.objects.filter_pending()
+                .filter(key=self.kwargs.get('invitation_key'))
+                .get_or_none()
             )
-            .exclude(
-                expired_at__lt=timezone.now(),
-            )
-            .get_or_none()
-        )
+        return self._invitation
 
     def create(self, request, *args, **kwargs):
         """Deprecated create action."""
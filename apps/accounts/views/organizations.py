@@ -15,6 +15,10 @@ from apps.accounts.filters.organization import OrganizationFilter
 from apps.accounts.models.organization import Organization
 from apps.accounts.permissions.organization import OrganizationPermission
 from apps.accounts.serializers.organization import OrganizationSerializer
+from apps.accounts.utils.tokens import (
+    get_organization_refresh_token,
+    is_organization_token_mode,
+)
 from apps.generics.utils.schema import extend_schema_model_view_set
 from apps.generics.views.mixins import ModelViewSetMixin
 
@@ -31,6 +35,20 @@ from apps.generics.views.mixins import ModelViewSetMixin
                     name='LoginResponse',
                     fields={
                         'detail': serializers.CharField(),
+                        'access': serializers.CharField(
+                            required=False,
+                            help_text=_(
+                                'Organization scoped access token, only returned '
+                                'in organization token mode.'
+                            ),
+                        ),
+                        'refresh': serializers.CharField(
+                            required=False,
+                            help_text=_(
+                                'Organization scoped refresh token, only returned '
+                                'in organization token mode.'
+                            ),
+                        ),
                     },
                 ),
                 examples=[
@@ -95,9 +113,15 @@ class OrganizationViewSet(ModelViewSetMixin, viewsets.ModelViewSet):
                 status=http_status.HTTP_404_NOT_FOUND,
             )
 
-        # Set the organization in the session
-        request.session['organization_id'] = organization.id
-        return Response(
-            data={'detail': _('Logged in to organization.')},
-            status=http_status.HTTP_200_OK,
-        )
+        data = {'detail': _('Logged in to organization.')}
+        if is_organization_token_mode():
+            # Issue tokens carrying the organization scope
+            member = organization.members.select_related('user').get(
+                user_id=self.auth_user.id
+            )
+            refresh = get_organization_refresh_token(member)
+            data.update({'refresh': str(refresh), 'access': str(refresh.access_token)})
+        else:
+            # Set the organization in the session
+            request.session['organization_id'] = organization.id
+        return Response(data=data, status=http_status.HTTP_200_OK)
@@ -0,0 +1,162 @@
+import json
+import math
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.generics.utils.cache import CacheCallLog
+
+
+class EndpointCase(NamedTuple):
+    """
+    A routed action to benchmark.
+    `get_request` is called before every run, outside of the timing, with the index
+    of the run, and returns the path and the payload of the request. Actions that
+    write can use the index to send a new payload, or create what the request
+    consumes, e.g. an invitation. Every run of the case happens in its `context`,
+    e.g. one overriding the page size of a viewset.
+    """
+
+    name: str
+    client: APIClient
+    method: str
+    get_request: Callable[[int], tuple[str, dict | None]]
+    status: int
+    context: Callable[[], AbstractContextManager] = nullcontext
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    p50: float
+    p95: float
+    queries: int
+    cache_calls: int
+    allocations: int
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in self._asdict().items() if key != 'name'}
+
+
+class Regression(NamedTuple):
+    name: str
+    metric: str
+    baseline: float
+    value: float
+
+    def __str__(self) -> str:
+        return f'{self.name} {self.metric}: {self.baseline:g} -> {self.value:g}'
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Get the nearest-rank percentile q (0-100) of the values."""
+    values = sorted(values)
+    rank = max(math.ceil(q / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def check_status(case: EndpointCase, response):
+    if response.status_code != case.status:
+        raise AssertionError(
+            f'{case.name} returned {response.status_code} instead of {case.status}: '
+            f'{getattr(response, "data", response.content)}'
+        )
+
+
+def send(case: EndpointCase, index: int):
+    path, data = case.get_request(index)
+    response = getattr(case.client, case.method)(path=path, data=data, format='json')
+    check_status(case, response)
+    return response
+
+
+def run_case(case: EndpointCase, iterations: int) -> BenchmarkResult:
+    """
+    Benchmark an endpoint. A first run warms the caches up, then `iterations` runs
+    are timed, and a last run counts the queries, the round trips to the caches
+    and the peak of the memory allocated, which would skew the timings.
+    """
+    with case.context():
+        send(case, 0)
+
+        durations = []
+        for index in range(1, iterations + 1):
+            path, data = case.get_request(index)
+            request = getattr(case.client, case.method)
+            start = time.perf_counter()
+            response = request(path=path, data=data, format='json')
+            durations.append(time.perf_counter() - start)
+            check_status(case, response)
+
+        tracemalloc.start()
+        try:
+            with (
+                CaptureQueriesContext(connection) as queries,
+                CacheCallLog() as cache_calls,
+            ):
+                send(case, iterations + 1)
+            allocations = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=case.name,
+        p50=percentile(durations, 50),
+        p95=percentile(durations, 95),
+        queries=len(queries.captured_queries),
+        cache_calls=len(cache_calls),
+        allocations=allocations,
+    )
+
+
+def load_baseline(path: str | Path) -> dict[str, Any] | None:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(
+    path: str | Path, tenant: dict[str, int], results: list[BenchmarkResult]
+):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'tenant': tenant,
+        'results': {result.name: result.to_dict() for result in results},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + '\n')
+
+
+def compare(
+    results: list[BenchmarkResult], baseline: dict[str, Any], threshold: float
+) -> list[Regression]:
+    """
+    Get the results that regressed from the baseline. Timings and allocations
+    regress when they grow past the threshold, a ratio, e.g. 0.25 for 25%. Query
+    and cache call counts are deterministic, so any extra one is a regression.
+    """
+    regressions = []
+    for result in results:
+        if not (reference := baseline['results'].get(result.name)):
+            continue
+        for metric in ['p50', 'p95', 'allocations']:
+            value = getattr(result, metric)
+            if value > reference[metric] * (1 + threshold):
+                regressions.append(
+                    Regression(result.name, metric, reference[metric], value)
+                )
+        for metric in ['queries', 'cache_calls']:
+            value = getattr(result, metric)
+            # Baselines recorded before a metric existed do not compare it
+            if metric in reference and value > reference[metric]:
+                regressions.append(
+                    Regression(result.name, metric, reference[metric], value)
+                )
+    return regressions
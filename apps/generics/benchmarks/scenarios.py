@@ -0,0 +1,418 @@
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from typing import NamedTuple
+
+import factory
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.choices import MemberRoleChoices
+from apps.accounts.factories.invitations import InvitationFactory
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.factories.organizations import OrganizationFactory
+from apps.accounts.factories.users import DEFAULT_PASSWORD, UserFactory
+from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.member import Member
+from apps.accounts.models.organization import Organization
+from apps.accounts.views.members import MemberViewSet
+from apps.generics.benchmarks.runner import EndpointCase
+from apps.generics.models.counters import reconcile_counters
+from apps.teams.choices import TeamMemberRoleChoices
+from apps.teams.factories.team_members import TeamMemberFactory
+from apps.teams.factories.teams import TeamFactory
+from apps.teams.models.team import Team
+from apps.teams.models.team_closure import TeamClosure
+from apps.teams.models.team_member import TeamMember
+from apps.teams.views.team_members import TeamMemberViewSet
+
+User = get_user_model()
+
+# Children of every team of the seeded hierarchy
+TEAM_CHILDREN = 4
+# Page sizes of the lists served by both read paths, the serializer and `values()`
+READ_PATH_PAGE_SIZES = (10, 100, 1000)
+
+
+class Tenant(NamedTuple):
+    organization: Organization
+    members: list[Member]
+    teams: list[Team]
+    team_members: list[TeamMember]
+    invitations: list[Invitation]
+
+    @property
+    def owner(self) -> Member:
+        return self.organization.owner
+
+    @property
+    def sizes(self) -> dict[str, int]:
+        return {
+            'members': len(self.members),
+            'teams': len(self.teams),
+            'team_members': len(self.team_members),
+        }
+
+
+def seed_tenant(members: int, teams: int, team_members: int) -> Tenant:
+    """
+    Seed an organization with the given number of members, teams and team
+    memberships. The rows are built by the factories and bulk inserted, with the
+    password hashed once for every user, so large tenants are seeded in seconds.
+    The teams are nested in a single hierarchy rooted at the first one.
+    """
+    organization = OrganizationFactory.create()
+    password = make_password(DEFAULT_PASSWORD)
+
+    users = UserFactory.build_batch(
+        size=members,
+        username=factory.Sequence(lambda n: f'benchmark_user{n}'),
+        email=factory.Sequence(lambda n: f'benchmark_user{n}@example.com'),
+    )
+    for user in users:
+        user.password = password
+    users = User.objects.bulk_create(users)
+    members = Member.objects.bulk_create(
+        MemberFactory.build(
+            id=None, organization=organization, user=user, nickname=user.username
+        )
+        for user in users
+    )
+    teams = Team.objects.bulk_create(
+        TeamFactory.build_batch(
+            size=teams,
+            id=None,
+            organization=organization,
+            name=factory.Sequence(lambda n: f'Benchmark team {n}'),
+            slug=factory.Sequence(lambda n: f'benchmark-team{n}'),
+        )
+    )
+    # Nest the teams under the first one, a few children per team, so thousands
+    # of teams are 5 to 8 levels deep
+    for index, team in enumerate(teams[1:], 1):
+        team.parent = teams[(index - 1) // TEAM_CHILDREN]
+    Team.objects.bulk_update(teams, fields=['parent'])
+    TeamClosure.objects.link_teams(teams)
+
+    # Spread the memberships over the teams, without repeating a pair
+    team_members = min(team_members, len(members) * len(teams))
+    team_members = TeamMember.objects.bulk_create(
+        TeamMemberFactory.build(
+            id=None,
+            team=teams[index % len(teams)],
+            member=members[index // len(teams)],
+            organization=organization,
+        )
+        for index in range(team_members)
+    )
+    invitations = Invitation.objects.bulk_create(
+        InvitationFactory.build_batch(
+            size=max(len(members) // 10, 1),
+            id=None,
+            key=factory.LazyFunction(uuid.uuid4),
+            organization=organization,
+            expired_at=timezone.now() + timedelta(days=7),
+        )
+    )
+    # The bulk inserts do not move the counters
+    for model, pks in [
+        (Member, [organization.id]),
+        (Invitation, [organization.id]),
+        (TeamMember, [team.id for team in teams]),
+    ]:
+        for counter in model.counters:
+            reconcile_counters(model, counter, pks)
+    return Tenant(organization, members, teams, team_members, invitations)
+
+
+def get_member_client(member: Member) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user=member.user)
+    client.post(
+        path=reverse('accounts:organizations-login', args=[member.organization_id]),
+        format='json',
+    )
+    return client
+
+
+@contextmanager
+def override_view(viewset: type, **attributes) -> Iterator[None]:
+    """Override class attributes of a viewset, e.g. its pagination, in a block."""
+    previous = {
+        name: vars(viewset)[name] for name in attributes if name in vars(viewset)
+    }
+    for name, value in attributes.items():
+        setattr(viewset, name, value)
+    try:
+        yield
+    finally:
+        for name in attributes:
+            if name in previous:
+                setattr(viewset, name, previous[name])
+            else:
+                delattr(viewset, name)
+
+
+def get_cases(tenant: Tenant) -> list[EndpointCase]:
+    """Get the routed actions to benchmark over the tenant."""
+    owner, organization = tenant.owner, tenant.organization
+    client, anonymous = get_member_client(owner), APIClient()
+    member, team = tenant.members[0], tenant.teams[0]
+    team_member, invitation = tenant.team_members[0], tenant.invitations[0]
+    # The owner is renamed by members.update, so another user logs in
+    user = tenant.members[-1].user
+    refresh_token = str(RefreshToken.for_user(user))
+    expired_at = (timezone.now() + timedelta(days=7)).isoformat()
+
+    def get(name: str, path: str, **kwargs) -> EndpointCase:
+        return EndpointCase(
+            name,
+            client,
+            'get',
+            lambda index: (path, None),
+            http_status.HTTP_200_OK,
+            **kwargs,
+        )
+
+    def create_with_invite(index: int) -> tuple[str, dict]:
+        invitee = UserFactory.build(username=f'benchmark_invitee{index}')
+        invite = InvitationFactory.create(
+            organization=organization,
+            email=f'benchmark_invitee{index}@example.com',
+            expired_at=None,
+        )
+        payload = {
+            'user': {
+                'username': invitee.username,
+                'email': invite.email,
+                'first_name': invitee.first_name,
+                'last_name': invitee.last_name,
+                'password': DEFAULT_PASSWORD,
+            },
+            'nickname': invitee.username,
+            'role': invite.role,
+        }
+        return reverse(
+            'accounts:members-create-with-invite', args=[invite.key]
+        ), payload
+
+    def create_team_member(index: int) -> tuple[str, dict]:
+        new_team = TeamFactory.create(
+            organization=organization,
+            name=f'Benchmark new team {index}',
+            slug=f'benchmark-new-team{index}',
+        )
+        payload = {'team': new_team.id, 'member': member.id}
+        return reverse('teams:team_members-list'), payload
+
+    cases = []
+    for name, basename, instance_id in [
+        ('members', 'accounts:members', member.id),
+        ('teams', 'teams:teams', team.id),
+        ('team_members', 'teams:team_members', team_member.id),
+        ('invitations', 'accounts:invitations', invitation.key),
+    ]:
+        cases += [
+            get(f'{name}.list', reverse(f'{basename}-list')),
+            get(f'{name}.retrieve', reverse(f'{basename}-detail', args=[instance_id])),
+            get(f'{name}.choices', reverse(f'{basename}-choices')),
+        ]
+
+    # The lists of the fast read path, served from the serializer and `values()`
+    for name, basename, viewset in [
+        ('members', 'accounts:members', MemberViewSet),
+        ('team_members', 'teams:team_members', TeamMemberViewSet),
+    ]:
+        for page_size in READ_PATH_PAGE_SIZES:
+            pagination_class = type(
+                f'PageSize{page_size}Pagination',
+                (PageNumberPagination,),
+                {'page_size': page_size},
+            )
+            for read_path, fast_read in [('serializer', False), ('values', True)]:
+                cases.append(
+                    get(
+                        f'{name}.list.{read_path}.{page_size}',
+                        reverse(f'{basename}-list'),
+                        context=partial(
+                            override_view,
+                            viewset,
+                            pagination_class=pagination_class,
+                            fast_read=fast_read,
+                        ),
+                    )
+                )
+
+    cases += [
+        EndpointCase(
+            'members.update',
+            client,
+            'put',
+            lambda index: (
+                reverse('accounts:members-detail', args=[owner.id]),
+                {
+                    'user': {
+                        'username': f'benchmark_owner{index}',
+                        'email': f'benchmark_owner{index}@example.com',
+                        'first_name': f'Owner {index}',
+                        'last_name': owner.user.last_name,
+                    },
+                    'nickname': f'owner{index}',
+                },
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        EndpointCase(
+            'members.update_role',
+            client,
+            'patch',
+            lambda index: (
+                reverse('accounts:members-update-role', args=[member.id]),
+                {
+                    'role': [MemberRoleChoices.MANAGER, MemberRoleChoices.MEMBER][
+                        index % 2
+                    ]
+                },
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        EndpointCase(
+            'members.create_with_invite',
+            client,
+            'post',
+            create_with_invite,
+            http_status.HTTP_201_CREATED,
+        ),
+        EndpointCase(
+            'teams.create',
+            client,
+            'post',
+            lambda index: (
+                reverse('teams:teams-list'),
+                {
+                    'name': f'Benchmark created {index}',
+                    'slug': f'benchmark-created{index}',
+                },
+            ),
+            http_status.HTTP_201_CREATED,
+        ),
+        EndpointCase(
+            'teams.update',
+            client,
+            'put',
+            lambda index: (
+                reverse('teams:teams-detail', args=[team.id]),
+                {'name': f'Benchmark renamed {index}', 'slug': team.slug},
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        get('teams.subtree', reverse('teams:teams-subtree', args=[team.id])),
+        get('teams.members', reverse('teams:teams-members', args=[team.id])),
+        EndpointCase(
+            'team_members.create',
+            client,
+            'post',
+            create_team_member,
+            http_status.HTTP_201_CREATED,
+        ),
+        EndpointCase(
+            'team_members.update',
+            client,
+            'put',
+            lambda index: (
+                reverse('teams:team_members-detail', args=[team_member.id]),
+                {
+                    'role': [TeamMemberRoleChoices.ADMIN, TeamMemberRoleChoices.MEMBER][
+                        index % 2
+                    ]
+                },
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        EndpointCase(
+            'invitations.create',
+            client,
+            'post',
+            lambda index: (
+                reverse('accounts:invitations-list'),
+                {
+                    'email': f'benchmark_invite{index}@example.com',
+                    'role': MemberRoleChoices.MEMBER,
+                    'expired_at': expired_at,
+                },
+            ),
+            http_status.HTTP_201_CREATED,
+        ),
+        EndpointCase(
+            'invitations.update',
+            client,
+            'put',
+            lambda index: (
+                reverse('accounts:invitations-detail', args=[invitation.key]),
+                {
+                    'email': invitation.email,
+                    'role': [MemberRoleChoices.ADMIN, MemberRoleChoices.MEMBER][
+                        index % 2
+                    ],
+                    'expired_at': expired_at,
+                },
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        EndpointCase(
+            'organizations.login',
+            client,
+            'post',
+            lambda index: (
+                reverse('accounts:organizations-login', args=[organization.id]),
+                None,
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        EndpointCase(
+            'auth.token_obtain',
+            anonymous,
+            'post',
+            lambda index: (
+                reverse('accounts:token_obtain_pair'),
+                {
+                    User.USERNAME_FIELD: getattr(user, User.USERNAME_FIELD),
+                    'password': DEFAULT_PASSWORD,
+                },
+            ),
+            http_status.HTTP_200_OK,
+        ),
+        EndpointCase(
+            'auth.token_refresh',
+            anonymous,
+            'post',
+            lambda index: (
+                reverse('accounts:token_refresh'),
+                {'refresh': refresh_token},
+            ),
+            http_status.HTTP_200_OK,
+        ),
+    ]
+    if len(tenant.teams) > 1:
+        # A leaf moves back and forth between the root of the hierarchy and the top
+        cases.append(
+            EndpointCase(
+                'teams.move',
+                client,
+                'post',
+                lambda index: (
+                    reverse('teams:teams-move', args=[tenant.teams[-1].id]),
+                    {'parent': [team.id, None][index % 2]},
+                ),
+                http_status.HTTP_200_OK,
+            )
+        )
+    return cases
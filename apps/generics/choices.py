@@ -0,0 +1,65 @@
+from functools import cache
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+@cache
+def get_choices_ranks(choices: type[models.Choices]) -> dict[str, int]:
+    """Get the rank of every value, the first declared ranking the highest."""
+    return {choice.value: len(choices) - index for index, choice in enumerate(choices)}
+
+
+class RankedChoicesMixin:
+    """
+    Mixin for role choices declared from the highest to the lowest rank. Ranks are
+    integers, so permission checks compare numbers and querysets filter on the
+    rank expression, e.g. the roles of at least manager.
+    """
+
+    @property
+    def rank(self) -> int:
+        return get_choices_ranks(type(self))[self.value]
+
+    @classmethod
+    def get_rank(cls, value: str | None) -> int:
+        """Get the rank of a value, 0 for an unknown value."""
+        return get_choices_ranks(cls).get(value, 0)
+
+    @classmethod
+    def rank_expression(
+        cls, field: str = 'role', promote: models.Q | None = None
+    ) -> models.Case:
+        """
+        Get the SQL expression of the rank of a role field.
+        :param field: Path of the role field.
+        :param promote: Condition under which the rank is the highest one, whatever
+                        the role, e.g. superusers.
+        """
+        ranks = get_choices_ranks(cls)
+        whens = [
+            models.When(**{field: value}, then=models.Value(rank))
+            for value, rank in ranks.items()
+        ]
+        if promote is not None:
+            whens.insert(
+                0, models.When(promote, then=models.Value(max(ranks.values())))
+            )
+        return models.Case(
+            *whens, default=models.Value(0), output_field=models.IntegerField()
+        )
+
+
+class EmailOutboxStatusChoices(models.TextChoices):
+    PENDING = 'pending', _('Pending')
+    SENT = 'sent', _('Sent')
+    FAILED = 'failed', _('Failed')
+
+
+class BulkResultStatusChoices(models.TextChoices):
+    CREATED = 'created', _('Created')
+    REACTIVATED = 'reactivated', _('Reactivated')
+    UPDATED = 'updated', _('Updated')
+    UNCHANGED = 'unchanged', _('Unchanged')
+    INVALID = 'invalid', _('Invalid')
+    SKIPPED = 'skipped', _('Skipped')
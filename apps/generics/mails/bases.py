@@ -5,11 +5,12 @@ import logging
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 from django.utils.translation import gettext as _
 from django.views.generic import TemplateView
 
+from apps.generics.mails.outbox import queue_message
+from apps.generics.mails.rendering import render_email
+
 
 class EmailView(TemplateView):
     """
@@ -101,6 +102,10 @@ class EmailBase:
     language: str = settings.LANGUAGE_CODE
     system_title = settings.SYSTEM_TITLE
 
+    # Context values that change per recipient, as dotted paths. They are
+    # substituted into a cached rendering of the template variant.
+    recipient_fields: tuple[str, ...] = ('recipient_list', 'unsubscribe_url')
+
     def __init__(self, is_preview: bool = False, **kwargs):
         """
         Initializes the EmailBase instance with recipient list and optional attributes.
@@ -213,11 +218,11 @@ class EmailBase:
 
     def get_message(self) -> EmailMultiAlternatives:
         """Renders the email template and returns an EmailMultiAlternatives object."""
-        html_content = render_to_string(
+        html_content, text_content = render_email(
             template_name=self.get_template_name(),
             context=self.get_context_data(),
+            recipient_fields=self.recipient_fields,
         )
-        text_content = strip_tags(html_content)
         msg = EmailMultiAlternatives(
             subject=self.get_subject(),
             body=text_content,
@@ -234,9 +239,19 @@ class EmailBase:
                 )
         return msg
 
-    def send(self, fail_silently: bool = False) -> int:
-        """Sends the email and returns the number of successfully delivered messages."""
+    def send(self, fail_silently: bool = False, use_outbox: bool | None = None) -> int:
+        """
+        Sends the email and returns the number of successfully delivered messages.
+        In outbox mode the rendered message is only queued, to be delivered by the
+        `deliver_emails` command, and the number of queued messages is returned.
+        :param fail_silently: Whether delivery errors are ignored.
+        :param use_outbox: Whether to queue the message, `EMAIL_OUTBOX_ENABLED` if
+                           not provided.
+        """
         email = self.get_message()
+        if settings.EMAIL_OUTBOX_ENABLED if use_outbox is None else use_outbox:
+            queue_message(email)
+            return 1
         return email.send(fail_silently=fail_silently)
 
     @classmethod
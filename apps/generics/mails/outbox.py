@@ -0,0 +1,126 @@
+import logging
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.generics.choices import EmailOutboxStatusChoices
+from apps.generics.models.outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryResult(NamedTuple):
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.sent + self.retried + self.failed
+
+    def __add__(self, other: 'DeliveryResult') -> 'DeliveryResult':
+        return DeliveryResult(*(a + b for a, b in zip(self, other, strict=True)))
+
+
+def queue_message(message: EmailMessage) -> EmailOutbox:
+    """Write a rendered message to the outbox, to be sent by `deliver_emails`."""
+    entry = EmailOutbox.from_message(message)
+    entry.save()
+    return entry
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """Get the exponential backoff before the next attempt after a failure."""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_batch(batch_size: int) -> list[EmailOutbox]:
+    """
+    Claim a batch of due entries. Their next attempt is pushed past a lease, so
+    concurrent workers skip them and a crashed worker's entries are retried once
+    the lease expires.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=EmailOutboxStatusChoices.PENDING,
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        EmailOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE),
+        )
+    for entry in entries:
+        entry.attempts += 1
+    return entries
+
+
+def deliver_batch(
+    connection=None,
+    batch_size: int | None = None,
+    max_attempts: int | None = None,
+) -> DeliveryResult:
+    """
+    Deliver a batch of due outbox entries over one email connection.
+    Failed entries are retried with exponential backoff and dead-lettered as
+    failed after the maximum number of attempts.
+    :param connection: Email backend connection to reuse, a new one if not provided.
+    :param batch_size: Maximum number of entries to deliver.
+    :param max_attempts: Attempts after which an entry is marked as failed.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    if not (entries := claim_batch(batch_size)):
+        return DeliveryResult()
+
+    connection = connection or get_connection()
+    sent, failed = [], []
+    for entry in entries:
+        try:
+            if not connection.send_messages([entry.to_message(connection)]):
+                raise RuntimeError('The email backend did not send the message.')
+        except Exception as err:
+            logger.warning('Failed to deliver email %s: %s', entry.pk, err)
+            # Drop a possibly broken connection, the next message reopens it
+            connection.close()
+            entry.last_error = f'{type(err).__name__}: {err}'
+            if entry.attempts >= max_attempts:
+                entry.status = EmailOutboxStatusChoices.FAILED
+            else:
+                entry.next_attempt_at = timezone.now() + get_retry_delay(entry.attempts)
+            failed.append(entry)
+        else:
+            sent.append(entry.pk)
+
+    EmailOutbox.objects.filter(pk__in=sent).update(
+        status=EmailOutboxStatusChoices.SENT,
+        sent_at=timezone.now(),
+        last_error='',
+    )
+    EmailOutbox.objects.bulk_update(
+        failed, fields=['status', 'next_attempt_at', 'last_error']
+    )
+    dead = sum(entry.status == EmailOutboxStatusChoices.FAILED for entry in failed)
+    return DeliveryResult(sent=len(sent), retried=len(failed) - dead, failed=dead)
+
+
+def deliver_due(
+    batch_size: int | None = None,
+    max_attempts: int | None = None,
+) -> DeliveryResult:
+    """Deliver every due outbox entry, batch by batch, over one email connection."""
+    result = DeliveryResult()
+    with get_connection() as connection:
+        while (batch := deliver_batch(connection, batch_size, max_attempts)).total:
+            result += batch
+    return result
@@ -0,0 +1,194 @@
+import copy
+import re
+import uuid
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.functional import Promise
+from django.utils.html import conditional_escape, strip_tags
+from django.utils.translation import get_language
+
+from apps.generics.utils.cache import MISSING, LocalCache
+
+SLOT_PREFIX = f'emailslot{uuid.uuid4().hex}x'
+SLOT_PATTERN = re.compile(rf'{SLOT_PREFIX}(\d+)x')
+UNCACHEABLE = 'uncacheable'
+
+email_render_cache = LocalCache(
+    timeout=settings.EMAIL_RENDER_CACHE_TIMEOUT,
+    maxsize=settings.EMAIL_RENDER_CACHE_MAXSIZE,
+)
+
+
+class RenderedEmail(NamedTuple):
+    html: str
+    text: str
+
+
+class CompiledEmail(NamedTuple):
+    """
+    Rendering of an email template variant, split around the slots of the
+    per-recipient fields. Static parts are strings and slots are their indexes.
+    """
+
+    html: tuple[str | int, ...]
+    text: tuple[str | int, ...]
+
+    @staticmethod
+    def _join(parts: tuple[str | int, ...], values: list[str]) -> str:
+        return ''.join(
+            part if isinstance(part, str) else values[part] for part in parts
+        )
+
+    def render(self, values: list[Any]) -> RenderedEmail:
+        # Slots are autoescaped in the HTML, and `strip_tags` keeps escaped text
+        # as is, so the same value is valid for the plain-text alternative.
+        escaped = [conditional_escape(value) for value in values]
+        return RenderedEmail(
+            html=self._join(self.html, escaped), text=self._join(self.text, escaped)
+        )
+
+
+def _get_slot(index: int) -> str:
+    return f'{SLOT_PREFIX}{index}x'
+
+
+def _split(content: str) -> tuple[str | int, ...] | None:
+    """Split a rendering around its slots, or None if a slot was transformed."""
+    parts = SLOT_PATTERN.split(content)
+    static_parts = parts[::2]
+    if any(SLOT_PREFIX in part.lower() for part in static_parts):
+        return None
+    return tuple(
+        part if index % 2 == 0 else int(part)
+        for index, part in enumerate(parts)
+        if part
+    )
+
+
+def _get_path(context: dict, path: str) -> Any:
+    head, *attributes = path.split('.')
+    value = context.get(head)
+    for attribute in attributes:
+        if value is None:
+            return None
+        value = getattr(value, attribute, None)
+    return value
+
+
+def _set_path(context: dict, path: str, value: Any):
+    """Set a dotted path of the context, copying the objects along the way."""
+    head, *attributes = path.split('.')
+    if not attributes:
+        context[head] = value
+        return
+    parent = context[head] = copy.copy(context[head])
+    for attribute in attributes[:-1]:
+        child = copy.copy(getattr(parent, attribute))
+        setattr(parent, attribute, child)
+        parent = child
+    setattr(parent, attributes[-1], value)
+
+
+def _freeze(value: Any) -> Any:
+    """Get a hashable fingerprint of a context value."""
+    if value is None or isinstance(value, str | int | float):
+        return value
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in sorted(value.items()))
+    if isinstance(value, list | tuple | set):
+        return tuple(_freeze(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return type(value).__qualname__, _freeze(vars(value))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _render_full(template_name: str, context: dict) -> RenderedEmail:
+    html = render_to_string(template_name=template_name, context=context)
+    return RenderedEmail(html=html, text=strip_tags(html))
+
+
+def compile_email(
+    template_name: str, context: dict, slots: list[str], rendered: RenderedEmail
+) -> CompiledEmail | None:
+    """
+    Render a template variant with slot markers in place of the per-recipient
+    fields and strip its tags once.
+    :param template_name: Name of the template to render.
+    :param context: Context of the template.
+    :param slots: Dotted paths of the per-recipient fields of the context.
+    :param rendered: Full rendering of the context, which the compiled variant must
+                     reproduce.
+    :return: The compiled variant, or None if the template transforms a slot
+             (e.g. with a filter), or reads one without printing it (e.g. in a
+             condition), so it cannot be substituted.
+    """
+    marked = dict(context)
+    for index, path in enumerate(slots):
+        _set_path(marked, path, _get_slot(index))
+    html = render_to_string(template_name=template_name, context=marked)
+    html_parts = _split(html)
+    text_parts = _split(strip_tags(html))
+    if html_parts is None or text_parts is None:
+        return None
+    # A slot that is never printed may still change the output, e.g. in a
+    # condition, so the variant must not change without the unprinted slots
+    printed = {part for part in html_parts if isinstance(part, int)}
+    if unprinted := [path for i, path in enumerate(slots) if i not in printed]:
+        for path in unprinted:
+            _set_path(marked, path, None)
+        if render_to_string(template_name=template_name, context=marked) != html:
+            return None
+    compiled = CompiledEmail(html=html_parts, text=text_parts)
+    values = [_get_path(context, path) for path in slots]
+    if compiled.render(values) != rendered:
+        return None
+    return compiled
+
+
+def render_email(
+    template_name: str, context: dict, recipient_fields: tuple[str, ...] = ()
+) -> RenderedEmail:
+    """
+    Render an email template and its plain-text alternative.
+    Each variant of a template, i.e. its name, the active language and the
+    invariant part of the context, is compiled once with the first recipient, and
+    only cached if it reproduces the full rendering; later renders only substitute
+    the per-recipient fields.
+    :param template_name: Name of the template to render.
+    :param context: Context of the template.
+    :param recipient_fields: Dotted paths of the context values that change per
+                             recipient, e.g. `cta.url`. They are autoescaped and
+                             must only be output by the template, not compared.
+    """
+    slots, values = [], []
+    for path in recipient_fields:
+        value = _get_path(context, path)
+        if value:
+            slots.append(path)
+            values.append(value)
+
+    if not settings.EMAIL_RENDER_CACHE_ENABLED:
+        return _render_full(template_name, context)
+
+    invariant = dict(context)
+    for path in slots:
+        _set_path(invariant, path, None)
+    key = (template_name, get_language(), tuple(slots), _freeze(invariant))
+    compiled = email_render_cache.get(key)
+    if isinstance(compiled, CompiledEmail):
+        return compiled.render(values)
+
+    rendered = _render_full(template_name, context)
+    if compiled is MISSING:
+        # The first recipient of a variant checks the compiled variant
+        compiled = compile_email(template_name, context, slots, rendered)
+        email_render_cache.set(key, compiled or UNCACHEABLE)
+    return rendered
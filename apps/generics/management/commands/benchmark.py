@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from apps.generics.benchmarks.runner import (
+    compare,
+    load_baseline,
+    run_case,
+    save_baseline,
+)
+from apps.generics.benchmarks.scenarios import get_cases, seed_tenant
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed an organization with many members, teams and team memberships, then '
+        'time every routed action over it and compare the p50/p95, query counts '
+        'and allocations to a JSON baseline. Nothing seeded is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--members',
+            type=int,
+            default=settings.BENCHMARK_MEMBERS,
+            help='Number of members of the seeded organization.',
+        )
+        parser.add_argument(
+            '--teams',
+            type=int,
+            default=settings.BENCHMARK_TEAMS,
+            help='Number of teams of the seeded organization.',
+        )
+        parser.add_argument(
+            '--team-members',
+            type=int,
+            default=settings.BENCHMARK_TEAM_MEMBERS,
+            help='Number of team memberships of the seeded organization.',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=settings.BENCHMARK_ITERATIONS,
+            help='Number of timed requests per action.',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=settings.BENCHMARK_BASELINE,
+            help='Path of the JSON baseline.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=settings.BENCHMARK_THRESHOLD,
+            help='Growth ratio past which a timing or allocation regresses.',
+        )
+        parser.add_argument(
+            '--save',
+            action='store_true',
+            help='Write the results as the new baseline instead of comparing.',
+        )
+        parser.add_argument(
+            '--require-baseline',
+            action='store_true',
+            help='Fail instead of warning when there is no baseline to compare to.',
+        )
+        parser.add_argument(
+            '--only',
+            nargs='*',
+            default=None,
+            help='Names of the actions to run, e.g. members.list.',
+        )
+
+    def handle(self, *args, **options):
+        if options['members'] < 1 or options['teams'] < 1:
+            raise CommandError('At least one member and one team are required.')
+        missing_baseline = (
+            f'No baseline at {options["baseline"]}, run with --save to record one.'
+        )
+        if (
+            options['require_baseline']
+            and not options['save']
+            and load_baseline(options['baseline']) is None
+        ):
+            raise CommandError(missing_baseline)
+
+        # Allow the test client host and keep the emails in memory
+        with (
+            override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            ),
+            transaction.atomic(),
+        ):
+            tenant = seed_tenant(
+                members=options['members'],
+                teams=options['teams'],
+                team_members=options['team_members'],
+            )
+            results = []
+            for case in get_cases(tenant):
+                if options['only'] and case.name not in options['only']:
+                    continue
+                result = run_case(case, iterations=options['iterations'])
+                results.append(result)
+                self.stdout.write(
+                    f'{result.name:<36} p50 {result.p50 * 1000:8.2f}ms  '
+                    f'p95 {result.p95 * 1000:8.2f}ms  '
+                    f'{result.queries:3d} queries  '
+                    f'{result.cache_calls:3d} cache calls  '
+                    f'{result.allocations / 1024:9.1f}KiB'
+                )
+            # Nothing seeded or created by the requests is kept
+            transaction.set_rollback(True)
+
+        if options['save']:
+            save_baseline(options['baseline'], tenant.sizes, results)
+            self.stdout.write(
+                self.style.SUCCESS(f'Baseline written to {options["baseline"]}.')
+            )
+            return
+
+        if not (baseline := load_baseline(options['baseline'])):
+            self.stdout.write(self.style.WARNING(missing_baseline))
+            return
+        if baseline['tenant'] != tenant.sizes:
+            raise CommandError(
+                f'The baseline was recorded over a tenant of {baseline["tenant"]}, '
+                f'not {tenant.sizes}.'
+            )
+
+        if regressions := compare(results, baseline, options['threshold']):
+            raise CommandError(
+                'Regressions past the baseline:\n'
+                + '\n'.join(f'  {regression}' for regression in regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('No regression past the baseline.'))
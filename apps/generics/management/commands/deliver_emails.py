@@ -0,0 +1,58 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from apps.generics.mails.outbox import deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Deliver the emails queued in the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Number of emails claimed per batch.',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            help='Attempts after which an email is marked as failed.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting once it is drained.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polls with --loop.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                result = deliver_due(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                )
+            except Exception as err:
+                if not options['loop']:
+                    raise
+                self.stderr.write(self.style.ERROR(f'Delivery failed: {err}'))
+            else:
+                if result.total or not options['loop']:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'Sent {result.sent} emails, {result.retried} to retry, '
+                            f'{result.failed} failed.'
+                        )
+                    )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
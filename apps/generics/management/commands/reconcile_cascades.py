@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.generics.models.cascades import (
+    cascade_active,
+    get_cascade_relations,
+    get_cascading_models,
+    iter_straggler_chunks,
+    set_rows_active,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Deactivate the active rows left under an inactive parent, e.g. the team '
+        'members of a deactivated team, in chunks of rows. Each chunk is '
+        'deactivated and cascaded in its own transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.RECONCILE_CASCADES_CHUNK_SIZE,
+            help='Number of rows deactivated per UPDATE.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=settings.RECONCILE_CASCADES_SLEEP,
+            help='Seconds to wait between chunks, to let other writers through.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size, sleep = options['chunk_size'], options['sleep']
+        for model in get_cascading_models():
+            for relation in get_cascade_relations(model):
+                child_model, repaired = relation.related_model, 0
+                for chunk in iter_straggler_chunks(relation, chunk_size):
+                    with transaction.atomic():
+                        now = timezone.now()
+                        pks = set_rows_active(
+                            child_model._base_manager.filter(
+                                pk__in=chunk, is_active=True
+                            ),
+                            False,
+                            now,
+                        )
+                        cascade_active(child_model, pks, False, now)
+                    repaired += len(pks)
+                    if len(chunk) == chunk_size:
+                        time.sleep(sleep)
+                self.stdout.write(
+                    f'{model._meta.label}.{relation.name}: deactivated {repaired} rows.'
+                )
+        self.stdout.write(self.style.SUCCESS('Cascades reconciled.'))
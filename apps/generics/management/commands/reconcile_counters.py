@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from apps.generics.models.counters import get_counted_models, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Repair the counter columns that drifted from the rows they count, e.g. '
+        'the members of the organizations and teams, in chunks of rows. Each '
+        'chunk is read and repaired with one statement each.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.RECONCILE_COUNTERS_CHUNK_SIZE,
+            help='Number of rows checked per UPDATE.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=settings.RECONCILE_COUNTERS_SLEEP,
+            help='Seconds to wait between chunks, to let other writers through.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size, sleep = options['chunk_size'], options['sleep']
+        for model in get_counted_models():
+            for counter in model.counters:
+                counter_model = model.get_counter_model(counter)
+                repaired, last_pk = 0, None
+                while True:
+                    # Keyset chunks, so each one is an index range scan
+                    queryset = counter_model._base_manager.order_by('pk')
+                    if last_pk is not None:
+                        queryset = queryset.filter(pk__gt=last_pk)
+                    pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+                    if not pks:
+                        break
+                    repaired += reconcile_counters(model, counter, pks)
+                    last_pk = pks[-1]
+                    if len(pks) < chunk_size:
+                        break
+                    time.sleep(sleep)
+                self.stdout.write(
+                    f'{counter_model._meta.label}.{counter.field}: repaired '
+                    f'{repaired} rows.'
+                )
+        self.stdout.write(self.style.SUCCESS('Counters reconciled.'))
@@ -0,0 +1,94 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import status as http_status
+
+from apps.generics.utils import metrics
+
+METRICS_VIEW_ATTRIBUTE = '_metrics_view'
+
+
+class QueryRecorder:
+    """Database execute wrapper that counts and times the queries it runs."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, SQL query count and time and response size of every
+    request, labelled by route (URL name) and action, plus counters of permission
+    denials and error responses.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED or self.is_excluded(request):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        self.record(request, response, duration, recorder)
+        return response
+
+    @staticmethod
+    def is_excluded(request) -> bool:
+        return request.path == settings.METRICS_PATH or request.path.startswith(
+            settings.STATIC_URL
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        setattr(request, METRICS_VIEW_ATTRIBUTE, view_func)
+
+    @staticmethod
+    def get_labels(request) -> dict:
+        """Get the route, action and method labels of a request."""
+        method = request.method.lower()
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unmatched'
+        view_func = getattr(request, METRICS_VIEW_ATTRIBUTE, None)
+        # Viewsets map each HTTP method to an action, e.g. get -> list
+        actions = getattr(view_func, 'actions', None) or {}
+        return {
+            'route': route,
+            'action': actions.get(method, method),
+            'method': request.method,
+        }
+
+    def record(self, request, response, duration: float, recorder: QueryRecorder):
+        labels = self.get_labels(request)
+        metrics.request_duration.observe(duration, **labels)
+        metrics.request_queries.observe(recorder.count, **labels)
+        metrics.request_query_duration.observe(recorder.duration, **labels)
+        if not response.streaming:
+            metrics.response_size.observe(len(response.content), **labels)
+
+        status = response.status_code
+        if status in [
+            http_status.HTTP_401_UNAUTHORIZED,
+            http_status.HTTP_403_FORBIDDEN,
+        ]:
+            metrics.permission_denials.inc(status=status, **labels)
+        if status >= http_status.HTTP_400_BAD_REQUEST:
+            metrics.error_responses.inc(status=status, **labels)
+        metrics.registry.flush()
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.3 on 2026-10-18 02:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(help_text='Subject of the email', max_length=998, verbose_name='Subject')),
+                ('from_email', models.CharField(blank=True, help_text='Sender of the email', max_length=320, verbose_name='From Email')),
+                ('to', models.JSONField(default=list, help_text='Recipients of the email', verbose_name='To')),
+                ('body', models.TextField(blank=True, help_text='Plain text body of the email', verbose_name='Body')),
+                ('alternatives', models.JSONField(default=list, help_text='Alternative contents of the email, e.g. its HTML', verbose_name='Alternatives')),
+                ('attachments', models.JSONField(default=list, help_text='Attachments of the email, with base64 encoded contents', verbose_name='Attachments')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', help_text='Delivery status of the email', max_length=20, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Number of delivery attempts', verbose_name='Attempts')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the next delivery attempt may run', verbose_name='Next Attempt At')),
+                ('last_error', models.TextField(blank=True, help_text='Error of the last failed delivery attempt', verbose_name='Last Error')),
+                ('sent_at', models.DateTimeField(blank=True, help_text='When the email was delivered', null=True, verbose_name='Sent At')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the email was queued', verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Email Outbox',
+                'verbose_name_plural': 'Email Outbox',
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at', 'id'], name='email_outbox_pending_idx')],
+            },
+        ),
+    ]
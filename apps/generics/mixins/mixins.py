@@ -3,11 +3,7 @@ from django.utils.functional import cached_property
 
 from apps.accounts.models.member import Member
 from apps.accounts.models.organization import Organization
-from apps.generics.utils.requests import (
-    get_member,
-    get_organization,
-    get_organization_id,
-)
+from apps.generics.utils.requests import AuthContext, get_auth_context
 
 User = get_user_model()
 
@@ -15,6 +11,11 @@ User = get_user_model()
 class RequestUserMixin:
     """Mixin for views to add user, member, and organization properties."""
 
+    @property
+    def auth_context(self) -> AuthContext:
+        """Get the authentication context of the request."""
+        return get_auth_context(self.request)
+
     @cached_property
     def auth_user(self) -> User | None:
         """Get the user from the context."""
@@ -25,14 +26,14 @@ class RequestUserMixin:
     @cached_property
     def auth_member(self) -> Member | None:
         """Get the member from the context."""
-        return get_member(self.request)
+        return self.auth_context.member
 
     @cached_property
     def auth_organization(self) -> Organization | None:
         """Get the organization from the context."""
-        return get_organization(self.request)
+        return self.auth_context.organization
 
     @cached_property
     def auth_organization_id(self) -> int | None:
         """Get the organization ID from the context."""
-        return get_organization_id(self.request)
+        return self.auth_context.organization_id
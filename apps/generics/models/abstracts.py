@@ -1,8 +1,13 @@
+from collections.abc import Iterable
+from typing import Any
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.generics.managers.querysets import BaseManager, BaseQuerySet
+from apps.generics.models.cascades import cascade_active
 
 
 class BaseModel(models.Model):
@@ -11,6 +16,13 @@ class BaseModel(models.Model):
         verbose_name=_('Is Active'),
         help_text=_('Is this record active or not'),
     )
+    deactivated_at = models.DateTimeField(
+        editable=False,
+        null=True,
+        blank=True,
+        verbose_name=_('Deactivated At'),
+        help_text=_('When the record was deactivated, shared by a whole cascade'),
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_('Created At'),
@@ -42,16 +54,130 @@ class BaseModel(models.Model):
 
     objects = BaseManager.from_queryset(BaseQuerySet)
 
+    # Reverse relations whose rows are deactivated and reactivated with the row
+    cascade_relations: tuple[str, ...] = ()
+    # Whether saves of a loaded row only write the fields changed since it loaded
+    track_changes = True
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Deferred fields are left out, and written if assigned
+        instance._loaded_values = dict(zip(field_names, values, strict=True))
+        return instance
+
+    def get_field_values(self, fields: Iterable[str] | None = None) -> dict[str, Any]:
+        """
+        Get the values of the loaded concrete fields, by attribute name.
+        :param fields: Names or attribute names of the fields, all by default.
+        """
+        fields = None if fields is None else set(fields)
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (fields is None or field.name in fields or field.attname in fields)
+        }
+
+    def get_changed_fields(self) -> list[str]:
+        """
+        Get the names of the fields changed since the row was loaded or saved. The
+        values are compared by equality, so in-place changes of a mutable value are
+        not seen.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                field.attname not in loaded
+                or self.__dict__[field.attname] != loaded[field.attname]
+            )
+        ]
+
+    def has_changed(self, field_name: str) -> bool:
+        """Check if a field changed since the row was loaded or saved."""
+        return field_name in self.get_changed_fields()
+
+    def get_update_fields(self) -> list[str] | None:
+        """
+        Get the fields a save of the loaded row writes when none are given, None
+        for every field.
+        """
+        if not self.track_changes or not hasattr(self, '_loaded_values'):
+            return None
+        return self.get_changed_fields()
+
+    def is_save_skipped(
+        self, update_fields=None, force_insert: bool = False, **kwargs
+    ) -> bool:
+        """Check if a save with the given arguments has nothing to write."""
+        return (
+            not self._state.adding
+            and update_fields is None
+            and not force_insert
+            and self.get_update_fields() == []
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Save the row. Unless `update_fields` is given or `track_changes` is off, a
+        loaded row only writes the fields changed since it loaded, plus
+        `updated_at` and `updated_by`, and skips the write when none changed.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            update_fields = self.get_update_fields()
+            if update_fields is not None:
+                if not update_fields:
+                    return
+                kwargs['update_fields'] = {*update_fields, 'updated_at', 'updated_by'}
+        super().save(*args, **kwargs)
+        # A new dict, as copies of the instance share the previous one
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **self.get_field_values(kwargs.get('update_fields')),
+        }
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **self.get_field_values(fields),
+        }
+
     def activate(self):
-        self.is_active = True
-        self.save()
+        self.set_active(True)
 
     def inactivate(self):
-        self.is_active = False
-        self.save()
+        self.set_active(False)
+
+    def set_active(self, is_active: bool):
+        """
+        Flag the row as active or not, and cascade the flag to the rows of its
+        `cascade_relations` with set-based UPDATEs, in a single transaction.
+        :param is_active: Value of the active flag.
+        """
+        deactivated_at = self.deactivated_at
+        with transaction.atomic():
+            self.is_active = is_active
+            self.deactivated_at = None if is_active else timezone.now()
+            self.save()
+            if self.cascade_relations:
+                cascade_active(
+                    type(self),
+                    [self.pk],
+                    is_active,
+                    self.updated_at,
+                    deactivated_at if is_active else self.deactivated_at,
+                )
 
     @classmethod
     def schema_tags(cls):
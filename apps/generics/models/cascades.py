@@ -0,0 +1,122 @@
+from collections.abc import Iterator
+from datetime import datetime
+
+from django.apps import apps
+from django.db import models
+from django.db.models.fields.reverse_related import ManyToOneRel
+from django.dispatch import Signal
+
+from apps.generics.models.counters import CountedModelMixin, update_counted_rows
+
+# Sent with the primary keys of rows activated or deactivated by a set-based
+# UPDATE, which bypasses `save` and its signals, so caches can be invalidated
+rows_active_changed = Signal()
+
+
+def get_cascade_relations(model: type[models.Model]) -> list[ManyToOneRel]:
+    """Get the reverse relations the active flag of a model cascades to."""
+    return [
+        model._meta.get_field(name) for name in getattr(model, 'cascade_relations', ())
+    ]
+
+
+def get_cascading_models() -> list[type[models.Model]]:
+    return [model for model in apps.get_models() if get_cascade_relations(model)]
+
+
+def set_rows_active(
+    queryset: models.QuerySet,
+    is_active: bool,
+    now: datetime,
+    deactivated_at: datetime | None = None,
+) -> list[int]:
+    """
+    Flag the rows of a queryset as active or not with a single UPDATE, moving the
+    counters they are counted in and sending `rows_active_changed`.
+    :param queryset: Rows to update.
+    :param is_active: Value of the active flag.
+    :param now: Value of `updated_at`, shared by every row of a cascade.
+    :param deactivated_at: On deactivation, value of `deactivated_at`, shared by
+                           every row of a cascade, `now` by default.
+    :return: Primary keys of the updated rows.
+    """
+    model = queryset.model
+    pks = list(queryset.values_list('pk', flat=True))
+    if not pks:
+        return pks
+    rows = model._base_manager.filter(pk__in=pks)
+    values = {
+        'is_active': is_active,
+        'deactivated_at': None if is_active else deactivated_at or now,
+        'updated_at': now,
+    }
+    if issubclass(model, CountedModelMixin) and model.counters:
+        update_counted_rows(rows, **values)
+    else:
+        rows.update(**values)
+    rows_active_changed.send(sender=model, pks=pks, is_active=is_active)
+    return pks
+
+
+def cascade_active(
+    model: type[models.Model],
+    pks: list[int],
+    is_active: bool,
+    now: datetime,
+    deactivated_at: datetime | None = None,
+) -> None:
+    """
+    Cascade the active flag of rows to the rows of their `cascade_relations`, one
+    UPDATE per relation and level. Deactivated rows get the `deactivated_at` of the
+    row that started the cascade, so a reactivation only restores the rows
+    deactivated along with it, and not the ones deactivated on their own before.
+    Unlike `updated_at`, the marker is kept by the writes to the inactive rows,
+    e.g. their counters.
+    :param model: Model of the rows.
+    :param pks: Primary keys of the rows.
+    :param is_active: Value of the active flag.
+    :param now: Value of `updated_at` of the cascaded rows.
+    :param deactivated_at: When the cascade deactivated the rows, `now` by default
+                           on deactivation. On reactivation, no row is restored
+                           without it.
+    """
+    if is_active and deactivated_at is None:
+        return
+    for relation in get_cascade_relations(model):
+        children = relation.related_model._base_manager.filter(
+            **{f'{relation.field.name}__in': pks}
+        )
+        if is_active:
+            children = children.filter(is_active=False, deactivated_at=deactivated_at)
+        else:
+            children = children.filter(is_active=True)
+        child_pks = set_rows_active(children, is_active, now, deactivated_at)
+        if child_pks:
+            cascade_active(
+                relation.related_model, child_pks, is_active, now, deactivated_at
+            )
+
+
+def get_stragglers(relation: ManyToOneRel) -> models.QuerySet:
+    """Get the active rows of a cascade relation whose parent is inactive."""
+    return relation.related_model._base_manager.filter(
+        is_active=True, **{f'{relation.field.name}__is_active': False}
+    )
+
+
+def iter_straggler_chunks(
+    relation: ManyToOneRel, chunk_size: int
+) -> Iterator[list[int]]:
+    """Yield the primary keys of the stragglers of a relation, in keyset chunks."""
+    last_pk = None
+    while True:
+        queryset = get_stragglers(relation).order_by('pk')
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+        pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+        if len(pks) < chunk_size:
+            return
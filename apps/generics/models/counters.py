@@ -0,0 +1,249 @@
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class Counter(NamedTuple):
+    """A column of a related model that counts the rows of a model."""
+
+    # Foreign key of the counted model to the row holding the counter
+    relation: str
+    # Counter column of the related model
+    field: str
+
+
+def add_to_counters(
+    model: type[models.Model],
+    field: str,
+    amounts: Mapping[int, int],
+    now: datetime | None = None,
+) -> None:
+    """
+    Add to the counter of each row, with one UPDATE per distinct amount, e.g. -3
+    to every team that lost 3 members. The rows are touched, so their conditional
+    responses are not served stale.
+    :param model: Model holding the counter.
+    :param field: Counter column.
+    :param amounts: Amount to add, by primary key of the row.
+    :param now: Value of `updated_at`, the current time by default.
+    """
+    pks_by_amount = defaultdict(list)
+    for pk, amount in amounts.items():
+        if pk is not None and amount:
+            pks_by_amount[amount].append(pk)
+    now = now or timezone.now()
+    for amount, pks in pks_by_amount.items():
+        model._base_manager.filter(pk__in=pks).update(
+            **{field: models.F(field) + amount}, updated_at=now
+        )
+
+
+class CounterFieldsMixin:
+    """
+    Mixin for models holding counter columns. The counters are only moved by the
+    set-based updates of `add_to_counters`, so the saves of an instance, whose
+    counters may be stale, do not write them back.
+    """
+
+    counter_fields: tuple[str, ...] = ()
+
+    def get_update_fields(self) -> list[str]:
+        update_fields = super().get_update_fields()
+        if update_fields is None:
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+            ]
+        return [name for name in update_fields if name not in self.counter_fields]
+
+
+class CountedModelMixin:
+    """
+    Mixin for models counted by columns of related models, e.g. the members of an
+    organization. Saves and deletes move the counters in the same transaction when
+    a row starts or stops being counted or moves to another related row. Bulk
+    writes bypass them and call `add_to_counters`, and the `reconcile_counters`
+    command repairs any drift, e.g. from cascading deletes.
+    """
+
+    counters: tuple[Counter, ...] = ()
+    # Fields read by the counted condition
+    counted_fields: tuple[str, ...] = ('is_active',)
+
+    @classmethod
+    def get_counted_condition(cls) -> models.Q:
+        """Get the condition of the counted rows, in SQL."""
+        return models.Q(is_active=True)
+
+    def is_counted(self) -> bool:
+        """Check whether the row is counted, in Python."""
+        return self.is_active
+
+    @classmethod
+    def get_counter_model(cls, counter: Counter) -> type[models.Model]:
+        return cls._meta.get_field(counter.relation).related_model
+
+    def get_counter_targets(self) -> dict[Counter, int | None]:
+        """Get the related row each counter counts the row in, None if not counted."""
+        counted = self.is_counted()
+        return {
+            counter: (
+                getattr(self, self._meta.get_field(counter.relation).attname)
+                if counted
+                else None
+            )
+            for counter in self.counters
+        }
+
+    def get_saved_counter_targets(self) -> dict[Counter, int | None]:
+        """
+        Get the related rows the row is counted in, as saved. The row is locked
+        until the end of the transaction, so a concurrent write of the same row
+        waits and then moves the counters from what this one saved.
+        """
+        if self._state.adding:
+            return dict.fromkeys(self.counters)
+        saved = (
+            type(self)
+            ._base_manager.select_for_update()
+            .filter(pk=self.pk)
+            .only(*self.counted_fields, *(c.relation for c in self.counters))
+            .first()
+        )
+        return saved.get_counter_targets() if saved else dict.fromkeys(self.counters)
+
+    def update_counters(
+        self,
+        previous: dict[Counter, int | None],
+        current: dict[Counter, int | None],
+    ):
+        """Move the counters from the previous related rows to the current ones."""
+        for counter in self.counters:
+            if previous[counter] != current[counter]:
+                add_to_counters(
+                    self.get_counter_model(counter),
+                    counter.field,
+                    {previous[counter]: -1, current[counter]: 1},
+                )
+
+    def save(self, *args, **kwargs):
+        if self.is_save_skipped(**kwargs):
+            return
+        with transaction.atomic():
+            previous = self.get_saved_counter_targets()
+            super().save(*args, **kwargs)
+            self.update_counters(previous, self.get_counter_targets())
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = self.get_saved_counter_targets()
+            result = super().delete(*args, **kwargs)
+            self.update_counters(previous, dict.fromkeys(self.counters))
+        return result
+
+
+def count_by_target(rows: models.QuerySet, counter: Counter) -> dict[int, int]:
+    """Count the counted rows of a queryset, by related row of a counter."""
+    return dict(
+        rows.filter(rows.model.get_counted_condition())
+        .order_by()
+        .values(counter.relation)
+        .annotate(count=models.Count('pk'))
+        .values_list(counter.relation, 'count')
+    )
+
+
+def update_counted_rows(rows: models.QuerySet, **values) -> int:
+    """
+    Update rows of a counted model with a single UPDATE, and move the counters of
+    the rows that start or stop being counted, e.g. members deactivated with their
+    organization. The rows are locked and counted before the UPDATE, and grouped
+    after it, so the queryset must select the same rows once updated, e.g. by
+    primary key. The counter rows are touched with the `updated_at` set on the
+    rows, if any, so a cascade stamps every row it writes alike.
+    :param rows: Rows to update.
+    :param values: Values to set, as given to `QuerySet.update`.
+    :return: Number of rows updated.
+    """
+    model = rows.model
+    with transaction.atomic(savepoint=False):
+        # The rows are locked as they are counted, so concurrent saves of the rows
+        # wait and then move the counters from the state this UPDATE leaves
+        before = {counter: defaultdict(int) for counter in model.counters}
+        for row in (
+            rows.select_for_update()
+            .order_by('pk')
+            .only(*model.counted_fields, *(c.relation for c in model.counters))
+            .iterator()
+        ):
+            for counter, target in row.get_counter_targets().items():
+                if target is not None:
+                    before[counter][target] += 1
+        updated = rows.update(**values)
+        for counter, previous in before.items():
+            current = count_by_target(rows, counter)
+            add_to_counters(
+                model.get_counter_model(counter),
+                counter.field,
+                {
+                    pk: current.get(pk, 0) - previous.get(pk, 0)
+                    for pk in previous.keys() | current.keys()
+                },
+                now=values.get('updated_at'),
+            )
+    return updated
+
+
+def get_counted_models() -> list[type[CountedModelMixin]]:
+    return [
+        model
+        for model in apps.get_models()
+        if issubclass(model, CountedModelMixin) and model.counters
+    ]
+
+
+def get_actual_count(
+    model: type[CountedModelMixin], counter: Counter
+) -> models.Expression:
+    """Get the SQL expression of the actual value of a counter, for its rows."""
+    counted = (
+        model._base_manager.filter(
+            model.get_counted_condition(),
+            **{counter.relation: models.OuterRef('pk')},
+        )
+        .order_by()
+        .values(counter.relation)
+        .annotate(count=models.Count('pk'))
+        .values('count')
+    )
+    return Coalesce(models.Subquery(counted, output_field=models.IntegerField()), 0)
+
+
+def reconcile_counters(
+    model: type[CountedModelMixin], counter: Counter, pks: Iterable[int]
+) -> int:
+    """
+    Set the counter of the given rows to its actual value, with a single UPDATE
+    of the rows that drifted.
+    :return: Number of rows repaired.
+    """
+    counter_model = model.get_counter_model(counter)
+    actual_count = get_actual_count(model, counter)
+    drifted = list(
+        counter_model._base_manager.filter(pk__in=list(pks))
+        .annotate(actual_count=actual_count)
+        .exclude(**{counter.field: models.F('actual_count')})
+        .values_list('pk', flat=True)
+    )
+    if not drifted:
+        return 0
+    return counter_model._base_manager.filter(pk__in=drifted).update(
+        **{counter.field: actual_count}, updated_at=timezone.now()
+    )
@@ -0,0 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Cast, Upper
+
+
+def upper_trigram_index(field_name: str, name: str) -> GinIndex:
+    """
+    Build a GIN trigram index on `UPPER(field::text)`.
+    That is the expression PostgreSQL compiles case-insensitive lookups such as
+    `icontains` to, so `UPPER(field::text) LIKE UPPER('%value%')` searches the
+    index instead of scanning the table. The index is PostgreSQL only and must be
+    added with `AddPostgreSQLIndex` in migrations.
+    :param field_name: Name of the field to index.
+    :param name: Name of the index.
+    """
+    return GinIndex(
+        OpClass(
+            Upper(Cast(field_name, output_field=models.TextField())),
+            name='gin_trgm_ops',
+        ),
+        name=name,
+    )
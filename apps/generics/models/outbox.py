@@ -0,0 +1,137 @@
+import base64
+
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.generics.choices import EmailOutboxStatusChoices
+
+
+class EmailOutbox(models.Model):
+    """Rendered email waiting to be delivered by the `deliver_emails` worker."""
+
+    subject = models.CharField(
+        max_length=998,
+        verbose_name=_('Subject'),
+        help_text=_('Subject of the email'),
+    )
+    from_email = models.CharField(
+        max_length=320,
+        blank=True,
+        verbose_name=_('From Email'),
+        help_text=_('Sender of the email'),
+    )
+    to = models.JSONField(
+        default=list,
+        verbose_name=_('To'),
+        help_text=_('Recipients of the email'),
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('Body'),
+        help_text=_('Plain text body of the email'),
+    )
+    alternatives = models.JSONField(
+        default=list,
+        verbose_name=_('Alternatives'),
+        help_text=_('Alternative contents of the email, e.g. its HTML'),
+    )
+    attachments = models.JSONField(
+        default=list,
+        verbose_name=_('Attachments'),
+        help_text=_('Attachments of the email, with base64 encoded contents'),
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=EmailOutboxStatusChoices.choices,
+        default=EmailOutboxStatusChoices.PENDING,
+        verbose_name=_('Status'),
+        help_text=_('Delivery status of the email'),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Attempts'),
+        help_text=_('Number of delivery attempts'),
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('Next Attempt At'),
+        help_text=_('When the next delivery attempt may run'),
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_('Last Error'),
+        help_text=_('Error of the last failed delivery attempt'),
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Sent At'),
+        help_text=_('When the email was delivered'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created At'),
+        help_text=_('When the email was queued'),
+    )
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = _('Email Outbox')
+        verbose_name_plural = _('Email Outbox')
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                condition=models.Q(status=EmailOutboxStatusChoices.PENDING),
+                name='email_outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} - {", ".join(self.to)}'
+
+    @classmethod
+    def from_message(cls, message: EmailMessage) -> 'EmailOutbox':
+        """Build an outbox entry holding a rendered message."""
+        attachments = []
+        for filename, content, mimetype in message.attachments:
+            if isinstance(content, str):
+                content = content.encode()
+            attachments.append(
+                {
+                    'filename': filename,
+                    'content': base64.b64encode(content).decode('ascii'),
+                    'mimetype': mimetype,
+                }
+            )
+        return cls(
+            subject=message.subject,
+            from_email=message.from_email or '',
+            to=list(message.to),
+            body=message.body,
+            alternatives=[
+                {'content': content, 'mimetype': mimetype}
+                for content, mimetype in getattr(message, 'alternatives', [])
+            ],
+            attachments=attachments,
+        )
+
+    def to_message(self, connection=None) -> EmailMultiAlternatives:
+        """Rebuild the message held by the outbox entry."""
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email or None,
+            to=self.to,
+            connection=connection,
+        )
+        for alternative in self.alternatives:
+            message.attach_alternative(alternative['content'], alternative['mimetype'])
+        for attachment in self.attachments:
+            message.attach(
+                filename=attachment['filename'],
+                content=base64.b64decode(attachment['content']),
+                mimetype=attachment['mimetype'],
+            )
+        return message
@@ -0,0 +1,199 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+KeysetCursor = namedtuple('KeysetCursor', ['position', 'reverse'])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over a unique ordering, e.g. `('-id',)` or
+    `('-updated_at', '-id')`.
+    Pages are fetched with `WHERE (key) < (cursor) ORDER BY key LIMIT n`, so deep
+    pages cost the same as the first one and no `COUNT(*)` is run unless the
+    client asks for it with the count query parameter.
+    """
+
+    ordering = ('-id',)
+    count_query_param = 'count'
+    count_query_description = _('Whether to include the total count of results.')
+    invalid_cursor_message = _('Invalid cursor')
+
+    def __init__(self, ordering: tuple[str, ...] | None = None):
+        """
+        Initializes a KeysetPagination instance.
+        :param ordering: Ordering of the pages; the last field must be unique and
+                         all fields must share the same direction.
+        """
+        if ordering:
+            self.ordering = tuple(ordering)
+        directions = {field.startswith('-') for field in self.ordering}
+        if len(directions) != 1:
+            raise ValueError('All keyset ordering fields must share a direction.')
+        self.count = None
+        self.has_next = False
+        self.has_previous = False
+        self.page = []
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Names of the fields of the keyset, without direction."""
+        return tuple(field.lstrip('-') for field in self.ordering)
+
+    @property
+    def is_descending(self) -> bool:
+        return self.ordering[0].startswith('-')
+
+    def include_count(self, request) -> bool:
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true')
+
+    def get_keyset_filter(self, position: list, descending: bool) -> Q:
+        """
+        Build the row comparison `(f1, f2, ...) < (v1, v2, ...)` (or `>`) as
+        `f1 < v1 OR (f1 = v1 AND f2 < v2) OR ...`.
+        """
+        lookup = 'lt' if descending else 'gt'
+        conditions = []
+        for index, field in enumerate(self.fields):
+            equals = dict(zip(self.fields[:index], position[:index], strict=True))
+            conditions.append(Q(**equals, **{f'{field}__{lookup}': position[index]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+    def get_position_values(self, model: type[Model], position: list) -> list:
+        """
+        Coerce the values of a cursor position to the keyset fields of a model, e.g.
+        an integer id or a datetime.
+        :raise ValidationError: When a value does not fit its field.
+        """
+        values = []
+        for path, value in zip(self.fields, position, strict=True):
+            *relations, name = path.split(LOOKUP_SEP)
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            if (value := model._meta.get_field(name).to_python(value)) is None:
+                raise ValidationError('Keyset values cannot be null.')
+            values.append(value)
+        return values
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request, queryset.model)
+        if self.include_count(request):
+            self.count = queryset.count()
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        descending = self.is_descending != reverse
+        ordering = [f'-{field}' if descending else field for field in self.fields]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor and self.cursor.position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(self.cursor.position, descending)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_position(self, row) -> list:
+        """Get the keyset values of a row, a model instance or a `values()` dict."""
+        if isinstance(row, dict):
+            return [row[field] for field in self.fields]
+        return [getattr(row, field) for field in self.fields]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(
+            KeysetCursor(position=self.get_position(self.page[-1]), reverse=False)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(
+            KeysetCursor(position=self.get_position(self.page[0]), reverse=True)
+        )
+
+    def decode_cursor(
+        self, request, model: type[Model] | None = None
+    ) -> KeysetCursor | None:
+        """
+        Decode the cursor of the request, with the values of its position coerced to
+        the keyset fields of the model, if given.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position = tokens['p']
+            reverse = bool(tokens.get('r', False))
+            if not isinstance(position, list) or len(position) != len(self.fields):
+                raise ValueError('The cursor position does not match the keyset.')
+            if model is not None:
+                position = self.get_position_values(model, position)
+        except (TypeError, ValueError, KeyError, UnicodeError, ValidationError) as err:
+            raise NotFound(self.invalid_cursor_message) from err
+        return KeysetCursor(position=position, reverse=reverse)
+
+    def encode_cursor(self, cursor: KeysetCursor) -> str:
+        tokens = {'p': cursor.position}
+        if cursor.reverse:
+            tokens['r'] = 1
+        # `str` keeps the full precision of datetimes, which Django parses back
+        payload = json.dumps(tokens, default=str, separators=(',', ':'))
+        encoded = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        response_data = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response_data = {'count': self.count, **response_data}
+        return Response(response_data)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'] = {
+            'count': {'type': 'integer', 'example': 123},
+            **response_schema['properties'],
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': str(self.count_query_description),
+                'schema': {'type': 'boolean'},
+            }
+        ]
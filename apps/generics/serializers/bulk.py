@@ -0,0 +1,43 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from apps.generics.choices import BulkResultStatusChoices
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer that validates each row on its own and keeps the errors of the
+    invalid rows instead of failing the whole list, so bulk actions can report a
+    result per row and accept partial success.
+    The validated data is aligned with the input: invalid rows are None and their
+    errors are kept in `row_errors` by row index.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.row_errors = {}
+        self._row_index = 0
+
+    def to_internal_value(self, data):
+        self.row_errors = {}
+        self._row_index = 0
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        index = self._row_index
+        self._row_index += 1
+        try:
+            return super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            self.row_errors[index] = exc.detail
+            return None
+
+
+class BulkResultSerializer(serializers.Serializer):
+    """Result of a row of a bulk action."""
+
+    index = serializers.IntegerField(help_text=_('Index of the row in the request.'))
+    status = serializers.ChoiceField(choices=BulkResultStatusChoices.choices)
+    errors = serializers.DictField(
+        allow_null=True, help_text=_('Validation errors of the row, if invalid.')
+    )
@@ -1,5 +1,15 @@
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+
 from apps.generics.fields.fields import FieldMixin
 from apps.generics.fields.relations import PrimaryKeyRelatedField
+from apps.generics.utils.serializers import (
+    get_query_field_paths,
+    prefers_minimal_return,
+)
+
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
 
 
 class ModelSerializerMixin(FieldMixin):
@@ -11,6 +21,7 @@ class ModelSerializerMixin(FieldMixin):
     _default_read_only_fields = [
         'id',
         'is_active',
+        'deactivated_at',
         'created_at',
         'updated_at',
         'created_by',
@@ -30,3 +41,60 @@ class ModelSerializerMixin(FieldMixin):
 
         data.update(super().validated_data)
         return data
+
+    def get_field_path(self) -> list[str]:
+        """Get the names of the fields leading from the root serializer to this one."""
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.insert(0, node.field_name)
+            node = node.parent
+        return path
+
+    def get_query_field_paths(self, param: str) -> dict[str, dict] | None:
+        """
+        Get the tree of the field paths a read requested for this serializer with a
+        query parameter, None if it did not narrow them.
+        """
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        tree = get_query_field_paths(request, param)
+        for name in self.get_field_path():
+            if not tree:
+                break
+            tree = tree.get(name)
+        return tree or None
+
+    def get_fields(self):
+        """
+        Get the fields, with the `Meta.expandable_fields` requested by `expand`
+        nested instead of their primary key, and only those requested by `fields`,
+        e.g. `?fields=id,user.email&expand=team`.
+        """
+        fields = super().get_fields()
+        expanded = self.get_query_field_paths(EXPAND_QUERY_PARAM) or {}
+        expandable_fields = getattr(self.Meta, 'expandable_fields', {})
+        for name, serializer_path in expandable_fields.items():
+            if name in expanded and name in fields:
+                fields[name] = import_string(serializer_path)(read_only=True)
+        if (requested := self.get_query_field_paths(FIELDS_QUERY_PARAM)) is not None:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+        return fields
+
+    def is_minimal_representation(self) -> bool:
+        """Check whether a write asked for a minimal response, with the id only."""
+        request = self.context.get('request')
+        return (
+            self.parent is None
+            and request is not None
+            and request.method not in SAFE_METHODS
+            and prefers_minimal_return(request)
+        )
+
+    def to_representation(self, instance):
+        if self.is_minimal_representation():
+            return {'id': instance.pk}
+        return super().to_representation(instance)
@@ -0,0 +1,160 @@
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+
+from apps.generics.serializers.mixins import ModelSerializerMixin
+
+# Fields whose representation of a value loaded from the database is the value
+IDENTITY_FIELDS = (
+    drf_fields.IntegerField,
+    drf_fields.CharField,
+    drf_fields.BooleanField,
+    relations.PrimaryKeyRelatedField,
+)
+
+# Representations of a row the compiled serializer reproduces
+COMPILABLE_REPRESENTATIONS = (
+    serializers.Serializer.to_representation,
+    ModelSerializerMixin.to_representation,
+)
+
+
+class NotCompilable(Exception):
+    """The serializer reads something a `values()` row does not hold."""
+
+
+class ValuesColumn(NamedTuple):
+    """A column of the rows, as looked up by `values()` and read on instances."""
+
+    lookup: str
+    attrs: tuple[str, ...]
+
+
+class ValuesSerializer:
+    """
+    Read only serializer compiled from a model serializer. It serializes the rows of
+    `values()` to the same data as the model serializer, without building model
+    instances or resolving the attribute of every field of every row.
+    """
+
+    def __init__(
+        self, columns: list[ValuesColumn], build: Callable[[dict], dict]
+    ) -> None:
+        """
+        Initializes a ValuesSerializer instance.
+        :param columns: Columns read by `build`.
+        :param build: Function building the data of a row.
+        """
+        self.columns = columns
+        self.build = build
+
+    @property
+    def lookups(self) -> list[str]:
+        """Get the lookups to pass to `values()`."""
+        return [column.lookup for column in self.columns]
+
+    @classmethod
+    def compile(cls, serializer: serializers.BaseSerializer) -> 'ValuesSerializer':
+        """
+        Compile a model serializer, with its fields as requested.
+        :raise NotCompilable: When a field reads more than a column, e.g. a method
+                              field, a property or many related rows.
+        """
+        columns = {}
+        build = _compile(serializer, (), columns)
+        return cls(list(columns.values()), build)
+
+    def serialize(self, rows: Iterable[dict]) -> list[dict]:
+        """Serialize rows of `values()` with the lookups of the serializer."""
+        build = self.build
+        return [build(row) for row in rows]
+
+    def serialize_instance(self, instance: models.Model) -> dict:
+        """Serialize an instance, e.g. one checked by the object permissions."""
+        row = {}
+        for column in self.columns:
+            value = instance
+            for attr in column.attrs:
+                if (value := getattr(value, attr)) is None:
+                    break
+            row[column.lookup] = value
+        return self.build(row)
+
+
+def _get_transform(field: drf_fields.Field) -> Callable[[Any], Any] | None:
+    """Get the representation of the non null values of a field, None if as is."""
+    for identity_field in IDENTITY_FIELDS:
+        if (
+            isinstance(field, identity_field)
+            and type(field).to_representation is identity_field.to_representation
+            and getattr(field, 'pk_field', None) is None
+        ):
+            return None
+    return field.to_representation
+
+
+def _compile(
+    serializer: serializers.BaseSerializer,
+    path: tuple[str, ...],
+    columns: dict[str, ValuesColumn],
+) -> Callable[[dict], dict]:
+    """
+    Compile a serializer nested at a path of relations, adding the columns it reads.
+    :return: Function building the data of the serializer from a row.
+    """
+    if type(serializer).to_representation not in COMPILABLE_REPRESENTATIONS:
+        raise NotCompilable(f'{type(serializer).__name__} has its own representation')
+    if not (model := getattr(getattr(serializer, 'Meta', None), 'model', None)):
+        raise NotCompilable(f'{type(serializer).__name__} is not a model serializer')
+
+    def add_column(*attrs: str) -> str:
+        lookup = '__'.join((*path, *attrs))
+        columns.setdefault(lookup, ValuesColumn(lookup, (*path, *attrs)))
+        return lookup
+
+    steps = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            raise NotCompilable(f'{name} reads {field.source!r}')
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise NotCompilable(f'{name} is not a model field') from None
+        if not model_field.concrete or isinstance(model_field, models.FileField):
+            raise NotCompilable(f'{name} is not a column of the row')
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer):
+                raise NotCompilable(f'{name} serializes many rows')
+            nested_pk = field.Meta.model._meta.pk.attname
+            pk_lookup = '__'.join((*path, field.source, nested_pk))
+            nested = _compile(field, (*path, field.source), columns)
+            add_column(field.source, nested_pk)
+            steps.append((name, pk_lookup, nested, True))
+        elif model_field.is_relation:
+            if not isinstance(field, relations.PrimaryKeyRelatedField):
+                raise NotCompilable(f'{name} reads the related row')
+            lookup = add_column(model_field.attname)
+            steps.append((name, lookup, _get_transform(field), False))
+        else:
+            lookup = add_column(model_field.attname)
+            steps.append((name, lookup, _get_transform(field), False))
+
+    def build(row: dict) -> dict:
+        data = {}
+        for name, lookup, transform, nested in steps:
+            value = row[lookup]
+            if value is None:
+                data[name] = None
+            elif nested:
+                data[name] = transform(row)
+            else:
+                data[name] = value if transform is None else transform(value)
+        return data
+
+    return build
@@ -0,0 +1,117 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.accounts.models.organization import Organization
+from apps.generics.benchmarks.runner import BenchmarkResult, compare, percentile
+
+
+class BenchmarkCompareTestCase(SimpleTestCase):
+    def test_percentile(self):
+        """Test the nearest-rank percentiles."""
+        values = [float(value) for value in range(100, 0, -1)]
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([3.0], 95), 3)
+
+    def test_compare(self):
+        """Test timings regress past the threshold, round trips on any increase."""
+        baseline = {
+            'results': {
+                'members.list': {
+                    'p50': 0.01,
+                    'p95': 0.02,
+                    'queries': 4,
+                    'cache_calls': 1,
+                    'allocations': 1000,
+                },
+                # Recorded before the cache calls were counted
+                'teams.list': {
+                    'p50': 1,
+                    'p95': 1,
+                    'queries': 100,
+                    'allocations': 10**6,
+                },
+            }
+        }
+        results = [
+            BenchmarkResult('members.list', 0.012, 0.03, 5, 2, 1100),
+            BenchmarkResult('teams.list', 1, 1, 100, 3, 10**6),
+            BenchmarkResult('teams.choices', 1, 1, 100, 3, 10**6),
+        ]
+        regressions = compare(results, baseline, threshold=0.25)
+        self.assertEqual(
+            [(regression.name, regression.metric) for regression in regressions],
+            [
+                ('members.list', 'p95'),
+                ('members.list', 'queries'),
+                ('members.list', 'cache_calls'),
+            ],
+        )
+
+
+class BenchmarkCommandTestCase(TestCase):
+    options = {'members': 10, 'teams': 2, 'team_members': 15, 'iterations': 2}
+
+    def test_benchmark_command(self):
+        """Test every routed action runs and the baseline catches regressions."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'baseline.json'
+            call_command(
+                'benchmark', save=True, baseline=path, stdout=StringIO(), **self.options
+            )
+            baseline = json.loads(path.read_text())
+            self.assertEqual(
+                baseline['tenant'], {'members': 10, 'teams': 2, 'team_members': 15}
+            )
+            self.assertIn('members.create_with_invite', baseline['results'])
+            self.assertIn('auth.token_refresh', baseline['results'])
+            self.assertIn('team_members.list.values.1000', baseline['results'])
+            self.assertFalse(Organization.objects.exists())
+
+            call_command(
+                'benchmark',
+                baseline=path,
+                threshold=100,
+                only=['members.list'],
+                stdout=StringIO(),
+                **self.options,
+            )
+
+            baseline['results']['members.list']['queries'] = 0
+            path.write_text(json.dumps(baseline))
+            with self.assertRaisesMessage(CommandError, 'members.list queries'):
+                call_command(
+                    'benchmark',
+                    baseline=path,
+                    threshold=100,
+                    only=['members.list'],
+                    stdout=StringIO(),
+                    **self.options,
+                )
+
+    def test_benchmark_requires_baseline(self):
+        """Test a missing baseline fails the comparison when it is required."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'baseline.json'
+            with self.assertRaisesMessage(CommandError, f'No baseline at {path}'):
+                call_command(
+                    'benchmark',
+                    baseline=path,
+                    require_baseline=True,
+                    stdout=StringIO(),
+                    **self.options,
+                )
+            self.assertFalse(Organization.objects.exists())
+
+
+@pytest.mark.benchmark
+class BenchmarkTestCase(TestCase):
+    def test_benchmark(self):
+        """Test no routed action regressed past the baseline of BENCHMARK_BASELINE."""
+        call_command('benchmark', require_baseline=True)
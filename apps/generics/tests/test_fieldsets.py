@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status as http_status
+from rest_framework.test import APITestCase
+
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.teams.factories.team_members import TeamMemberFactory
+from apps.teams.factories.teams import TeamFactory
+
+
+class FieldsetsAPITestCase(APITestCaseMixin, APITestCase):
+    def setUp(self):
+        self.organization = self.new_account()
+
+    def get_list_query(self, url: str, table: str) -> tuple[list, str]:
+        """Get the results of a list and the SELECT of its page, the last one."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        *_, query = (
+            query['sql']
+            for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']
+            and 'COUNT(' not in query['sql']
+        )
+        return response.data.get('results'), query
+
+    def test_sparse_fields(self):
+        """Test `fields` narrows the fields, nested ones included, and the joins."""
+        MemberFactory.create_batch(size=2, organization=self.organization)
+        url = reverse('accounts:members-list')
+
+        results, query = self.get_list_query(f'{url}?fields=id,role', 'accounts_member')
+        self.assertEqual(len(results), 3)
+        self.assertEqual({tuple(result) for result in results}, {('id', 'role')})
+        self.assertNotIn('"accounts_user"', query)
+
+        results, query = self.get_list_query(
+            f'{url}?fields=id,user.email', 'accounts_member'
+        )
+        self.assertEqual(list(results[0]), ['id', 'user'])
+        self.assertEqual(list(results[0]['user']), ['email'])
+        self.assertIn('"accounts_user"', query)
+
+    def test_expand(self):
+        """Test `expand` nests the expandable relations, in the same query."""
+        TeamMemberFactory.create_batch(size=3, organization=self.organization)
+        url = reverse('teams:team_members-list')
+
+        results, _query = self.get_list_query(url, 'teams_teammember')
+        self.assertIsInstance(results[0]['member'], int)
+
+        with self.client.record_queries() as queries:
+            self.client.get(url)
+        results, query = self.get_list_query(
+            f'{url}?expand=team,member', 'teams_teammember'
+        )
+        self.assertEqual(results[0]['team']['organization'], self.organization.id)
+        self.assertIn('email', results[0]['member']['user'])
+        self.assertIn('"accounts_user"', query)
+        with self.client.record_queries(max_queries=len(queries)):
+            self.client.get(f'{url}?expand=team,member')
+
+    def test_prefer_return_minimal(self):
+        """Test writes sent with `Prefer: return=minimal` only return the id."""
+        response = self.client.post(
+            reverse('teams:teams-list'),
+            data={'name': 'Platform', 'slug': 'platform'},
+            format='json',
+            headers={'Prefer': 'return=minimal'},
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_201_CREATED)
+        self.assertEqual(list(response.data), ['id'])
+        self.assertEqual(response.headers['Preference-Applied'], 'return=minimal')
+
+        team = TeamFactory.create(organization=self.organization)
+        response = self.client.put(
+            reverse('teams:teams-detail', args=[team.id]),
+            data={'name': 'Renamed', 'slug': team.slug},
+            format='json',
+        )
+        self.assertEqual(response.data.get('name'), 'Renamed')
+        self.assertNotIn('Preference-Applied', response.headers)
@@ -0,0 +1,141 @@
+import re
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status as http_status
+from rest_framework.test import APITestCase
+
+from apps.accounts.choices import MemberRoleChoices
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.generics.utils.metrics import Counter, Histogram, MetricsRegistry, registry
+
+
+def get_sample(content: str, name: str, **labels) -> float | None:
+    """Get the value of the sample of a metric with the given labels."""
+    for line in content.splitlines():
+        match = re.fullmatch(rf'{name}\{{(.*)\}} (\S+)', line)
+        if not match:
+            continue
+        sample_labels = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1)))
+        if all(sample_labels.get(key) == str(value) for key, value in labels.items()):
+            return float(match.group(2))
+    return None
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsAPITestCase(APITestCaseMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.metrics_url = reverse('metrics')
+        cls.metrics_headers = {'Authorization': 'Bearer secret'}
+        cls.members_url = reverse('accounts:members-list')
+
+    def setUp(self):
+        self.organization = self.new_account()
+        registry.clear()
+
+    def test_request_metrics(self):
+        """Test the latency, query and size histograms of a routed action."""
+        MemberFactory.create_batch(size=3, organization=self.organization)
+        self.client.get(self.members_url)
+        self.client.get(self.members_url)
+
+        response = self.client.get(self.metrics_url, headers=self.metrics_headers)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        content = response.content.decode()
+        labels = {'route': 'accounts:members-list', 'action': 'list', 'method': 'GET'}
+        self.assertEqual(
+            get_sample(
+                content, 'crewforge_http_request_duration_seconds_count', **labels
+            ),
+            2,
+        )
+        self.assertEqual(
+            get_sample(
+                content, 'crewforge_http_request_duration_seconds_bucket', le='+Inf'
+            ),
+            2,
+        )
+        self.assertGreater(
+            get_sample(content, 'crewforge_http_request_queries_sum', **labels), 0
+        )
+        self.assertGreater(
+            get_sample(content, 'crewforge_http_response_size_bytes_sum', **labels), 0
+        )
+        self.assertIsNone(
+            get_sample(content, 'crewforge_http_request_queries_count', route='metrics')
+        )
+
+    def test_permission_denial_metrics(self):
+        """Test the permission denial and error response counters."""
+        member = MemberFactory.create(
+            organization=self.organization, role=MemberRoleChoices.MEMBER
+        )
+        self.client.force_authenticate(member=member)
+        self.client.get(reverse('accounts:invitations-list'))
+        self.client.force_authenticate(user=None)
+        self.client.get(self.members_url)
+
+        content = self.client.get(
+            self.metrics_url, headers=self.metrics_headers
+        ).content.decode()
+        self.assertEqual(
+            get_sample(
+                content,
+                'crewforge_http_permission_denials_total',
+                route='accounts:invitations-list',
+                status=403,
+            ),
+            1,
+        )
+        self.assertEqual(
+            get_sample(
+                content,
+                'crewforge_http_error_responses_total',
+                route='accounts:members-list',
+                status=401,
+            ),
+            1,
+        )
+
+    def test_metrics_token(self):
+        """Test the metrics require the bearer token when it is set."""
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+        response = self.client.get(self.metrics_url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_metrics_without_token(self):
+        """Test the metrics without a token are only exposed with DEBUG on."""
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+        with self.settings(DEBUG=True):
+            response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+
+class MetricsRegistryTestCase(SimpleTestCase):
+    def test_merge_processes(self):
+        """Test the metrics of every process of the directory are summed."""
+        with tempfile.TemporaryDirectory() as directory:
+            for process_id, amount in [('1', 2), ('2', 3)]:
+                worker = MetricsRegistry(directory=directory, process_id=process_id)
+                counter = Counter(worker, 'jobs_total', 'Jobs.', ['queue'])
+                histogram = Histogram(
+                    worker, 'job_seconds', 'Job time.', ['queue'], buckets=[1, 5]
+                )
+                for _ in range(amount):
+                    counter.inc(queue='mail')
+                    histogram.observe(amount, queue='mail')
+                worker.flush(force=True)
+
+            content = worker.render()
+        self.assertIn('jobs_total{queue="mail"} 5', content)
+        self.assertIn('job_seconds_bucket{queue="mail",le="1"} 0', content)
+        self.assertIn('job_seconds_bucket{queue="mail",le="5"} 5', content)
+        self.assertIn('job_seconds_sum{queue="mail"} 13', content)
+        self.assertIn('job_seconds_count{queue="mail"} 5', content)
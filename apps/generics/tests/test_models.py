@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.factories.invitations import InvitationFactory
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.factories.organizations import OrganizationFactory
+from apps.accounts.models.invitation import Invitation
+from apps.accounts.models.member import Member
+from apps.accounts.models.organization import Organization
+
+
+class ChangedFieldsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = OrganizationFactory.create()
+        cls.member = MemberFactory.create(organization=cls.organization)
+
+    def get_updates(self, table: str, callback) -> list[str]:
+        """Run the callback and get the UPDATE statements of a table it ran."""
+        with CaptureQueriesContext(connection) as queries:
+            callback()
+        return [
+            query['sql']
+            for query in queries.captured_queries
+            if query['sql'].startswith(f'UPDATE "{table}"')
+        ]
+
+    def test_save_writes_changed_fields(self):
+        """Test a save only writes the changed fields and the audit columns."""
+        member = Member.objects.get(id=self.member.id)
+        member.nickname = 'Nick'
+        (update,) = self.get_updates('accounts_member', member.save)
+        self.assertIn('"nickname"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertIn('"updated_by_id"', update)
+        self.assertNotIn('"role"', update)
+        self.assertNotIn('"is_active"', update)
+        member.refresh_from_db()
+        self.assertEqual(member.nickname, 'Nick')
+
+    def test_save_without_changes_skips_write(self):
+        """Test a save of an unchanged row, refreshed or not, runs no statement."""
+        member = Member.objects.get(id=self.member.id)
+        with self.assertNumQueries(0):
+            member.save()
+        member.nickname = 'Nick'
+        member.save()
+        with self.assertNumQueries(0):
+            member.save()
+
+        Member.objects.filter(id=member.id).update(nickname='Other')
+        member.refresh_from_db(fields=['nickname'])
+        with self.assertNumQueries(0):
+            member.save()
+
+    def test_inactivate_and_accept_write_changed_fields(self):
+        """Test deactivations and acceptances write the fields they change."""
+        member = Member.objects.get(id=self.member.id)
+        (update,) = self.get_updates('accounts_member', member.inactivate)
+        self.assertIn('"is_active"', update)
+        self.assertNotIn('"nickname"', update)
+
+        invitation = Invitation.objects.get(
+            id=InvitationFactory.create(organization=self.organization).id
+        )
+        (update,) = self.get_updates(
+            'accounts_invitation',
+            lambda: invitation.accept(member=self.member, check=False),
+        )
+        self.assertIn('"is_accepted"', update)
+        self.assertIn('"member_id"', update)
+        self.assertNotIn('"email"', update)
+
+    def test_track_changes_opt_out(self):
+        """Test a model opting out writes every field but the counters."""
+        organization = Organization.objects.get(id=self.organization.id)
+        with mock.patch.object(Organization, 'track_changes', False):
+            (update,) = self.get_updates('accounts_organization', organization.save)
+        self.assertIn('"name"', update)
+        self.assertIn('"slug"', update)
+        self.assertNotIn('"members_count"', update)
+
+        member = Member.objects.get(id=self.member.id)
+        with mock.patch.object(Member, 'track_changes', False):
+            (update,) = self.get_updates('accounts_member', member.save)
+        self.assertIn('"role"', update)
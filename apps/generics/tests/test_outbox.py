@@ -0,0 +1,89 @@
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.generics.choices import EmailOutboxStatusChoices
+from apps.generics.mails.outbox import deliver_due, queue_message
+from apps.generics.models.outbox import EmailOutbox
+
+
+@override_settings(EMAIL_OUTBOX_RETRY_DELAY=60, EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class EmailOutboxTestCase(TestCase):
+    @staticmethod
+    def _queue(count: int = 1) -> list[EmailOutbox]:
+        entries = []
+        for index in range(count):
+            message = EmailMultiAlternatives(
+                subject=f'Subject {index}',
+                body='Body',
+                from_email='noreply@example.com',
+                to=[f'user{index}@example.com'],
+            )
+            message.attach_alternative('<p>Body</p>', 'text/html')
+            message.attach('report.txt', b'report', 'text/plain')
+            entries.append(queue_message(message))
+        return entries
+
+    @staticmethod
+    def _make_due():
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+
+    def test_deliver_in_batches_over_one_connection(self):
+        """Test the outbox is drained batch by batch over a single connection."""
+        self._queue(5)
+
+        with mock.patch.object(EmailBackend, 'open', autospec=True) as open_mock:
+            call_command('deliver_emails', batch_size=2, stdout=StringIO())
+        self.assertEqual(open_mock.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].attachments[0].content, 'report')
+        self.assertFalse(
+            EmailOutbox.objects.exclude(status=EmailOutboxStatusChoices.SENT).exists()
+        )
+
+    def test_retry_with_backoff_then_dead_letter(self):
+        """Test failed emails are retried with backoff and marked failed at last."""
+        entry = self._queue()[0]
+
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=SMTPException('down')
+        ):
+            delays = []
+            for _ in range(3):
+                self._make_due()
+                started_at = timezone.now()
+                result = deliver_due()
+                entry.refresh_from_db()
+                delays.append((entry.next_attempt_at - started_at).total_seconds())
+        self.assertEqual(result.failed, 1)
+        self.assertEqual(entry.attempts, 3)
+        self.assertEqual(entry.status, EmailOutboxStatusChoices.FAILED)
+        self.assertIn('down', entry.last_error)
+        self.assertAlmostEqual(delays[0], 60, delta=5)
+        self.assertAlmostEqual(delays[1], 120, delta=5)
+
+        self._make_due()
+        self.assertEqual(deliver_due().total, 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_retried_email_is_delivered(self):
+        """Test an email that failed once is delivered on its next attempt."""
+        entry = self._queue()[0]
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=SMTPException('down')
+        ):
+            self.assertEqual(deliver_due().retried, 1)
+        self.assertEqual(deliver_due().total, 0)
+
+        self._make_due()
+        self.assertEqual(deliver_due().sent, 1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, EmailOutboxStatusChoices.SENT)
+        self.assertEqual(len(mail.outbox), 1)
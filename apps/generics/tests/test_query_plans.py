@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.serializers.member import MemberModelSerializer
+from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.generics.utils import serializers as serializer_utils
+from apps.generics.utils.cache import query_plan_cache
+from apps.teams.factories.team_members import TeamMemberFactory
+
+
+class QueryPlansAPITestCase(APITestCaseMixin, APITestCase):
+    def setUp(self):
+        query_plan_cache.clear()
+        self.organization = self.new_account()
+
+    def test_member_query_plan(self):
+        """Test the plan of a member joins its user and skips write only columns."""
+        plan = serializer_utils.get_query_plan(MemberModelSerializer())
+        self.assertEqual(plan.select_related, ('user',))
+        self.assertEqual(plan.prefetch_related, ())
+        self.assertIn('role', plan.only)
+        self.assertIn('user__email', plan.only)
+        self.assertNotIn('user__password', plan.only)
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        """Test the lists run as many queries for a few rows as for many."""
+        for url in [
+            reverse('accounts:members-list'),
+            f'{reverse("teams:team_members-list")}?expand=team,member',
+        ]:
+            TeamMemberFactory.create_batch(size=2, organization=self.organization)
+            with self.client.record_queries() as queries:
+                self.client.get(url)
+            TeamMemberFactory.create_batch(size=8, organization=self.organization)
+            with self.client.record_queries(max_queries=len(queries), label=url):
+                self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('accounts:members-list'))
+        *_, query = (
+            query['sql']
+            for query in queries.captured_queries
+            if 'FROM "accounts_member"' in query['sql']
+        )
+        self.assertIn('"accounts_user"."email"', query)
+        self.assertNotIn('"accounts_user"."password"', query)
+
+    def test_query_plan_cached(self):
+        """Test the plan is computed once per viewset, action and fields."""
+        MemberFactory.create_batch(size=2, organization=self.organization)
+        url = reverse('accounts:members-list')
+        with mock.patch(
+            'apps.generics.views.mixins.get_query_plan',
+            wraps=serializer_utils.get_query_plan,
+        ) as get_query_plan:
+            for _ in range(2):
+                self.client.get(url)
+            self.assertEqual(get_query_plan.call_count, 1)
+            self.client.get(f'{url}?fields=id')
+            self.assertEqual(get_query_plan.call_count, 2)
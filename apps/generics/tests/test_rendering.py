@@ -0,0 +1,126 @@
+import time
+from unittest import mock
+
+import pytest
+from django.template import Context, Engine
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, override_settings
+from django.utils.html import strip_tags
+from django.utils.translation import override
+
+from apps.accounts.emails import PasswordResetRequestEmail
+from apps.generics.mails import rendering
+from apps.generics.mails.rendering import email_render_cache, render_email
+
+
+def _render(email):
+    return render_email(
+        template_name=email.get_template_name(),
+        context=email.get_context_data(),
+        recipient_fields=email.recipient_fields,
+    )
+
+
+def _render_uncached(email):
+    html = render_to_string(
+        template_name=email.get_template_name(), context=email.get_context_data()
+    )
+    return html, strip_tags(html)
+
+
+class EmailRenderingTestCase(SimpleTestCase):
+    def setUp(self):
+        email_render_cache.clear()
+
+    @staticmethod
+    def _email(index: int = 0, **kwargs) -> PasswordResetRequestEmail:
+        return PasswordResetRequestEmail(
+            reset_url=f'https://example.com/reset?uid={index}&token=<{index}>',
+            recipient_list=[f'user{index}@example.com'],
+            **kwargs,
+        )
+
+    def test_cached_rendering_matches_template(self):
+        """Test the cached rendering equals a full render of the template."""
+        for index in range(3):
+            email = self._email(
+                index, unsubscribe_url=f'https://example.com/u?id={index}&a="b"'
+            )
+            self.assertEqual(tuple(_render(email)), _render_uncached(email))
+        email = self._email(3)
+        self.assertEqual(tuple(_render(email)), _render_uncached(email))
+
+    def test_template_rendered_once_per_variant(self):
+        """Test the template is only rendered again when an invariant changes."""
+        with mock.patch.object(
+            rendering, 'render_to_string', wraps=render_to_string
+        ) as render:
+            # The first recipient renders the variant in full, with the slots and
+            # without the slots it does not print, i.e. the recipient list
+            for index in range(5):
+                _render(self._email(index))
+            self.assertEqual(render.call_count, 3)
+
+            _render(self._email(theme_color='#ff0000'))
+            with override('pt-br'):
+                _render(self._email())
+            self.assertEqual(render.call_count, 9)
+
+    def test_transformed_slot_falls_back_to_full_render(self):
+        """Test a template that transforms a recipient field is not cached."""
+        email = self._email(recipient_fields=('cta.url', 'title'))
+        email.title = 'Reset'
+        with mock.patch.object(
+            rendering,
+            'render_to_string',
+            side_effect=lambda **kwargs: render_to_string(**kwargs).upper(),
+        ):
+            html, text = _render(email)
+            self.assertIn('HTTPS://EXAMPLE.COM/RESET', html)
+            self.assertIn('RESET', text)
+
+    def test_slot_read_without_printing_falls_back_to_full_render(self):
+        """Test a template that only compares a recipient field is not cached."""
+        template = Engine.get_default().from_string(
+            '{% if title|length > 5 %}Long{% endif %} {{ cta.url }}'
+        )
+        with mock.patch.object(
+            rendering,
+            'render_to_string',
+            side_effect=lambda template_name, context: template.render(
+                Context(context)
+            ),
+        ) as render:
+            for title, expected in [('Reset', ''), ('Password reset', 'Long')] * 2:
+                email = self._email(recipient_fields=('cta.url', 'title'))
+                email.title = title
+                html, text = _render(email)
+                self.assertEqual(html.split(' ')[0], expected)
+            # Only the first render compiles the variant, which is not cached
+            self.assertEqual(render.call_count, 6)
+
+    @override_settings(EMAIL_RENDER_CACHE_ENABLED=False)
+    def test_disabled_cache(self):
+        """Test every send renders the template when the cache is disabled."""
+        with mock.patch.object(
+            rendering, 'render_to_string', wraps=render_to_string
+        ) as render:
+            for index in range(3):
+                _render(self._email(index))
+            self.assertEqual(render.call_count, 3)
+
+    @pytest.mark.benchmark
+    def test_benchmark_10k_renders(self):
+        """Test 10k cached renders are much faster than full renders."""
+        renders, samples = 10_000, 200
+        start = time.perf_counter()
+        for index in range(renders):
+            _render(self._email(index))
+        cached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index in range(samples):
+            _render_uncached(self._email(index))
+        uncached = (time.perf_counter() - start) * renders / samples
+
+        self.assertLess(cached * 3, uncached)
@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+
+from apps.accounts.factories.members import MemberFactory
+from apps.accounts.models.member import Member
+from apps.accounts.serializers.member import MemberModelSerializer
+from apps.accounts.tests.mixins import APITestCaseMixin, SharedCacheTestCaseMixin
+from apps.accounts.views.members import MemberViewSet
+from apps.generics.serializers.values import NotCompilable, ValuesSerializer
+from apps.generics.utils.cache import query_plan_cache
+from apps.teams.factories.team_members import TeamMemberFactory
+from apps.teams.views.team_members import TeamMemberViewSet
+
+
+class FastReadAPITestCase(SharedCacheTestCaseMixin, APITestCaseMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        query_plan_cache.clear()
+        self.organization = self.new_account()
+
+    def assertSameContent(self, viewset, url: str):
+        """Assert the fast read path responds the same bytes as the serializer."""
+        fast_response = self.client.get(url)
+        with mock.patch.object(viewset, 'fast_read', False):
+            response = self.client.get(url)
+        self.assertEqual(fast_response.status_code, response.status_code, url)
+        self.assertEqual(fast_response.content, response.content, url)
+
+    def test_same_content(self):
+        """Test lists and retrieves respond the same bytes on both read paths."""
+        team_members = TeamMemberFactory.create_batch(
+            size=3, organization=self.organization
+        )
+        MemberFactory.create(organization=self.organization, nickname=None)
+        members_url = reverse('accounts:members-list')
+        team_members_url = reverse('teams:team_members-list')
+        for viewset, url in [
+            (MemberViewSet, members_url),
+            (MemberViewSet, f'{members_url}?cursor='),
+            (MemberViewSet, f'{members_url}?fields=id,user.email'),
+            (
+                MemberViewSet,
+                reverse('accounts:members-detail', args=[team_members[0].member_id]),
+            ),
+            (TeamMemberViewSet, team_members_url),
+            (TeamMemberViewSet, f'{team_members_url}?expand=team,member'),
+            (
+                TeamMemberViewSet,
+                reverse('teams:team_members-detail', args=[team_members[0].id]),
+            ),
+        ]:
+            self.assertSameContent(viewset, url)
+
+    def test_list_reads_values(self):
+        """Test the fast read path builds no instance and fewer queries at most."""
+        MemberFactory.create_batch(size=5, organization=self.organization)
+        url = reverse('accounts:members-list')
+        with mock.patch.object(MemberViewSet, 'fast_read', False):
+            with self.client.record_queries() as queries:
+                self.client.get(url)
+        with mock.patch.object(Member, 'from_db', wraps=Member.from_db) as from_db:
+            with self.client.record_queries(max_queries=len(queries)):
+                response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertFalse(from_db.called)
+
+    def test_compiled_once(self):
+        """Test the serializer is compiled once per viewset, action and fields."""
+        MemberFactory.create_batch(size=2, organization=self.organization)
+        url = reverse('accounts:members-list')
+        with mock.patch.object(
+            ValuesSerializer, 'compile', wraps=ValuesSerializer.compile
+        ) as compile_serializer:
+            responses = [self.client.get(url) for _ in range(2)]
+            self.assertEqual(compile_serializer.call_count, 1)
+            self.client.get(f'{url}?fields=id')
+            self.assertEqual(compile_serializer.call_count, 2)
+        self.assertEqual(responses[0].content, responses[1].content)
+
+    def test_not_compilable(self):
+        """Test serializers reading more than columns fall back to the serializer."""
+
+        class MethodSerializer(MemberModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            def get_label(self, instance):
+                return str(instance)
+
+        with self.assertRaises(NotCompilable):
+            ValuesSerializer.compile(MethodSerializer())
+        with mock.patch.object(
+            MemberViewSet, 'get_serializer_class', return_value=MethodSerializer
+        ):
+            response = self.client.get(reverse('accounts:members-list'))
+            # Not compiled again once known to fall back
+            with mock.patch.object(ValuesSerializer, 'compile') as compile_serializer:
+                self.client.get(reverse('accounts:members-list'))
+            self.assertFalse(compile_serializer.called)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIn('label', response.data['results'][0])
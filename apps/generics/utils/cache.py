@@ -0,0 +1,299 @@
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from contextlib import ExitStack
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import models, transaction
+
+MISSING = object()
+
+# Django cache backends the versioned caches bypass: those living in the memory
+# of a single process, or nowhere, do not share an invalidation with the other
+# workers, and the database cache costs a query for each query it saves
+UNSUITABLE_CACHE_BACKENDS = (LocMemCache, DummyCache, DatabaseCache)
+
+# Operations of the Django caches that make a round trip to the cache server
+CACHE_OPERATIONS = (
+    'add',
+    'get',
+    'get_many',
+    'set',
+    'set_many',
+    'touch',
+    'delete',
+    'delete_many',
+    'has_key',
+    'incr',
+    'decr',
+    'clear',
+)
+
+
+class LocalCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a timeout.
+    Values are stored pickled by default, so callers never share mutable instances.
+    """
+
+    def __init__(
+        self, *, timeout: float = 5, maxsize: int = 1024, pickled: bool = True
+    ):
+        """
+        Initializes a LocalCache instance.
+        :param timeout: Seconds an entry is kept before it expires.
+        :param maxsize: Maximum number of entries kept; the least recently used
+                        entry is discarded first.
+        :param pickled: Whether values are stored pickled. Values stored as is are
+                        shared by the callers, so they must never be mutated.
+        """
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.pickled = pickled
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return pickle.loads(payload) if self.pickled else payload
+
+    def set(self, key: Hashable, value: Any):
+        if self.timeout <= 0 or self.maxsize <= 0:
+            return
+        payload = pickle.dumps(value) if self.pickled else value
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]):
+        """Delete every entry whose key matches the predicate."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class VersionedTwoTierCache:
+    """
+    Two-tier cache: an in-process LocalCache in front of the Django cache.
+    Shared entries hold the versions of the scopes they depend on, read along with
+    the entry in a single round trip, so bumping a scope version invalidates every
+    entry of that scope in all workers without enumerating keys. The local tier is
+    invalidated immediately in the current process and within its timeout in the
+    others. Over a process-local Django cache, e.g. LocMemCache, the workers would
+    keep serving what another one invalidated, and over the database cache a miss
+    of the local tier would cost as much as computing the value, so nothing is
+    cached and every value is computed.
+    """
+
+    def __init__(
+        self,
+        *,
+        prefix: str,
+        timeout: int = 300,
+        local_timeout: float = 5,
+        local_maxsize: int = 1024,
+        cache=None,
+    ):
+        """
+        Initializes a VersionedTwoTierCache instance.
+        :param prefix: Prefix for the keys stored in the Django cache.
+        :param timeout: Seconds an entry is kept in the Django cache.
+        :param local_timeout: Seconds an entry is kept in the local tier.
+        :param local_maxsize: Maximum number of entries in the local tier.
+        :param cache: Django cache to use, the default cache if not provided.
+                      It must be shared by the workers, e.g. Redis or
+                      Memcached, for anything to be cached.
+        """
+        self.prefix = prefix
+        self.timeout = timeout
+        self.local = LocalCache(timeout=local_timeout, maxsize=local_maxsize)
+        self._cache = cache
+
+    @property
+    def cache(self):
+        return self._cache or caches[DEFAULT_CACHE_ALIAS]
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check whether the Django cache is shared and cheaper than a query."""
+        return not isinstance(self.cache, UNSUITABLE_CACHE_BACKENDS)
+
+    def _version_key(self, scope: str, scope_id: Hashable) -> str:
+        return f'{self.prefix}:version:{scope}:{scope_id}'
+
+    def _entry_key(self, scopes: dict[str, Hashable], key: str = '') -> str:
+        scope_ids = ':'.join(str(scope_id) for scope_id in scopes.values())
+        entry_key = f'{self.prefix}:{scope_ids}'
+        return f'{entry_key}:{key}' if key else entry_key
+
+    def get_or_set(
+        self,
+        scopes: dict[str, Hashable],
+        default: Callable[[], Any],
+        key: str = '',
+    ):
+        """
+        Get the value cached for the scopes, computing and storing it on a miss.
+        :param scopes: Mapping of scope name to scope ID the value depends on.
+        :param default: Callable that computes the value on a miss.
+        :param key: Extra key to tell apart values that depend on the same scopes.
+        """
+        if not self.is_enabled:
+            return default()
+        local_key = (*scopes.items(), key)
+        if (value := self.local.get(local_key)) is not MISSING:
+            return value
+
+        version_keys = [
+            self._version_key(scope, scope_id) for scope, scope_id in scopes.items()
+        ]
+        entry_key = self._entry_key(scopes, key)
+        found = self.cache.get_many([*version_keys, entry_key])
+        if missing := [k for k in version_keys if k not in found]:
+            # Evicted or never bumped, the versions are created once for all
+            for version_key in missing:
+                self.cache.add(version_key, uuid.uuid4().hex, timeout=None)
+            found.update(self.cache.get_many(missing))
+        versions = [found.get(version_key) for version_key in version_keys]
+
+        entry = found.get(entry_key)
+        if entry is not None and entry[0] == versions:
+            value = entry[1]
+        else:
+            value = default()
+            self.cache.set(entry_key, (versions, value), timeout=self.timeout)
+        self.local.set(local_key, value)
+        return value
+
+    def invalidate(self, scope: str, *scope_ids: Hashable):
+        """
+        Invalidate every entry that depends on the given scopes, in one write once
+        the transaction of the caller commits. Bumped before, the versions could be
+        read by another worker that still reads the rows as they were, and caches
+        them under the new versions.
+        """
+        if not self.is_enabled:
+            return
+        transaction.on_commit(partial(self._bump_versions, scope, scope_ids))
+
+    def _bump_versions(self, scope: str, scope_ids: tuple[Hashable, ...]):
+        self.cache.set_many(
+            {
+                self._version_key(scope, scope_id): uuid.uuid4().hex
+                for scope_id in scope_ids
+            },
+            timeout=None,
+        )
+        scopes = {(scope, scope_id) for scope_id in scope_ids}
+        self.local.delete_matching(lambda key: not scopes.isdisjoint(key))
+
+    def clear_local(self):
+        self.local.clear()
+
+
+class CacheCallLog:
+    """
+    Context manager that records the calls to the Django caches of the current
+    thread, one per round trip to the cache server, e.g. to count them along with
+    the queries. A call made within another one, e.g. the `get` of each key of a
+    backend without its own `get_many`, is part of the outer call.
+    """
+
+    def __init__(self, on_call: Callable[[str], None] | None = None):
+        """
+        Initializes a CacheCallLog instance.
+        :param on_call: Function called with the description of each call.
+        """
+        self.on_call = on_call
+        self.calls: list[str] = []
+        self._depth = 0
+        self._stack = ExitStack()
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def __enter__(self) -> 'CacheCallLog':
+        for alias in settings.CACHES:
+            cache = caches[alias]
+            for name in CACHE_OPERATIONS:
+                self._wrap(alias, cache, name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._stack.close()
+
+    def _wrap(self, alias: str, cache, name: str):
+        operation = getattr(cache, name)
+        previous = cache.__dict__.get(name, MISSING)
+
+        def call(*args, **kwargs):
+            if self._depth:
+                return operation(*args, **kwargs)
+            keys = args[0] if args else ''
+            if isinstance(keys, dict):
+                keys = list(keys)
+            description = f'{alias}.{name}({keys!r})'
+            self.calls.append(description)
+            if self.on_call:
+                self.on_call(description)
+            self._depth += 1
+            try:
+                return operation(*args, **kwargs)
+            finally:
+                self._depth -= 1
+
+        setattr(cache, name, call)
+        if previous is MISSING:
+            self._stack.callback(delattr, cache, name)
+        else:
+            self._stack.callback(setattr, cache, name, previous)
+
+
+choices_cache = VersionedTwoTierCache(
+    prefix='choices',
+    timeout=settings.CHOICES_CACHE_TIMEOUT,
+    local_timeout=settings.CHOICES_CACHE_LOCAL_TIMEOUT,
+    local_maxsize=settings.CHOICES_CACHE_LOCAL_MAXSIZE,
+)
+
+
+# Query plans and compiled serializers only depend on the code and the requested
+# fields, so never expire. They are only read once built, and compiled serializers
+# hold functions, so they are stored as is
+query_plan_cache = LocalCache(
+    timeout=float('inf'), maxsize=settings.QUERY_PLAN_CACHE_MAXSIZE, pickled=False
+)
+
+
+def get_choices_scope(model: type[models.Model] | str) -> str:
+    """Get the choices cache scope of a model or model label."""
+    label = model if isinstance(model, str) else model._meta.label
+    return f'choices:{label.lower()}'
+
+
+def invalidate_choices(model: type[models.Model] | str, organization_id: int):
+    """Invalidate the cached choices that list or read a model in an organization."""
+    choices_cache.invalidate(get_choices_scope(model), organization_id)
@@ -0,0 +1,288 @@
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Metric:
+    """Definition of a metric; its values are kept by the registry."""
+
+    type: str
+
+    def __init__(
+        self,
+        registry: 'MetricsRegistry',
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+    ):
+        """
+        Initializes a Metric instance.
+        :param registry: Registry that keeps the values of the metric.
+        :param name: Name of the metric, in Prometheus naming convention.
+        :param documentation: Help text of the metric.
+        :param labelnames: Names of the labels of the metric.
+        """
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def get_key(self, labels: dict) -> str:
+        return json.dumps([str(labels.get(name, '')) for name in self.labelnames])
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        self.registry.update(self, labels, lambda value: (value or 0) + amount)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, *args, buckets: Iterable[float] = LATENCY_BUCKETS, **kwargs):
+        """
+        Initializes a Histogram instance.
+        :param buckets: Upper bounds of the buckets, without +Inf.
+        """
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(*args, **kwargs)
+
+    def observe(self, amount: float, **labels):
+        # Values are stored as the count of each bucket plus +Inf, sum and count
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if amount <= bound),
+            len(self.buckets),
+        )
+
+        def update(value):
+            value = value or [0] * (len(self.buckets) + 3)
+            value[index] += 1
+            value[-2] += amount
+            value[-1] += 1
+            return value
+
+        self.registry.update(self, labels, update)
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics kept in process memory.
+    With a metrics directory, every process also dumps its values to its own file
+    there, and the exposition merges the files of all processes, so the metrics
+    of the gunicorn workers add up without an external service.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str | None = None,
+        flush_interval: float | None = None,
+        process_id: str | None = None,
+    ):
+        """
+        Initializes a MetricsRegistry instance.
+        :param directory: Directory shared by the processes, `METRICS_DIR` if not
+                          provided. Without a directory, only the metrics of the
+                          current process are exposed.
+        :param flush_interval: Minimum seconds between two dumps of the values,
+                               `METRICS_FLUSH_INTERVAL` if not provided.
+        :param process_id: Name of the file of the process, its PID if not provided.
+        """
+        self._directory = directory
+        self._flush_interval = flush_interval
+        self._process_id = process_id
+        self.metrics: dict[str, Metric] = {}
+        self._values: dict[str, dict[str, float | list[float]]] = {}
+        self._lock = threading.Lock()
+        self._flushed_at = 0.0
+
+    @property
+    def directory(self) -> Path | None:
+        directory = self._directory or settings.METRICS_DIR
+        return Path(directory) if directory else None
+
+    @property
+    def flush_interval(self) -> float:
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return settings.METRICS_FLUSH_INTERVAL
+
+    @property
+    def path(self) -> Path | None:
+        if not (directory := self.directory):
+            return None
+        return directory / f'metrics_{self._process_id or os.getpid()}.json'
+
+    def register(self, metric: Metric):
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} is already registered.')
+        self.metrics[metric.name] = metric
+
+    def update(self, metric: Metric, labels: dict, update):
+        key = metric.get_key(labels)
+        with self._lock:
+            values = self._values.setdefault(metric.name, {})
+            values[key] = update(values.get(key))
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+        if (path := self.path) and path.exists():
+            path.unlink()
+
+    def flush(self, force: bool = False):
+        """Dump the values of the process to its file, at most once per interval."""
+        if not (path := self.path):
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < self.flush_interval:
+            return
+        with self._lock:
+            payload = json.dumps(self._values)
+            self._flushed_at = now
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename, so readers never see a partial file
+        with tempfile.NamedTemporaryFile(
+            'w', dir=path.parent, prefix='.tmp_', delete=False
+        ) as file:
+            file.write(payload)
+        os.replace(file.name, path)
+
+    def collect(self) -> dict[str, dict[str, float | list[float]]]:
+        """Get the values of every process, summed by metric and labels."""
+        if not (directory := self.directory):
+            with self._lock:
+                return json.loads(json.dumps(self._values))
+
+        self.flush(force=True)
+        merged = {}
+        for path in sorted(directory.glob('metrics_*.json')):
+            try:
+                values = json.loads(path.read_text())
+            except (OSError, ValueError) as err:
+                logger.warning('Skipping metrics file %s: %s', path, err)
+                continue
+            for name, samples in values.items():
+                merged_samples = merged.setdefault(name, {})
+                for key, value in samples.items():
+                    current = merged_samples.get(key)
+                    if current is None:
+                        merged_samples[key] = value
+                    elif isinstance(value, list):
+                        merged_samples[key] = [
+                            a + b for a, b in zip(current, value, strict=True)
+                        ]
+                    else:
+                        merged_samples[key] = current + value
+        return merged
+
+    @staticmethod
+    def _format_labels(labels: list[tuple[str, str]]) -> str:
+        if not labels:
+            return ''
+        escaped = (
+            (name, value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+            for name, value in labels
+        )
+        return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if math.isinf(value):
+            return '+Inf'
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        values = self.collect()
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for key, value in sorted(values.get(name, {}).items()):
+                labels = list(zip(metric.labelnames, json.loads(key), strict=True))
+                if metric.type == 'counter':
+                    lines.append(
+                        f'{name}{self._format_labels(labels)} '
+                        f'{self._format_value(value)}'
+                    )
+                    continue
+                cumulative = 0
+                for bound, count in zip(
+                    (*metric.buckets, math.inf), value[:-2], strict=True
+                ):
+                    cumulative += count
+                    bucket_labels = [*labels, ('le', self._format_value(bound))]
+                    lines.append(
+                        f'{name}_bucket{self._format_labels(bucket_labels)} '
+                        f'{cumulative}'
+                    )
+                lines.append(
+                    f'{name}_sum{self._format_labels(labels)} '
+                    f'{self._format_value(value[-2])}'
+                )
+                lines.append(f'{name}_count{self._format_labels(labels)} {value[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LABELS = ('route', 'action', 'method')
+
+request_duration = Histogram(
+    registry,
+    'crewforge_http_request_duration_seconds',
+    'Latency of the HTTP requests, in seconds.',
+    REQUEST_LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    registry,
+    'crewforge_http_request_queries',
+    'Number of SQL queries run by the HTTP requests.',
+    REQUEST_LABELS,
+    buckets=QUERY_COUNT_BUCKETS,
+)
+request_query_duration = Histogram(
+    registry,
+    'crewforge_http_request_query_duration_seconds',
+    'Time spent in SQL queries by the HTTP requests, in seconds.',
+    REQUEST_LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+response_size = Histogram(
+    registry,
+    'crewforge_http_response_size_bytes',
+    'Size of the HTTP response bodies, in bytes.',
+    REQUEST_LABELS,
+    buckets=SIZE_BUCKETS,
+)
+permission_denials = Counter(
+    registry,
+    'crewforge_http_permission_denials_total',
+    'HTTP requests denied for lack of authentication or permission.',
+    (*REQUEST_LABELS, 'status'),
+)
+error_responses = Counter(
+    registry,
+    'crewforge_http_error_responses_total',
+    'HTTP responses with a 4xx or 5xx status.',
+    (*REQUEST_LABELS, 'status'),
+)
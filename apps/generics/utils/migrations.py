@@ -0,0 +1,57 @@
+from django.db.migrations.operations import AddField, AddIndex
+
+
+class AddPostgreSQLIndex(AddIndex):
+    """
+    Add an index only on PostgreSQL, for indexes using PostgreSQL access methods
+    or operator classes. The migration state is updated on every database, so the
+    model `Meta.indexes` stay in sync with the migrations.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f'{super().describe()} (PostgreSQL only)'
+
+
+class AddCounterField(AddField):
+    """
+    Add a counter column, NOT NULL with a constant default. SQLite rebuilds the
+    table to add such a column, recreating the indexes of the model state, which
+    fails for the PostgreSQL-only ones; the column is added in place instead.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'sqlite':
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        field = model._meta.get_field(self.name)
+        quote_name = schema_editor.quote_name
+        definition = f'{field.db_type(schema_editor.connection)} NOT NULL DEFAULT 0'
+        if check := field.db_check(schema_editor.connection):
+            definition += f' CHECK ({check})'
+        schema_editor.execute(
+            f'ALTER TABLE {quote_name(model._meta.db_table)} '
+            f'ADD COLUMN {quote_name(field.column)} {definition}'
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'sqlite':
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        field = model._meta.get_field(self.name)
+        quote_name = schema_editor.quote_name
+        schema_editor.execute(
+            f'ALTER TABLE {quote_name(model._meta.db_table)} '
+            f'DROP COLUMN {quote_name(field.column)}'
+        )
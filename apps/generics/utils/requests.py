@@ -1,31 +1,130 @@
+from django.http import HttpRequest
+from django.utils.functional import cached_property
 from rest_framework.request import Request
 
 from apps.accounts.models.member import Member
 from apps.accounts.models.organization import Organization
+from apps.accounts.utils.cache import get_member_context
+from apps.accounts.utils.tokens import (
+    ORGANIZATION_ID_CLAIM,
+    get_organization_claims,
+    is_organization_token_mode,
+)
+from apps.teams.utils.cache import get_member_team_roles
+
+AUTH_CONTEXT_ATTRIBUTE = '_auth_context'
+
+
+class AuthContext:
+    """
+    Authentication context of a request.
+    Holds the authenticated user and lazily resolves the member and organization of
+    the session scope, so they are loaded only once per request.
+    """
+
+    def __init__(self, *, user, organization_id: int | None = None):
+        """
+        Initializes an AuthContext instance.
+        :param user: The authenticated user, or None for anonymous requests.
+        :param organization_id: The organization ID of the session scope.
+        """
+        self.user = user
+        self.organization_id = organization_id
+
+    @property
+    def user_id(self) -> int | None:
+        return self.user.id if self.user else None
+
+    @cached_property
+    def member(self) -> Member | None:
+        """
+        Get the member of the user in the organization scope, with its user and
+        organization. Organization scoped tokens already read it to check their
+        context version, so the member context cache answers it again.
+        """
+        if not self.user or not self.organization_id:
+            return None
+        return get_member_context(self.user.id, self.organization_id)
+
+    @cached_property
+    def organization(self) -> Organization | None:
+        """Get the organization of the member in the organization scope."""
+        return self.member.organization if self.member else None
+
+    @cached_property
+    def team_roles(self) -> dict[int, str]:
+        """Get the role of the member in each of their active teams, by team ID."""
+        return get_member_team_roles(self.member.id) if self.member else {}
+
+    def is_valid_for(self, *, user, organization_id: int | None) -> bool:
+        """Check whether the context still matches the given user and scope."""
+        return (
+            self.user_id == (user.id if user else None)
+            and self.organization_id == organization_id
+        )
+
+
+def _get_http_request(request: Request | HttpRequest) -> HttpRequest:
+    """Get the underlying Django request shared by the views and serializers."""
+    return getattr(request, '_request', request)
+
+
+def get_token_claims(request: Request) -> dict | None:
+    """Get the organization claims of the token authenticating the request."""
+    return get_organization_claims(getattr(request, 'auth', None))
 
 
 def get_organization_id(request: Request) -> int | None:
-    """Get the organization ID from the request."""
+    """
+    Get the organization ID from the request.
+    Organization scoped tokens are trusted first; the session is only read when
+    the organization token mode is disabled.
+    """
     if not request or not request.user.is_authenticated:
         return None
+    if claims := get_token_claims(request):
+        return claims[ORGANIZATION_ID_CLAIM]
+    if is_organization_token_mode():
+        return None
     return request.session.get('organization_id')
 
 
+def get_auth_context(request: Request) -> AuthContext:
+    """
+    Get the authentication context of the request.
+    The context is stored in the request, so the member and organization are
+    resolved only once, no matter how many permissions, views, serializers and
+    fields ask for them.
+    """
+    if not request:
+        return AuthContext(user=None)
+
+    user = request.user if request.user.is_authenticated else None
+    organization_id = get_organization_id(request) if user else None
+
+    http_request = _get_http_request(request)
+    auth_context = getattr(http_request, AUTH_CONTEXT_ATTRIBUTE, None)
+    if not auth_context or not auth_context.is_valid_for(
+        user=user, organization_id=organization_id
+    ):
+        auth_context = AuthContext(user=user, organization_id=organization_id)
+        setattr(http_request, AUTH_CONTEXT_ATTRIBUTE, auth_context)
+    return auth_context
+
+
 def get_organization(request: Request) -> Organization | None:
     """Get the organization from the request."""
-    if not (organization_id := get_organization_id(request)):
-        return None
-    return request.user.organizations.get_or_none(id=organization_id)
+    return get_auth_context(request).organization
 
 
 def get_member(request: Request) -> Member | None:
     """Get the member from the request."""
-    user = request.user
-    if not user.is_authenticated:
-        return None
-    if not (organization_id := request.session.get('organization_id')):
-        return None
-    return user.members.get_or_none(organization_id=organization_id)
+    return get_auth_context(request).member
+
+
+def get_team_roles(request: Request) -> dict[int, str]:
+    """Get the roles of the member in their teams, by team ID, from the request."""
+    return get_auth_context(request).team_roles
 
 
 def is_same_organization_scope(
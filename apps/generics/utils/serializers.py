@@ -1,4 +1,9 @@
+from typing import NamedTuple
+
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
 
 User = get_user_model()
 
@@ -15,3 +20,114 @@ def get_user_of_context(context: dict) -> User | None:
     elif not user.is_authenticated:
         return None
     return user
+
+
+def parse_field_paths(value: str) -> dict[str, dict]:
+    """
+    Parse comma separated field paths into a tree of field names, e.g.
+    'id,user.email' into {'id': {}, 'user': {'email': {}}}.
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def get_query_field_paths(request, param: str) -> dict[str, dict] | None:
+    """Get the tree of the field paths of a query parameter, None if not sent."""
+    value = getattr(request, 'query_params', {}).get(param)
+    return None if value is None else parse_field_paths(value)
+
+
+def prefers_minimal_return(request) -> bool:
+    """Check whether the request sent the `Prefer: return=minimal` header."""
+    prefer = request.headers.get('Prefer', '') if request else ''
+    return 'return=minimal' in (
+        token.strip().lower() for token in prefer.replace(';', ',').split(',')
+    )
+
+
+class QueryPlan(NamedTuple):
+    """Relations and columns a queryset loads to serialize its rows."""
+
+    select_related: tuple[str, ...] = ()
+    prefetch_related: tuple[str, ...] = ()
+    # Fields to load with `only`, None when the serializer may read any attribute
+    only: tuple[str, ...] | None = None
+
+
+def get_query_plan(serializer: BaseSerializer) -> QueryPlan:
+    """
+    Plan the queryset of a model serializer from its readable fields: the nested
+    serializers of forward relations are joined, those of many related rows and
+    the lists of primary keys are prefetched, and only the serialized columns are
+    loaded, unless a field reads the whole instance or an attribute that is not a
+    model field, e.g. a method field.
+    """
+    select_related, prefetch_related, only = [], [], []
+    complete = _plan_serializer(serializer, '', select_related, prefetch_related, only)
+    return QueryPlan(
+        tuple(select_related),
+        tuple(prefetch_related),
+        tuple(only) if complete else None,
+    )
+
+
+def _plan_serializer(
+    serializer: BaseSerializer,
+    prefix: str,
+    select_related: list[str],
+    prefetch_related: list[str],
+    only: list[str],
+) -> bool:
+    """
+    Add the plan of a serializer nested at a path to the given lists.
+    :return: Whether the columns it reads are all listed in `only`.
+    """
+    if not (model := getattr(getattr(serializer, 'Meta', None), 'model', None)):
+        return False
+    complete = True
+    only.append(f'{prefix}{model._meta.pk.name}')
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            complete = False
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            complete = False
+            continue
+        path = f'{prefix}{field.source}'
+        if isinstance(field, ListSerializer | ManyRelatedField):
+            prefetch_related.append(path)
+            if isinstance(field, ListSerializer):
+                # The rows are loaded by their own query, whose joins are prefetches
+                nested = get_query_plan(field.child)
+                prefetch_related += [
+                    f'{path}__{lookup}'
+                    for lookup in (*nested.select_related, *nested.prefetch_related)
+                ]
+        elif not model_field.is_relation:
+            only.append(path)
+        elif not model_field.concrete:
+            # Reverse relations are not columns of the row
+            complete = False
+            if model_field.one_to_one and isinstance(field, BaseSerializer):
+                select_related.append(path)
+        elif isinstance(field, BaseSerializer):
+            select_related.append(path)
+            only.append(path)
+            complete &= _plan_serializer(
+                field, f'{path}__', select_related, prefetch_related, only
+            )
+        elif isinstance(field, PrimaryKeyRelatedField):
+            only.append(path)
+        else:
+            # Other related fields read the related row, e.g. its slug
+            select_related.append(path)
+            complete = False
+    return complete
@@ -0,0 +1,23 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from apps.generics.utils.metrics import registry
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request):
+    """
+    Expose the metrics of every worker in the Prometheus text format.
+    Scrapers must send `METRICS_TOKEN` as a bearer token. Without a token, the
+    metrics are only exposed with DEBUG on.
+    """
+    if token := settings.METRICS_TOKEN:
+        authorization = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(authorization, f'Bearer {token}'):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
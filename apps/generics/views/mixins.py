@@ -1,14 +1,298 @@
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Count, Max
 from django.db.models.expressions import Combinable, F
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status as http_status
 from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
 from apps.generics.mixins.mixins import RequestUserMixin
+from apps.generics.pagination import KeysetPagination
 from apps.generics.serializers.choices import ChoiceSerializer
+from apps.generics.serializers.mixins import EXPAND_QUERY_PARAM, FIELDS_QUERY_PARAM
+from apps.generics.serializers.values import NotCompilable, ValuesSerializer
+from apps.generics.utils.cache import (
+    choices_cache,
+    get_choices_scope,
+    query_plan_cache,
+)
+from apps.generics.utils.serializers import (
+    QueryPlan,
+    get_query_plan,
+    prefers_minimal_return,
+)
 
 
 class ModelViewSetMixin(RequestUserMixin):
     """Mixin for views to add user, member, and organization properties."""
 
+    # Set to a unique ordering, e.g. ('-id',) or ('-updated_at', '-id'), to let
+    # clients opt in to keyset pagination by sending the cursor query parameter.
+    keyset_ordering: tuple[str, ...] | None = None
+    keyset_pagination_class = KeysetPagination
+
+    # Cache the choices per organization until a row they read is written.
+    # Labels of the models read by the label expression besides the listed one.
+    cache_choices = False
+    choices_cache_models: tuple[str, ...] = ()
+
+    # Fields whose latest value tells when a row, as serialized, last changed.
+    # Related fields, e.g. 'user__updated_at', cover nested or labelled relations.
+    last_modified_fields: tuple[str, ...] = ('updated_at',)
+
+    # Relations read by the object permissions, joined besides those the serializer
+    # reads, e.g. the team of a team member for its organization
+    permission_select_related: tuple[str, ...] = ()
+
+    # Serialize lists and retrieved objects from the columns the serializer reads,
+    # without building model instances, when every field it reads is a column
+    fast_read = False
+
+    def use_keyset_pagination(self) -> bool:
+        """Check whether the request opted in to keyset pagination."""
+        request = getattr(self, 'request', None)
+        return (
+            bool(self.keyset_ordering)
+            and request is not None
+            and self.keyset_pagination_class.cursor_query_param
+            in getattr(request, 'query_params', {})
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.use_keyset_pagination():
+            self._paginator = self.keyset_pagination_class(
+                ordering=self.keyset_ordering
+            )
+        return super().paginator
+
+    def get_queryset(self):
+        return self.apply_query_plan(super().get_queryset())
+
+    def get_query_plan_key(self) -> tuple:
+        """Get what the shape of the serializer of the request depends on."""
+        query_params = self.request.query_params
+        return (
+            f'{self.__class__.__module__}.{self.__class__.__qualname__}',
+            self.action,
+            self.request.method in SAFE_METHODS,
+            query_params.get(FIELDS_QUERY_PARAM),
+            query_params.get(EXPAND_QUERY_PARAM),
+        )
+
+    def get_query_plan(self, model) -> QueryPlan | None:
+        """
+        Get the plan of the queryset from the serializer of the action, cached per
+        viewset, action and requested fields, or None if the serializer does not
+        serialize the model of the queryset.
+        """
+        serializer_class = self.get_serializer_class()
+        if getattr(getattr(serializer_class, 'Meta', None), 'model', None) != model:
+            return None
+        key = (*self.get_query_plan_key(), serializer_class)
+        plan = query_plan_cache.get(key, None)
+        if plan is None:
+            plan = get_query_plan(self.get_serializer())
+            query_plan_cache.set(key, plan)
+        return plan
+
+    def get_values_serializer(self) -> ValuesSerializer | None:
+        """
+        Get the serializer of the fast read path, compiled from the serializer of
+        the action with the requested fields, or None to use the serializer. It is
+        compiled once per viewset, action and requested fields, like the plan.
+        """
+        if not self.fast_read or self.action not in ('list', 'retrieve'):
+            return None
+        key = (*self.get_query_plan_key(), self.get_serializer_class(), 'values')
+        values_serializer = query_plan_cache.get(key, None)
+        if values_serializer is None:
+            try:
+                values_serializer = ValuesSerializer.compile(self.get_serializer())
+            except NotCompilable:
+                # Cached too, so the serializer is not compiled again
+                values_serializer = False
+            query_plan_cache.set(key, values_serializer)
+        return values_serializer or None
+
+    def apply_query_plan(self, queryset):
+        """
+        Join and prefetch the relations the serializer reads, and on lists only load
+        the columns it reads, along with those of the keyset pagination.
+        """
+        if getattr(self, 'request', None) is None:
+            return queryset
+        if not (plan := self.get_query_plan(queryset.model)):
+            return queryset
+        # The plan replaces the joins of the queryset
+        queryset = queryset.select_related(None)
+        if select_related := (*self.permission_select_related, *plan.select_related):
+            queryset = queryset.select_related(*select_related)
+        if plan.prefetch_related:
+            queryset = queryset.prefetch_related(*plan.prefetch_related)
+        if self.action == 'list' and plan.only is not None:
+            keyset_fields = [field.lstrip('-') for field in self.keyset_ordering or ()]
+            queryset = queryset.only(
+                *plan.only, *keyset_fields, *self.permission_select_related
+            )
+        return queryset
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            self.action in ('create', 'update', 'partial_update')
+            and request.method not in SAFE_METHODS
+            and http_status.is_success(response.status_code)
+            and prefers_minimal_return(request)
+        ):
+            response.headers['Preference-Applied'] = 'return=minimal'
+        return response
+
+    def get_etag(self, *values) -> str:
+        """
+        Get a strong ETag for the response of the request, from the given values
+        and what else the representation depends on: view, URL, format and scope.
+        """
+        request = self.request
+        renderer = getattr(request, 'accepted_renderer', None)
+        parts = [
+            f'{self.__class__.__module__}.{self.__class__.__qualname__}',
+            request.build_absolute_uri(),
+            getattr(renderer, 'format', None),
+            getattr(self.auth_user, 'id', None),
+            self.auth_organization_id,
+            *values,
+        ]
+        return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+    def get_queryset_validators(self, queryset) -> tuple[str, datetime | None]:
+        """
+        Get the ETag and last modification time of the rows of a queryset, from a
+        single COUNT and MAX aggregate over the last modified fields.
+        """
+        aggregates = queryset.order_by().aggregate(
+            _count=Count('pk'),
+            **{
+                f'_last_modified_{index}': Max(field)
+                for index, field in enumerate(self.last_modified_fields)
+            },
+        )
+        values = list(aggregates.values())
+        last_modified = max(filter(None, values[1:]), default=None)
+        return self.get_etag(*values), last_modified
+
+    def get_object_validators(self, instance) -> tuple[str, datetime | None]:
+        """Get the ETag and last modification time of an object."""
+        if any('__' in field for field in self.last_modified_fields):
+            return self.get_queryset_validators(
+                self.get_queryset().filter(pk=instance.pk)
+            )
+        values = [getattr(instance, field) for field in self.last_modified_fields]
+        last_modified = max(filter(None, values), default=None)
+        return self.get_etag(instance.pk, *values), last_modified
+
+    def get_conditional_response(
+        self,
+        respond: Callable[[], HttpResponseBase],
+        etag: str,
+        last_modified: datetime | None = None,
+        check_last_modified: bool = True,
+    ) -> HttpResponseBase:
+        """
+        Return 304 Not Modified if the request preconditions match the validators,
+        otherwise the response built by `respond`, with the validators as headers.
+        :param respond: Callable that builds the full response.
+        :param etag: Strong ETag of the response.
+        :param last_modified: Last modification time of the response.
+        :param check_last_modified: Whether If-Modified-Since is evaluated.
+        """
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=timestamp if check_last_modified else None,
+        )
+        if response is None:
+            response = respond()
+        if response.status_code in (
+            http_status.HTTP_200_OK,
+            http_status.HTTP_304_NOT_MODIFIED,
+        ):
+            response.headers['ETag'] = etag
+            if timestamp:
+                response.headers['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def get_list_conditional_response(
+        self, respond: Callable[[], HttpResponseBase]
+    ) -> HttpResponseBase:
+        """
+        Conditional response of a list, with an ETag derived from the data of the
+        page, so no query runs besides those of the page, and keyset pages cost no
+        aggregate over the whole queryset. Removed rows do not move the latest
+        modification time, so If-Modified-Since is not evaluated.
+        """
+        response = respond()
+        if (
+            not self.last_modified_fields
+            or response.status_code != http_status.HTTP_200_OK
+        ):
+            return response
+        return self.get_conditional_response(
+            lambda: response,
+            self.get_etag(response.data),
+            check_last_modified=False,
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if values_serializer := self.get_values_serializer():
+            respond = partial(self.get_values_response, queryset, values_serializer)
+        else:
+            respond = partial(super().list, request, *args, **kwargs)
+        return self.get_list_conditional_response(respond)
+
+    def get_values_response(
+        self, queryset, values_serializer: ValuesSerializer
+    ) -> Response:
+        """Get the response of a list, serialized from the rows of `values()`."""
+        # Keyset pages need the ordering fields of each row to build the cursors
+        paginator = self.paginator
+        keyset_fields = (
+            paginator.fields if isinstance(paginator, KeysetPagination) else ()
+        )
+        rows = queryset.prefetch_related(None).values(
+            *dict.fromkeys((*values_serializer.lookups, *keyset_fields))
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(rows))
+
+    def get_object_data(self, instance) -> dict:
+        """Serialize a retrieved object, on the fast read path if enabled."""
+        if values_serializer := self.get_values_serializer():
+            return values_serializer.serialize_instance(instance)
+        return self.get_serializer(instance).data
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if not self.last_modified_fields:
+            return Response(self.get_object_data(instance))
+        etag, last_modified = self.get_object_validators(instance)
+        return self.get_conditional_response(
+            lambda: Response(self.get_object_data(instance)), etag, last_modified
+        )
+
     def perform_destroy(self, instance):
         if hasattr(instance, 'is_active'):
             instance.inactivate()
@@ -33,17 +317,65 @@ class ModelViewSetMixin(RequestUserMixin):
             return self.lookup_field
         return 'pk'
 
+    def get_choices_cache_scopes(self, queryset) -> dict[str, int] | None:
+        """
+        Get the cache scopes of the choices, one per model they read, or None if
+        they must not be cached.
+        """
+        if not (self.cache_choices and settings.CHOICES_CACHE_ENABLED):
+            return None
+        if not (organization_id := self.auth_organization_id):
+            return None
+        models = (queryset.model, *self.choices_cache_models)
+        return {get_choices_scope(model): organization_id for model in models}
+
+    def get_choices_cache_key(self) -> str:
+        """Get the key of the choices among those of the same scopes."""
+        view = f'{self.__class__.__module__}.{self.__class__.__qualname__}'
+        url = self.request.build_absolute_uri()
+        return hashlib.sha1(f'{view}:{url}'.encode()).hexdigest()
+
     @action(detail=False, methods=['get'], url_path='choices')
     def choices(self, request, *args, **kwargs):
         """List teams for choices (value/label format)."""
         queryset = self.filter_queryset(self.get_queryset())
+        if not (scopes := self.get_choices_cache_scopes(queryset)):
+            return self.get_list_conditional_response(
+                partial(self.get_choices_response, queryset)
+            )
+        # The validators are cached along with the choices, so a hit runs no query
+        data, validators = choices_cache.get_or_set(
+            scopes=scopes,
+            default=lambda: self.get_choices_entry(queryset),
+            key=self.get_choices_cache_key(),
+        )
+        if validators is None:
+            return Response(data)
+        etag, last_modified = validators
+        return self.get_conditional_response(
+            lambda: Response(data), etag, last_modified, check_last_modified=False
+        )
+
+    def get_choices_entry(self, queryset) -> tuple[Any, tuple | None]:
+        """Get the cached choices and their validators, None without any."""
+        validators = None
+        if self.last_modified_fields:
+            validators = self.get_queryset_validators(queryset)
+        return self.get_choices_response(queryset).data, validators
 
+    def get_choices_response(self, queryset) -> Response:
+        """Get the response with the choices of the filtered queryset."""
         label = self.get_label_expression()
         value = self.get_value_expression()
+        # Keyset pages need the ordering fields of each row to build the cursors
+        paginator = self.paginator
+        keyset_fields = (
+            paginator.fields if isinstance(paginator, KeysetPagination) else ()
+        )
         choices_queryset = queryset.annotate(
             _choice_label=F(label) if isinstance(label, str) else label,
             _choice_value=F(value) if isinstance(value, str) else value,
-        ).values('_choice_value', '_choice_label')
+        ).values('_choice_value', '_choice_label', *keyset_fields)
 
         choices_page = self.paginate_queryset(choices_queryset)
         if choices_page is not None:
@@ -57,6 +389,7 @@ class ModelViewSetMixin(RequestUserMixin):
 class OrganizationScopedViewSetMixin(RequestUserMixin):
     organization_filter = 'organization_id'
     base_filters = {}
+    cache_choices = True
 
     def get_base_queryset_filters(self) -> dict:
         return dict(self.base_filters)
@@ -1,8 +1,11 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from apps.generics.choices import RankedChoicesMixin
 
-class TeamMemberRoleChoices(models.TextChoices):
+
+class TeamMemberRoleChoices(RankedChoicesMixin, models.TextChoices):
+    # Declared from the highest to the lowest rank
     OWNER = 'owner', _('Owner')
     ADMIN = 'admin', _('Admin')
     MANAGER = 'manager', _('Manager')
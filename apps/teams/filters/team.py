@@ -13,5 +13,6 @@ class TeamFilter(FilterSetMixin, filterset.FilterSet):
             'name': ['exact', 'icontains'],
             'slug': ['exact', 'icontains'],
             'organization': ['exact'],
+            'parent': ['exact', 'isnull'],
             'is_active': ['exact'],
         }
@@ -1,6 +1,8 @@
+from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import filters, filterset
 
 from apps.generics.filters.mixins import FilterSetMixin
+from apps.teams.choices import TeamMemberRoleChoices
 from apps.teams.models.team_member import TeamMember
 
 
@@ -31,6 +33,14 @@ class TeamMemberFilter(FilterSetMixin, filterset.FilterSet):
         field_name='team__slug',
         lookup_expr='icontains',
     )
+    min_role = filters.ChoiceFilter(
+        choices=TeamMemberRoleChoices.choices,
+        method='filter_min_role',
+        label=_(
+            'Ranks at least as the role in the team, admins of the organization '
+            'ranking as owners'
+        ),
+    )
 
     class Meta:
         model = TeamMember
@@ -40,3 +50,7 @@ class TeamMemberFilter(FilterSetMixin, filterset.FilterSet):
             'is_active': ['exact'],
             'role': ['exact', 'in'],
         }
+
+    def filter_min_role(self, queryset, name, value):
+        """Filter by the effective rank of the team members, computed in SQL."""
+        return queryset.filter_min_role(value)
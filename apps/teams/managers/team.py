@@ -1,3 +1,10 @@
 from apps.generics.managers.querysets import BaseManager, BaseQuerySet
 
-TeamManager = BaseManager.from_queryset(BaseQuerySet)
+
+class TeamQuerySet(BaseQuerySet):
+    def filter_subtree(self, team_id: int):
+        """Filter the teams of the subtree of a team, the team included."""
+        return self.filter(ancestor_links__ancestor_id=team_id)
+
+
+TeamManager = BaseManager.from_queryset(TeamQuerySet)
@@ -0,0 +1,70 @@
+from django.db import connections, models
+
+
+class TeamClosureQuerySet(models.QuerySet):
+    def link_teams(self, teams: list) -> list:
+        """
+        Link teams to themselves and to their ancestors, e.g. new teams or teams
+        created in bulk. Parents are either among the teams or already linked, so
+        a whole hierarchy is linked with one read and one bulk insert.
+        :param teams: Saved teams, with their parent ID.
+        :return: The links inserted.
+        """
+        parent_ids = {team.id: team.parent_id for team in teams}
+        ancestors = {}
+        for ancestor_id, descendant_id, depth in self.filter(
+            descendant_id__in={
+                parent_id
+                for parent_id in parent_ids.values()
+                if parent_id and parent_id not in parent_ids
+            }
+        ).values_list('ancestor_id', 'descendant_id', 'depth'):
+            ancestors.setdefault(descendant_id, []).append((ancestor_id, depth))
+
+        def get_ancestors(team_id: int) -> list[tuple[int, int]]:
+            if team_id not in ancestors:
+                parent_id = parent_ids[team_id]
+                ancestors[team_id] = [(team_id, 0)] + [
+                    (ancestor_id, depth + 1)
+                    for ancestor_id, depth in (
+                        get_ancestors(parent_id) if parent_id else []
+                    )
+                ]
+            return ancestors[team_id]
+
+        return self.bulk_create(
+            self.model(ancestor_id=ancestor_id, descendant_id=team.id, depth=depth)
+            for team in teams
+            for ancestor_id, depth in get_ancestors(team.id)
+        )
+
+    def move_subtree(self, team_id: int, parent_id: int | None):
+        """
+        Move the subtree of a team under a new parent, or to the root, with two
+        set-based statements: the links from the former ancestors to the subtree
+        are deleted, then the links from the ancestors of the parent to the
+        subtree are inserted. The parent must not be in the subtree.
+        """
+        subtree_ids = self.filter(ancestor_id=team_id).values('descendant_id')
+        self.filter(descendant_id__in=subtree_ids).exclude(
+            ancestor_id__in=subtree_ids
+        ).delete()
+        if parent_id is None:
+            return
+
+        # Cross join of the ancestry of the parent and the subtree of the team
+        self._for_write = True
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (ancestor_id, descendant_id, depth) '
+                f'SELECT ancestry.ancestor_id, subtree.descendant_id, '
+                f'ancestry.depth + subtree.depth + 1 '
+                f'FROM {table} ancestry, {table} subtree '
+                f'WHERE ancestry.descendant_id = %s AND subtree.ancestor_id = %s',
+                [parent_id, team_id],
+            )
+
+
+TeamClosureManager = models.Manager.from_queryset(TeamClosureQuerySet)
@@ -1,3 +1,40 @@
+from django.db import models
+
+from apps.accounts.choices import MemberRoleChoices
 from apps.generics.managers.querysets import BaseManager, BaseQuerySet
+from apps.teams.choices import TeamMemberRoleChoices
+
+
+class TeamMemberQuerySet(BaseQuerySet):
+    @staticmethod
+    def get_role_rank_expression() -> models.Case:
+        """
+        Get the SQL expression of the effective rank of the team members. Admins of
+        the organization, and superusers, rank as owners of every team.
+        """
+        admin_roles = [
+            role
+            for role in MemberRoleChoices
+            if role.rank >= MemberRoleChoices.ADMIN.rank
+        ]
+        return TeamMemberRoleChoices.rank_expression(
+            field='role',
+            promote=models.Q(member__role__in=admin_roles)
+            | models.Q(member__user__is_superuser=True),
+        )
+
+    def annotate_role_rank(self):
+        return self.annotate(role_rank=self.get_role_rank_expression())
+
+    def filter_min_role(self, role: str):
+        """Filter the team members that rank at least as the role, e.g. managers."""
+        return self.annotate_role_rank().filter(
+            role_rank__gte=TeamMemberRoleChoices(role).rank
+        )
+
+    def filter_subtree(self, team_id: int):
+        """Filter the team members of the subtree of a team, the team included."""
+        return self.filter(team__ancestor_links__ancestor_id=team_id)
+
 
-TeamMemberManager = BaseManager.from_queryset(BaseQuerySet)
+TeamMemberManager = BaseManager.from_queryset(TeamMemberQuerySet)
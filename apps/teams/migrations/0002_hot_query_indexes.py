@@ -0,0 +1,24 @@
+# Generated by Django 6.0.3 on 2026-10-18 02:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_hot_query_indexes'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['organization', '-id'], name='team_org_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['team', '-id'], name='team_member_team_active_idx'),
+        ),
+    ]
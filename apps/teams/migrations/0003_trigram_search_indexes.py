@@ -0,0 +1,23 @@
+# Generated by Django 6.0.3 on 2026-10-18 02:38
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+import apps.generics.utils.migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_trigram_search_indexes'),
+        ('teams', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        apps.generics.utils.migrations.AddPostgreSQLIndex(
+            model_name='team',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='team_name_trgm_idx'),
+        ),
+    ]
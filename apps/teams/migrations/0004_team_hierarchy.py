@@ -0,0 +1,48 @@
+# Generated by Django 6.0.3 on 2026-10-18 03:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_teams(apps, schema_editor):
+    """Link the existing teams, all at the root, to themselves."""
+    Team = apps.get_model('teams', 'Team')
+    TeamClosure = apps.get_model('teams', 'TeamClosure')
+    TeamClosure.objects.bulk_create(
+        (
+            TeamClosure(ancestor_id=team_id, descendant_id=team_id, depth=0)
+            for team_id in Team.objects.values_list('id', flat=True).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='parent',
+            field=models.ForeignKey(blank=True, help_text='Team under which the team is nested', null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='children', to='teams.team', verbose_name='Parent'),
+        ),
+        migrations.CreateModel(
+            name='TeamClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField(help_text='Number of levels between the ancestor and the descendant', verbose_name='Depth')),
+                ('ancestor', models.ForeignKey(db_index=False, help_text='Team at the top of the path', on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='teams.team', verbose_name='Ancestor')),
+                ('descendant', models.ForeignKey(db_index=False, help_text='Team at the bottom of the path', on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='teams.team', verbose_name='Descendant')),
+            ],
+            options={
+                'verbose_name': 'Team closure',
+                'verbose_name_plural': 'Team closures',
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='team_closure_descendant_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='team_closure_unique')],
+            },
+        ),
+        migrations.RunPython(link_teams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.3 on 2026-10-18 03:22
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+import apps.generics.utils.migrations
+
+
+def fill_counters(apps, schema_editor):
+    """Count the members of the existing teams."""
+    Team = apps.get_model('teams', 'Team')
+    TeamMember = apps.get_model('teams', 'TeamMember')
+    Team.objects.update(
+        members_count=Coalesce(
+            models.Subquery(
+                TeamMember.objects.filter(team=models.OuterRef('pk'), is_active=True)
+                .order_by()
+                .values('team')
+                .annotate(count=models.Count('pk'))
+                .values('count'),
+                output_field=models.IntegerField(),
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0004_team_hierarchy'),
+    ]
+
+    operations = [
+        apps.generics.utils.migrations.AddCounterField(
+            model_name='team',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active members of the team', verbose_name='Members count'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.3 on 2026-10-18 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0005_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the record was deactivated, shared by a whole cascade', null=True, verbose_name='Deactivated At'),
+        ),
+    ]
@@ -1,11 +1,14 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from apps.generics.models.abstracts import BaseModel
+from apps.generics.models.counters import CounterFieldsMixin
+from apps.generics.models.indexes import upper_trigram_index
 from apps.teams.managers.team import TeamManager
+from apps.teams.models.team_closure import TeamClosure
 
 
-class Team(BaseModel):
+class Team(CounterFieldsMixin, BaseModel):
     name = models.CharField(
         max_length=100, verbose_name=_('Name'), help_text=_('Name of the team')
     )
@@ -25,22 +28,74 @@ class Team(BaseModel):
         verbose_name=_('Organization'),
         help_text=_('Organization to which the team belongs'),
     )
+    parent = models.ForeignKey(
+        to='self',
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name='children',
+        verbose_name=_('Parent'),
+        help_text=_('Team under which the team is nested'),
+    )
+    members_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Members count'),
+        help_text=_('Number of active members of the team'),
+    )
 
     objects = TeamManager()
 
+    counter_fields = ('members_count',)
+    cascade_relations = ('members',)
+
     class Meta:
         ordering = ['-id']
         verbose_name = _('Team')
         verbose_name_plural = _('Teams')
         unique_together = ['name', 'organization']
+        indexes = [
+            models.Index(
+                fields=['organization', '-id'],
+                condition=models.Q(is_active=True),
+                name='team_org_active_idx',
+            ),
+            upper_trigram_index('name', name='team_name_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """
+        Save the team and keep its closure links up to date: a new team is linked
+        to its ancestors, and changing the parent moves the whole subtree.
+        """
+        if self.is_save_skipped(**kwargs):
+            return
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        moved = (
+            not adding
+            and (update_fields is None or 'parent' in update_fields)
+            and self.has_changed('parent')
+        )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                TeamClosure.objects.link_teams([self])
+            elif moved:
+                TeamClosure.objects.move_subtree(self.id, self.parent_id)
+
+    def is_in_subtree_of(self, team) -> bool:
+        """Check if the team is the given team or one of its descendants."""
+        return TeamClosure.objects.filter(
+            ancestor_id=team.id, descendant_id=self.id
+        ).exists()
+
     def is_team_member(self, member) -> bool:
         """Check if a member is part of the team."""
         return self.members.filter(
             member_id=member.id,
             is_active=True,
-            member__is_active=True,
         ).exists()
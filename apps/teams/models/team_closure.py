@@ -0,0 +1,53 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.teams.managers.team_closure import TeamClosureManager
+
+
+class TeamClosure(models.Model):
+    """
+    Closure table of the team hierarchy: one row per team and each of its
+    ancestors, the team itself included at depth 0, so the subtree or the
+    ancestry of a team is read with a single indexed join.
+    """
+
+    ancestor = models.ForeignKey(
+        to='teams.Team',
+        on_delete=models.CASCADE,
+        related_name='descendant_links',
+        # Covered by the unique constraint and the index, which lead with them
+        db_index=False,
+        verbose_name=_('Ancestor'),
+        help_text=_('Team at the top of the path'),
+    )
+    descendant = models.ForeignKey(
+        to='teams.Team',
+        on_delete=models.CASCADE,
+        related_name='ancestor_links',
+        db_index=False,
+        verbose_name=_('Descendant'),
+        help_text=_('Team at the bottom of the path'),
+    )
+    depth = models.PositiveSmallIntegerField(
+        verbose_name=_('Depth'),
+        help_text=_('Number of levels between the ancestor and the descendant'),
+    )
+
+    objects = TeamClosureManager()
+
+    class Meta:
+        verbose_name = _('Team closure')
+        verbose_name_plural = _('Team closures')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['ancestor', 'descendant'], name='team_closure_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['descendant', 'depth'], name='team_closure_descendant_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
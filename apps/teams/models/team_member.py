@@ -2,11 +2,12 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from apps.generics.models.abstracts import BaseModel
+from apps.generics.models.counters import CountedModelMixin, Counter
 from apps.teams.choices import TeamMemberRoleChoices
 from apps.teams.managers.team_member import TeamMemberManager
 
 
-class TeamMember(BaseModel):
+class TeamMember(CountedModelMixin, BaseModel):
     team = models.ForeignKey(
         to='teams.Team',
         on_delete=models.CASCADE,
@@ -31,11 +32,20 @@ class TeamMember(BaseModel):
 
     objects = TeamMemberManager()
 
+    counters = (Counter('team', 'members_count'),)
+
     class Meta:
         ordering = ['-id']
         verbose_name = _('Team Member')
         verbose_name_plural = _('Team Members')
         unique_together = ['team', 'member']
+        indexes = [
+            models.Index(
+                fields=['team', '-id'],
+                condition=models.Q(is_active=True),
+                name='team_member_team_active_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.member} - {self.team}'
@@ -56,21 +66,32 @@ class TeamMember(BaseModel):
     def is_member(self) -> bool:
         return self.role == TeamMemberRoleChoices.MEMBER
 
+    def has_rank(self, role: str) -> bool:
+        """
+        Check if the member ranks at least as the role in the team. The member is
+        only loaded when the team role ranks lower, for the organization override.
+        """
+        rank = TeamMemberRoleChoices(role).rank
+        return (
+            TeamMemberRoleChoices.get_rank(self.role) >= rank
+            or self.member.has_admin_permission
+        )
+
     @property
     def has_owner_permission(self) -> bool:
-        return self.is_owner or self.member.has_admin_permission
+        return self.has_rank(TeamMemberRoleChoices.OWNER)
 
     @property
     def has_admin_permission(self) -> bool:
-        return self.is_admin or self.has_owner_permission
+        return self.has_rank(TeamMemberRoleChoices.ADMIN)
 
     @property
     def has_manager_permission(self) -> bool:
-        return self.is_manager or self.has_admin_permission
+        return self.has_rank(TeamMemberRoleChoices.MANAGER)
 
     @property
     def has_member_permission(self) -> bool:
-        return self.is_member or self.has_manager_permission
+        return self.has_rank(TeamMemberRoleChoices.MEMBER)
 
     @classmethod
     def label_expression(cls) -> models.expressions.Combinable:
@@ -1,7 +1,8 @@
 from rest_framework import permissions
 
 from apps.generics.permissions import OrganizationScopedPermission
-from apps.generics.utils.requests import get_member
+from apps.generics.utils.requests import get_member, get_team_roles
+from apps.teams.choices import TeamMemberRoleChoices
 
 
 class TeamPermission(OrganizationScopedPermission):
@@ -27,7 +28,9 @@ class TeamPermission(OrganizationScopedPermission):
         if auth_member.has_manager_permission:
             return True
 
-        auth_member_team = auth_member.teams.filter(
-            team_id=obj.id, is_active=True
-        ).get_or_none()
-        return bool(auth_member_team) and auth_member_team.has_admin_permission
+        # The roles of the member are loaded once, so each object costs no query
+        team_role = get_team_roles(request).get(obj.id)
+        return (
+            TeamMemberRoleChoices.get_rank(team_role)
+            >= TeamMemberRoleChoices.ADMIN.rank
+        )
@@ -1,19 +1,67 @@
 from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from apps.accounts.models.organization import Organization
 from apps.generics.serializers.mixins import ModelSerializerMixin
 from apps.teams.choices import TeamMemberRoleChoices
 from apps.teams.models.team import Team
 from apps.teams.models.team_member import TeamMember
 
 
-class TeamSerializer(ModelSerializerMixin, serializers.ModelSerializer):
+class TeamParentSerializerMixin:
+    """Mixin for serializers that set the parent of a team."""
+
+    def validate_parent(self, value):
+        """
+        Validate that the parent is a team of the organization, and that the team
+        is not nested under itself or its subteams.
+        """
+        if value and value.organization_id != self.auth_organization_id:
+            raise serializers.ValidationError(
+                _('A team can only be nested under a team of its organization.')
+            )
+        if value and self.instance and value.is_in_subtree_of(self.instance):
+            raise serializers.ValidationError(
+                _('A team cannot be nested under itself or one of its subteams.')
+            )
+        return value
+
+    def update(self, instance, validated_data):
+        """
+        Update the team. When its parent changes, the organization is locked before
+        the cycle check runs again, so the moves of its teams are serialized: two
+        concurrent moves, e.g. A under B and B under A, or disjoint moves that
+        close a longer cycle, cannot both pass it.
+        """
+        parent = validated_data.get('parent', instance.parent)
+        with transaction.atomic():
+            if getattr(parent, 'id', None) != instance.parent_id:
+                list(
+                    Organization._base_manager.select_for_update()
+                    .filter(pk=instance.organization_id)
+                    .values_list('pk', flat=True)
+                )
+                if parent:
+                    try:
+                        self.validate_parent(parent)
+                    except serializers.ValidationError as err:
+                        raise serializers.ValidationError(
+                            {'parent': err.detail}
+                        ) from err
+            return super().update(instance, validated_data)
+
+
+class TeamSerializer(
+    TeamParentSerializerMixin, ModelSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Team
         fields = '__all__'
         read_only_fields = ModelSerializerMixin._default_read_only_fields + [
             'organization'
         ]
+        expandable_fields = {'parent': 'apps.teams.serializers.team.TeamSerializer'}
 
     def create(self, validated_data):
         """Create a new team."""
@@ -27,3 +75,19 @@ class TeamSerializer(ModelSerializerMixin, serializers.ModelSerializer):
                 updated_by=self.auth_user,
             )
         return instance
+
+
+class TeamMoveSerializer(
+    TeamParentSerializerMixin, ModelSerializerMixin, serializers.ModelSerializer
+):
+    """Serializer to move a team, with its subtree, under another team."""
+
+    class Meta:
+        model = Team
+        fields = ['parent']
+        extra_kwargs = {
+            'parent': {
+                'required': True,
+                'help_text': _('Team under which the team is moved, null for the root'),
+            }
+        }
@@ -1,9 +1,23 @@
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from rest_framework import serializers
+from rest_framework import exceptions, relations, serializers
 from rest_framework.fields import empty
 
+from apps.accounts.models.member import Member
+from apps.generics.choices import BulkResultStatusChoices
+from apps.generics.fields.fields import FieldMixin
+from apps.generics.fields.relations import PrimaryKeyRelatedField
+from apps.generics.models.counters import add_to_counters
+from apps.generics.serializers.bulk import BulkListSerializer, BulkResultSerializer
 from apps.generics.serializers.mixins import ModelSerializerMixin
+from apps.generics.utils.cache import invalidate_choices
+from apps.teams.choices import TeamMemberRoleChoices
+from apps.teams.models.team import Team
 from apps.teams.models.team_member import TeamMember
+from apps.teams.utils.cache import invalidate_team_roles
 
 
 class TeamMemberSerializer(ModelSerializerMixin, serializers.ModelSerializer):
@@ -13,6 +27,10 @@ class TeamMemberSerializer(ModelSerializerMixin, serializers.ModelSerializer):
         model = TeamMember
         fields = '__all__'
         read_only_fields = ModelSerializerMixin._default_read_only_fields
+        expandable_fields = {
+            'team': 'apps.teams.serializers.team.TeamSerializer',
+            'member': 'apps.accounts.serializers.member.MemberModelSerializer',
+        }
 
     def validate_team(self, value):
         """Validate that the team is not already associated with the member."""
@@ -21,7 +39,7 @@ class TeamMemberSerializer(ModelSerializerMixin, serializers.ModelSerializer):
                 raise serializers.ValidationError(_('Not allowed to change the team.'))
             if (
                 self.auth_member
-                and not value.is_team_member(self.auth_member)
+                and value.id not in self.auth_context.team_roles
                 and not self.auth_member.has_manager_permission
             ):
                 raise serializers.ValidationError(
@@ -74,3 +92,246 @@ class TeamMemberUpdateSerializer(TeamMemberSerializer):
             'member',
         ]
         fields = TeamMemberSerializer.Meta.fields
+
+
+class TeamMemberBulkItemSerializer(serializers.Serializer):
+    """Serializer for a row of a bulk team member upsert."""
+
+    member = serializers.IntegerField(min_value=1, help_text=_('Member ID'))
+    role = serializers.ChoiceField(
+        choices=TeamMemberRoleChoices.choices,
+        default=TeamMemberRoleChoices.MEMBER,
+        help_text=_('Role of the member in the team'),
+    )
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+
+class TeamMemberBulkSerializer(FieldMixin, serializers.Serializer):
+    """
+    Serializer to add, reactivate and remove many members of a team at once.
+    Members are resolved and matched with the rows of the team in one query each,
+    then new rows are inserted, existing ones updated and removed ones deactivated
+    with bulk statements, so the number of queries does not grow with the list.
+    """
+
+    default_error_messages = {
+        'does_not_exist': (
+            relations.PrimaryKeyRelatedField.default_error_messages['does_not_exist']
+        ),
+        'duplicate_member': _('This member is repeated in the request.'),
+        'added_and_removed': _('Members cannot be added and removed at once.'),
+    }
+
+    team = PrimaryKeyRelatedField(queryset=Team.objects.all())
+    members = TeamMemberBulkItemSerializer(
+        many=True, required=False, default=list, max_length=settings.BULK_MAX_ROWS
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=settings.BULK_MAX_ROWS,
+        help_text=_('IDs of the members to remove from the team.'),
+    )
+    atomic = serializers.BooleanField(
+        default=True,
+        help_text=_(
+            'Whether nothing is changed if any row is invalid, otherwise the valid '
+            'rows are applied.'
+        ),
+    )
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        added = {row['member'] for row in attrs['members'] if row is not None}
+        if added & set(attrs['remove']):
+            raise serializers.ValidationError(
+                {'remove': [self.error_messages['added_and_removed']]}
+            )
+        if not self.has_team_permission(attrs['team'], added | set(attrs['remove'])):
+            raise exceptions.PermissionDenied(
+                _('You are not allowed to manage the members of this team.')
+            )
+        return attrs
+
+    def has_team_permission(self, team: Team, member_ids: set[int]) -> bool:
+        """
+        Check the auth member may write the rows of the members of the team, as
+        `TeamMemberPermission` does for each row: managers of the organization and
+        admins of the team act on anyone, other members of the team only on
+        themselves.
+        :param team: The team.
+        :param member_ids: IDs of the members added, updated or removed.
+        """
+        if not self.auth_member or self.auth_member.has_manager_permission:
+            return True
+        team_role = self.auth_context.team_roles.get(team.id)
+        if (
+            TeamMemberRoleChoices.get_rank(team_role)
+            >= TeamMemberRoleChoices.ADMIN.rank
+        ):
+            return True
+        return team_role is not None and member_ids <= {self.auth_member.id}
+
+    def get_member_ids(self, member_ids: set[int]) -> set[int]:
+        """Get the IDs, among the given ones, of the active members of the scope."""
+        return set(
+            Member.objects.filter(
+                id__in=member_ids,
+                organization_id=self.auth_organization_id,
+                is_active=True,
+            ).values_list('id', flat=True)
+        )
+
+    def create(self, validated_data) -> dict:
+        team, rows = validated_data['team'], validated_data['members']
+        errors = dict(self.fields['members'].row_errors)
+        member_ids = self.get_member_ids(
+            {row['member'] for row in rows if row is not None}
+        )
+        seen = set()
+        for index, row in enumerate(rows):
+            if row is None:
+                continue
+            if row['member'] not in member_ids:
+                message = self.error_messages['does_not_exist'].format(
+                    pk_value=row['member']
+                )
+                errors[index] = {'member': [message]}
+            elif row['member'] in seen:
+                errors[index] = {'member': [self.error_messages['duplicate_member']]}
+            seen.add(row['member'])
+
+        statuses, team_members, removed = {}, {}, 0
+        if not (errors and validated_data['atomic']):
+            statuses, team_members = self.upsert_members(
+                team,
+                {
+                    index: row
+                    for index, row in enumerate(rows)
+                    if row is not None and index not in errors
+                },
+            )
+            removed = self.remove_members(team, validated_data['remove'])
+            # The bulk writes send no signal and do not move the counters
+            status_counts = Counter(statuses.values())
+            joined = (
+                status_counts[BulkResultStatusChoices.CREATED]
+                + status_counts[BulkResultStatusChoices.REACTIVATED]
+            )
+            add_to_counters(Team, 'members_count', {team.id: joined - removed})
+            if team_members or removed:
+                invalidate_choices(TeamMember, team.organization_id)
+                invalidate_team_roles(
+                    *[team_member.member_id for team_member in team_members.values()],
+                    *validated_data['remove'],
+                )
+
+        results = []
+        for index, row in enumerate(rows):
+            if index in errors:
+                status = BulkResultStatusChoices.INVALID
+            else:
+                status = statuses.get(index, BulkResultStatusChoices.SKIPPED)
+            team_member = team_members.get(index)
+            results.append(
+                {
+                    'index': index,
+                    'status': status,
+                    'member': row['member'] if row else None,
+                    'id': team_member.id if team_member else None,
+                    'errors': errors.get(index),
+                }
+            )
+        counts = {
+            status: sum(result['status'] == status for result in results)
+            for status in [
+                BulkResultStatusChoices.CREATED,
+                BulkResultStatusChoices.REACTIVATED,
+                BulkResultStatusChoices.UPDATED,
+            ]
+        }
+        return {**counts, 'removed': removed, 'failed': len(errors), 'results': results}
+
+    def upsert_members(self, team: Team, rows: dict[int, dict]) -> tuple[dict, dict]:
+        """
+        Insert the new members of the team and reactivate or update the role of the
+        existing ones.
+        :param team: The team.
+        :param rows: Valid rows by index.
+        :return: Status and team member of each row, by index.
+        """
+        existing = {
+            team_member.member_id: team_member
+            for team_member in TeamMember.objects.filter(
+                team=team, member_id__in=[row['member'] for row in rows.values()]
+            )
+        }
+        now = timezone.now()
+        statuses, team_members, changed = {}, {}, []
+        for index, row in rows.items():
+            team_member = existing.get(row['member'])
+            if team_member is None:
+                team_member = TeamMember(
+                    team=team,
+                    member_id=row['member'],
+                    role=row['role'],
+                    created_by=self.auth_user,
+                    updated_by=self.auth_user,
+                )
+                statuses[index] = BulkResultStatusChoices.CREATED
+            elif not team_member.is_active:
+                statuses[index] = BulkResultStatusChoices.REACTIVATED
+            elif team_member.role != row['role']:
+                statuses[index] = BulkResultStatusChoices.UPDATED
+            else:
+                statuses[index] = BulkResultStatusChoices.UNCHANGED
+            if statuses[index] in [
+                BulkResultStatusChoices.REACTIVATED,
+                BulkResultStatusChoices.UPDATED,
+            ]:
+                team_member.is_active = True
+                team_member.role = row['role']
+                team_member.updated_by = self.auth_user
+                team_member.updated_at = now
+                changed.append(team_member)
+            team_members[index] = team_member
+
+        TeamMember.objects.bulk_create(
+            [
+                team_members[index]
+                for index, status in statuses.items()
+                if status == BulkResultStatusChoices.CREATED
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        TeamMember.objects.bulk_update(
+            changed,
+            fields=['is_active', 'role', 'updated_by', 'updated_at'],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        return statuses, team_members
+
+    def remove_members(self, team: Team, member_ids: list[int]) -> int:
+        """Deactivate the members of the team, returning how many were removed."""
+        if not member_ids:
+            return 0
+        return TeamMember.objects.filter(
+            team=team, member_id__in=member_ids, is_active=True
+        ).update(is_active=False, updated_by=self.auth_user, updated_at=timezone.now())
+
+
+class TeamMemberBulkResultSerializer(BulkResultSerializer):
+    member = serializers.IntegerField(allow_null=True)
+    id = serializers.IntegerField(allow_null=True)
+
+
+class TeamMemberBulkResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    reactivated = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    removed = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = TeamMemberBulkResultSerializer(many=True)
@@ -0,0 +1,68 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models.member import Member
+from apps.generics.models.cascades import rows_active_changed
+from apps.generics.utils.cache import invalidate_choices
+from apps.teams.models.team import Team
+from apps.teams.models.team_member import TeamMember
+from apps.teams.utils.cache import invalidate_team_roles
+
+
+@receiver([post_save, post_delete], sender=Team)
+def invalidate_choices_on_team_change(sender, instance: Team, **kwargs):
+    """Invalidate the cached choices that read the teams of the organization."""
+    invalidate_choices(Team, instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=TeamMember)
+def invalidate_choices_on_team_member_change(sender, instance: TeamMember, **kwargs):
+    """Invalidate the cached choices that read the team members of the organization."""
+    # The team is only read for its organization, without loading the whole row
+    if TeamMember.team.is_cached(instance):
+        organization_id = instance.team.organization_id
+    else:
+        organization_id = (
+            Team._base_manager.filter(pk=instance.team_id)
+            .values_list('organization_id', flat=True)
+            .first()
+        )
+    if organization_id is not None:
+        invalidate_choices(TeamMember, organization_id)
+
+
+@receiver([post_save, post_delete], sender=TeamMember)
+def invalidate_team_roles_on_team_member_change(sender, instance: TeamMember, **kwargs):
+    """Invalidate the cached team roles of a member who joined, left or changed role."""
+    invalidate_team_roles(instance.member_id)
+
+
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_team_roles_on_member_change(sender, instance: Member, **kwargs):
+    """Invalidate the cached team roles of a member created, deactivated or deleted."""
+    invalidate_team_roles(instance.id)
+
+
+@receiver(rows_active_changed, sender=Team)
+def invalidate_choices_on_teams_active_changed(sender, pks: list[int], **kwargs):
+    """Invalidate the cached choices of the teams flagged in bulk."""
+    organization_ids = set(
+        Team._base_manager.filter(pk__in=pks).values_list('organization_id', flat=True)
+    )
+    for organization_id in organization_ids:
+        invalidate_choices(Team, organization_id)
+
+
+@receiver(rows_active_changed, sender=TeamMember)
+def invalidate_on_team_members_active_changed(sender, pks: list[int], **kwargs):
+    """Invalidate the cached choices and team roles of team members flagged in bulk."""
+    rows = TeamMember._base_manager.filter(pk__in=pks).values_list(
+        'member_id', 'team__organization_id'
+    )
+    member_ids, organization_ids = set(), set()
+    for member_id, organization_id in rows:
+        member_ids.add(member_id)
+        organization_ids.add(organization_id)
+    for organization_id in organization_ids:
+        invalidate_choices(TeamMember, organization_id)
+    invalidate_team_roles(*member_ids)
@@ -0,0 +1,55 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.accounts.factories.organizations import OrganizationFactory
+from apps.accounts.tests.mixins import QueryPlanTestCaseMixin
+from apps.teams.factories.team_members import TeamMemberFactory
+from apps.teams.factories.teams import TeamFactory
+from apps.teams.filters.team_member import TeamMemberFilter
+from apps.teams.models.team import Team
+from apps.teams.models.team_member import TeamMember
+
+
+class TeamsIndexTestCase(QueryPlanTestCaseMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizations = OrganizationFactory.create_batch(size=3)
+        for organization in organizations:
+            TeamFactory.create_batch(size=5, organization=organization)
+            TeamMemberFactory.create_batch(size=5, organization=organization)
+        cls.organization = organizations[0]
+
+    def test_team_list_uses_index(self):
+        """Test the organization scoped team list uses an index."""
+        queryset = Team.objects.filter(
+            organization_id=self.organization.id, is_active=True
+        )
+        self.assertUsesIndex(queryset, 'team_org_active_idx')
+
+    def test_team_member_list_uses_indexes(self):
+        """Test the organization scoped team member list uses the indexes."""
+        queryset = TeamMember.objects.filter(
+            team__organization_id=self.organization.id, is_active=True
+        )
+        self.assertUsesIndex(queryset, 'team_member_team_active_idx')
+
+    @skipUnless(connection.vendor == 'postgresql', 'Trigram indexes need PostgreSQL')
+    def test_team_member_search_uses_trigram_indexes(self):
+        """Test the team member substring filters use the trigram indexes."""
+        team_member = TeamMember.objects.filter(
+            team__organization=self.organization
+        ).first()
+        for field, value, index_name in [
+            (
+                'member_full_name__icontains',
+                team_member.member.user.full_name,
+                'user_full_name_trgm_idx',
+            ),
+            ('team_name__icontains', team_member.team.name, 'team_name_trgm_idx'),
+        ]:
+            queryset = TeamMemberFilter(
+                data={field: value[1:-1]}, queryset=TeamMember.objects.all()
+            ).qs
+            self.assertUsesIndex(queryset, index_name)
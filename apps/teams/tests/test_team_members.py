@@ -1,23 +1,33 @@
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status as http_status
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 
 from apps.accounts.choices import MemberRoleChoices
 from apps.accounts.factories.members import MemberFactory
 from apps.accounts.factories.organizations import OrganizationFactory
-from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.accounts.tests.mixins import APITestCaseMixin, SharedCacheTestCaseMixin
+from apps.generics.pagination import KeysetPagination
 from apps.teams.choices import TeamMemberRoleChoices
 from apps.teams.factories.team_members import TeamMemberFactory
 from apps.teams.factories.teams import TeamFactory
+from apps.teams.models.team_member import TeamMember
+from apps.teams.utils.cache import get_member_team_roles, team_roles_cache
 
 
 class TeamMemberAPITestCase(APITestCaseMixin, APITestCase):
+    # Query budgets of the list and detail calls, whatever the number of rows
+    list_max_queries = 5
+    detail_max_queries = 4
+
     @classmethod
     def setUpTestData(cls):
         cls.detail_url_name = 'teams:team_members-detail'
         cls.list_url_name = 'teams:team_members-list'
         cls.list_url = reverse(cls.list_url_name)
         cls.choices_url = reverse('teams:team_members-choices')
+        cls.bulk_url = reverse('teams:team_members-bulk')
 
     def setUp(self):
         self.organization = self.new_account()
@@ -33,10 +43,78 @@ class TeamMemberAPITestCase(APITestCaseMixin, APITestCase):
         TeamMemberFactory.create_batch(size=7, organization=self.organization)
 
         for url in [self.list_url, self.choices_url]:
-            response = self.client.get(url)
+            response = self.client.get(url, max_queries=self.list_max_queries)
             self.assertEqual(response.status_code, http_status.HTTP_200_OK)
             self.assertEqual(response.data.get('count'), 7)
 
+    def test_list_team_members_min_role(self):
+        """Test the min_role filter, organization admins ranking as team owners."""
+        team = TeamFactory.create(organization=self.organization)
+        team_members = {
+            role: TeamMemberFactory.create(
+                organization=self.organization, team=team, role=role
+            )
+            for role in TeamMemberRoleChoices
+        }
+        admin = TeamMemberFactory.create(
+            organization=self.organization,
+            team=team,
+            member__role=MemberRoleChoices.ADMIN,
+        )
+
+        response = self.client.get(
+            self.list_url,
+            data={'min_role': TeamMemberRoleChoices.ADMIN},
+            max_queries=self.list_max_queries,
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(
+            {row['id'] for row in response.data.get('results')},
+            {
+                team_members[TeamMemberRoleChoices.OWNER].id,
+                team_members[TeamMemberRoleChoices.ADMIN].id,
+                admin.id,
+            },
+        )
+        self.assertTrue(admin.has_owner_permission)
+        self.assertFalse(
+            team_members[TeamMemberRoleChoices.MANAGER].has_admin_permission
+        )
+
+    def test_choices_team_members_invalidated_on_team_change(self):
+        """Test that deactivating a team drops its members from the cached choices."""
+        team_member = TeamMemberFactory.create(organization=self.organization)
+        response = self.client.get(self.choices_url)
+        self.assertEqual(response.data.get('count'), 1)
+
+        team_member.team.inactivate()
+        response = self.client.get(self.choices_url)
+        self.assertEqual(response.data.get('count'), 0)
+
+    def test_keyset_pagination_by_updated_at(self):
+        """Test keyset pages ordered by (updated_at, id) with ties on updated_at."""
+        team_members = TeamMemberFactory.create_batch(
+            size=12, organization=self.organization
+        )
+        updated_at = timezone.now()
+        TeamMember.objects.filter(id__in=[tm.id for tm in team_members[:6]]).update(
+            updated_at=updated_at
+        )
+        queryset = TeamMember.objects.filter(team__organization=self.organization)
+        expected = list(
+            queryset.order_by('-updated_at', '-id').values_list('id', flat=True)
+        )
+
+        ids = []
+        url = '/?cursor='
+        while url:
+            paginator = KeysetPagination(ordering=('-updated_at', '-id'))
+            paginator.page_size = 5
+            request = Request(APIRequestFactory().get(url))
+            ids.extend(tm.id for tm in paginator.paginate_queryset(queryset, request))
+            url = paginator.get_next_link()
+        self.assertEqual(ids, expected)
+
     def test_create_team_member(self):
         """Test creating a team member."""
         team = TeamFactory.create(organization=self.organization)
@@ -58,7 +136,10 @@ class TeamMemberAPITestCase(APITestCaseMixin, APITestCase):
         """Test retrieving a team member."""
         team_member = TeamMemberFactory.create(organization=self.organization)
 
-        response = self.client.get(reverse(self.detail_url_name, args=[team_member.id]))
+        response = self.client.get(
+            reverse(self.detail_url_name, args=[team_member.id]),
+            max_queries=self.detail_max_queries,
+        )
         self.assertEqual(response.status_code, http_status.HTTP_200_OK)
         self._assert_data(response, team_member)
 
@@ -131,6 +212,178 @@ class TeamMemberAPITestCase(APITestCaseMixin, APITestCase):
         )
         self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
 
+    def test_bulk_team_members(self):
+        """Test adding, reactivating, updating and removing team members at once."""
+        team = TeamFactory.create(organization=self.organization)
+        new_members = MemberFactory.create_batch(size=3, organization=self.organization)
+        inactive, updated, unchanged, removed = (
+            TeamMemberFactory.create(
+                team=team, organization=self.organization, is_active=is_active
+            )
+            for is_active in [False, True, True, True]
+        )
+        payload = {
+            'team': team.id,
+            'members': [
+                *({'member': member.id} for member in new_members),
+                {'member': inactive.member_id, 'role': TeamMemberRoleChoices.ADMIN},
+                {'member': updated.member_id, 'role': TeamMemberRoleChoices.MANAGER},
+                {'member': unchanged.member_id, 'role': unchanged.role},
+            ],
+            'remove': [removed.member_id],
+        }
+
+        response = self.client.post(self.bulk_url, data=payload, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['created'] * 3 + ['reactivated', 'updated', 'unchanged'],
+        )
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['removed'], 1)
+        self.assertEqual(response.data['results'][3]['id'], inactive.id)
+
+        active = TeamMember.objects.filter(team=team, is_active=True)
+        self.assertEqual(active.count(), 6)
+        self.assertEqual(active.get(id=inactive.id).role, TeamMemberRoleChoices.ADMIN)
+        self.assertEqual(active.get(id=updated.id).role, TeamMemberRoleChoices.MANAGER)
+        self.assertFalse(active.filter(id=removed.id).exists())
+
+    def test_bulk_team_members_atomic(self):
+        """Test nothing is changed when any row of an atomic bulk is invalid."""
+        team = TeamFactory.create(organization=self.organization)
+        member = MemberFactory.create(organization=self.organization)
+        other_member = MemberFactory.create(organization=OrganizationFactory.create())
+        payload = {
+            'team': team.id,
+            'members': [
+                {'member': member.id},
+                {'member': member.id},
+                {'member': other_member.id},
+                {'member': member.id, 'role': 'unknown'},
+            ],
+        }
+
+        response = self.client.post(self.bulk_url, data=payload, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['failed'], 3)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['skipped', 'invalid', 'invalid', 'invalid'],
+        )
+        self.assertFalse(TeamMember.objects.filter(team=team).exists())
+
+        payload['atomic'] = False
+        response = self.client.post(self.bulk_url, data=payload, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertTrue(TeamMember.objects.filter(team=team, member=member).exists())
+
+    def test_bulk_team_members_constant_queries(self):
+        """Test the number of queries of the bulk does not grow with the rows."""
+        members = MemberFactory.create_batch(size=20, organization=self.organization)
+        removed = MemberFactory.create(organization=self.organization)
+
+        query_counts = []
+        for size in [3, 4, 20]:
+            team = TeamFactory.create(organization=self.organization)
+            TeamMemberFactory.create(team=team, member=members[0], is_active=False)
+            TeamMemberFactory.create(team=team, member=members[1])
+            TeamMemberFactory.create(team=team, member=removed)
+            payload = {
+                'team': team.id,
+                'members': [
+                    {'member': member.id, 'role': TeamMemberRoleChoices.ADMIN}
+                    for member in members[:size]
+                ],
+                'remove': [removed.id],
+            }
+            with self.client.record_queries() as queries:
+                response = self.client.post(self.bulk_url, data=payload, format='json')
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[1], query_counts[2])
+
+    def test_not_permission_bulk_team_members(self):
+        """Test that a member outside the team cannot add members to it."""
+        team = TeamFactory.create(organization=self.organization)
+        simple_member = MemberFactory.create(
+            organization=self.organization,
+            role=MemberRoleChoices.MEMBER,
+        )
+        self.client.force_authenticate(member=simple_member)
+        response = self.client.post(
+            self.bulk_url,
+            data={'team': team.id, 'members': [{'member': simple_member.id}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+        self.assertFalse(TeamMember.objects.filter(team=team).exists())
+
+    def test_not_admin_bulk_team_members(self):
+        """Test that a plain member of the team can only remove themselves."""
+        team = TeamFactory.create(organization=self.organization)
+        simple_member = MemberFactory.create(
+            organization=self.organization,
+            role=MemberRoleChoices.MEMBER,
+        )
+        TeamMemberFactory.create(
+            team=team, member=simple_member, role=TeamMemberRoleChoices.MEMBER
+        )
+        other = TeamMemberFactory.create(team=team, organization=self.organization)
+        self.client.force_authenticate(member=simple_member)
+        for payload in [
+            {'team': team.id, 'remove': [other.member_id]},
+            {'team': team.id, 'remove': [simple_member.id, other.member_id]},
+            {
+                'team': team.id,
+                'members': [
+                    {'member': other.member_id, 'role': TeamMemberRoleChoices.ADMIN}
+                ],
+            },
+        ]:
+            response = self.client.post(self.bulk_url, data=payload, format='json')
+            self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            TeamMember.objects.filter(team=team, is_active=True).count(), 2
+        )
+
+        payload = {'team': team.id, 'remove': [simple_member.id]}
+        response = self.client.post(self.bulk_url, data=payload, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data['removed'], 1)
+
+    def test_save_does_not_load_team(self):
+        """Test saving a team member only reads the organization of its team."""
+        team_member = TeamMember.objects.get(
+            id=TeamMemberFactory.create(organization=self.organization).id
+        )
+        team_member.role = TeamMemberRoleChoices.ADMIN
+        with self.client.record_queries() as queries:
+            team_member.save()
+        self.assertFalse(
+            any('"teams_team"."name"' in query.sql for query in queries.queries)
+        )
+
+    def test_team_roles_not_cached_per_process(self):
+        """Test the team roles are read from the database over a process-local cache."""
+        team = TeamFactory.create(organization=self.organization)
+        team_member = TeamMemberFactory.create(
+            team=team, role=TeamMemberRoleChoices.ADMIN
+        )
+        locmem_caches = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        }
+        with self.settings(CACHES=locmem_caches):
+            roles = get_member_team_roles(team_member.member_id)
+            self.assertEqual(roles, {team.id: TeamMemberRoleChoices.ADMIN})
+            # A demotion whose invalidation only reached the cache of another worker
+            TeamMember.objects.filter(id=team_member.id).update(
+                role=TeamMemberRoleChoices.MEMBER
+            )
+            roles = get_member_team_roles(team_member.member_id)
+            self.assertEqual(roles, {team.id: TeamMemberRoleChoices.MEMBER})
+
     def test_not_authenticated_list_team_members(self):
         """Test listing team members without authentication."""
         self.client.force_authenticate(member=None)
@@ -252,3 +505,61 @@ class TeamMemberAPITestCase(APITestCaseMixin, APITestCase):
             reverse(self.detail_url_name, args=[team_member.id])
         )
         self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+
+
+class TeamRolesCacheAPITestCase(
+    SharedCacheTestCaseMixin, APITestCaseMixin, APITestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bulk_url = reverse('teams:team_members-bulk')
+
+    def setUp(self):
+        super().setUp()
+        self.organization = self.new_account()
+
+    def test_team_roles_cached_and_invalidated(self):
+        """Test the team roles of a member are loaded once and follow the writes."""
+        team, other_team = TeamFactory.create_batch(
+            size=2, organization=self.organization
+        )
+        simple_member = MemberFactory.create(
+            organization=self.organization,
+            role=MemberRoleChoices.MEMBER,
+        )
+        team_member = TeamMemberFactory.create(
+            team=team, member=simple_member, role=TeamMemberRoleChoices.ADMIN
+        )
+        team_roles_cache.clear_local()
+        get_member_team_roles(simple_member.id)
+        with self.client.record_queries(max_queries=0):
+            team_roles = get_member_team_roles(simple_member.id)
+        self.assertEqual(team_roles, {team.id: TeamMemberRoleChoices.ADMIN})
+        # Another worker reads them from the shared cache, in a single call
+        team_roles_cache.clear_local()
+        with self.client.record_queries() as queries:
+            self.assertEqual(get_member_team_roles(simple_member.id), team_roles)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries.queries[0].sql.startswith('CACHE default.get_many'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TeamMemberFactory.create(team=other_team, member=simple_member)
+        self.assertIn(other_team.id, get_member_team_roles(simple_member.id))
+
+        # The bulk writes bypass the signals
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.bulk_url,
+                data={'team': team.id, 'remove': [simple_member.id]},
+                format='json',
+            )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertNotIn(team.id, get_member_team_roles(simple_member.id))
+
+        self.client.force_authenticate(member=simple_member)
+        payload = {'team': team.id, 'members': [{'member': team_member.member_id}]}
+        response = self.client.post(self.bulk_url, data=payload, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_403_FORBIDDEN)
+        payload['team'] = other_team.id
+        response = self.client.post(self.bulk_url, data=payload, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
@@ -1,14 +1,30 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status as http_status
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 
 from apps.accounts.choices import MemberRoleChoices
 from apps.accounts.factories.members import MemberFactory
+from apps.accounts.factories.organizations import OrganizationFactory
+from apps.accounts.models.organization import Organization
 from apps.accounts.tests.mixins import APITestCaseMixin
+from apps.teams.factories.team_members import TeamMemberFactory
 from apps.teams.factories.teams import TeamFactory
+from apps.teams.models.team import Team
+from apps.teams.models.team_closure import TeamClosure
+from apps.teams.serializers.team import TeamMoveSerializer
 
 
 class TeamAPITestCase(APITestCaseMixin, APITestCase):
+    # Query budgets of the list and detail calls, whatever the number of rows
+    list_max_queries = 5
+    detail_max_queries = 3
+
     @classmethod
     def setUpTestData(cls):
         cls.detail_url_name = 'teams:teams-detail'
@@ -24,10 +40,36 @@ class TeamAPITestCase(APITestCaseMixin, APITestCase):
         TeamFactory.create_batch(size=8, organization=self.organization)
 
         for url in [self.list_url, self.choices_url]:
-            response = self.client.get(url)
+            response = self.client.get(url, max_queries=self.list_max_queries)
             self.assertEqual(response.status_code, http_status.HTTP_200_OK)
             self.assertEqual(response.data.get('count'), 8)
 
+    def test_list_and_choices_teams_conditional_get(self):
+        """Test that unchanged lists and choices answer 304 to If-None-Match."""
+        teams = TeamFactory.create_batch(size=3, organization=self.organization)
+
+        for url in [self.list_url, self.choices_url]:
+            response = self.client.get(url)
+            etag = response.headers['ETag']
+
+            response = self.client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, http_status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response.headers['ETag'], etag)
+            self.assertFalse(response.content)
+
+            response = self.client.get(
+                url, data={'page': 1}, headers={'If-None-Match': etag}
+            )
+            self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+
+        response = self.client.get(self.list_url)
+        etag = response.headers['ETag']
+        teams[0].name = 'Renamed'
+        teams[0].save()
+        response = self.client.get(self.list_url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertIn('Renamed', [team['name'] for team in response.data['results']])
+
     def test_create_team(self):
         """Test the create view of the teams."""
 
@@ -55,6 +97,7 @@ class TeamAPITestCase(APITestCaseMixin, APITestCase):
 
         response = self.client.get(
             path=reverse(self.detail_url_name, args=[team.id]),
+            max_queries=self.detail_max_queries,
         )
         self.assertEqual(response.status_code, http_status.HTTP_200_OK)
         self.assertEqual(response.data.get('name'), team.name)
@@ -84,6 +127,219 @@ class TeamAPITestCase(APITestCaseMixin, APITestCase):
         self.assertEqual(response.data.get('slug'), payload['slug'])
         self.assertEqual(response.data.get('organization'), self.organization.id)
 
+    def test_update_team_resolves_auth_member_once(self):
+        """Test that the authenticated member is loaded once per request."""
+        team = TeamFactory(organization=self.organization)
+
+        team_data = TeamFactory.build()
+        payload = {
+            'name': team_data.name,
+            'description': team_data.description,
+            'slug': team_data.slug,
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.put(
+                path=reverse(self.detail_url_name, args=[team.id]),
+                data=payload,
+                format='json',
+            )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        member_queries = [
+            query
+            for query in context.captured_queries
+            if 'FROM "accounts_member"' in query['sql']
+        ]
+        self.assertLessEqual(len(member_queries), 1)
+
+    def _create_hierarchy(self, depth: int) -> list[Team]:
+        """Helper method to create a chain of nested teams, from the root down."""
+        teams = [TeamFactory.create(organization=self.organization)]
+        for _ in range(depth - 1):
+            teams.append(
+                TeamFactory.create(organization=self.organization, parent=teams[-1])
+            )
+        return teams
+
+    def test_team_hierarchy_closure(self):
+        """Test the closure links follow the creation and the moves of the teams."""
+        root, child, grandchild = self._create_hierarchy(depth=3)
+        other_root = TeamFactory.create(organization=self.organization)
+
+        self.assertEqual(
+            set(
+                TeamClosure.objects.filter(descendant=grandchild).values_list(
+                    'ancestor_id', 'depth'
+                )
+            ),
+            {(grandchild.id, 0), (child.id, 1), (root.id, 2)},
+        )
+
+        child.parent = other_root
+        child.save()
+        self.assertEqual(
+            set(
+                Team.objects.filter_subtree(other_root.id).values_list('id', flat=True)
+            ),
+            {other_root.id, child.id, grandchild.id},
+        )
+        self.assertEqual(
+            list(Team.objects.filter_subtree(root.id).values_list('id', flat=True)),
+            [root.id],
+        )
+        self.assertEqual(
+            TeamClosure.objects.get(ancestor=other_root, descendant=grandchild).depth,
+            2,
+        )
+
+    def test_subtree_teams(self):
+        """Test the subtree view lists a deep subtree with a constant query count."""
+        teams = self._create_hierarchy(depth=8)
+        TeamFactory.create(organization=self.organization)
+
+        response = self.client.get(
+            reverse('teams:teams-subtree', args=[teams[2].id]),
+            max_queries=self.list_max_queries + 1,
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(
+            {row['id'] for row in response.data.get('results')},
+            {team.id for team in teams[2:]},
+        )
+
+        response = self.client.get(
+            reverse('teams:teams-subtree', args=[teams[2].id]),
+            data={'parent': teams[5].id},
+        )
+        self.assertEqual(
+            [row['id'] for row in response.data.get('results')], [teams[6].id]
+        )
+
+    def test_subtree_members(self):
+        """Test the members of a subtree are listed once, whatever their teams."""
+        root, child, grandchild = self._create_hierarchy(depth=3)
+        member = MemberFactory.create(organization=self.organization)
+        for team in [child, grandchild]:
+            TeamMemberFactory.create(team=team, member=member)
+        other = TeamMemberFactory.create(team=grandchild)
+        TeamMemberFactory.create(team=grandchild, is_active=False)
+        TeamMemberFactory.create(team=root)
+
+        response = self.client.get(
+            reverse('teams:teams-members', args=[child.id]),
+            max_queries=self.list_max_queries,
+        )
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertEqual(response.data.get('count'), 2)
+        self.assertEqual(
+            {row['id'] for row in response.data.get('results')},
+            {member.id, other.member_id},
+        )
+
+    def test_move_team(self):
+        """Test moving a team with its subtree, and that cycles are rejected."""
+        root, child, grandchild = self._create_hierarchy(depth=3)
+        url = reverse('teams:teams-move', args=[child.id])
+
+        for parent in [child, grandchild]:
+            response = self.client.post(url, data={'parent': parent.id}, format='json')
+            self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+            self.assertIn('parent', response.data)
+
+        response = self.client.post(url, data={'parent': None}, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_200_OK)
+        self.assertIsNone(response.data.get('parent'))
+        self.assertEqual(
+            set(Team.objects.filter_subtree(root.id).values_list('id', flat=True)),
+            {root.id},
+        )
+        self.assertEqual(
+            set(
+                TeamClosure.objects.filter(descendant=grandchild).values_list(
+                    'ancestor_id', flat=True
+                )
+            ),
+            {child.id, grandchild.id},
+        )
+
+        other_team = TeamFactory.create(organization=OrganizationFactory.create())
+        response = self.client.post(url, data={'parent': other_team.id}, format='json')
+        self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+
+    def test_parent_of_other_organization(self):
+        """Test a team cannot be nested under a team of another organization."""
+        team = TeamFactory.create(organization=self.organization)
+        other_team = TeamFactory.create(organization=OrganizationFactory.create())
+
+        for method, url in [
+            ('post', reverse(self.list_url_name)),
+            ('put', reverse(self.detail_url_name, args=[team.id])),
+            ('post', reverse('teams:teams-move', args=[team.id])),
+        ]:
+            response = getattr(self.client, method)(
+                url,
+                data={'name': 'Nested', 'slug': 'nested', 'parent': other_team.id},
+                format='json',
+            )
+            self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+            self.assertIn('parent', response.data)
+        self.assertFalse(TeamClosure.objects.filter(ancestor=other_team, depth=1))
+
+        # The related field only accepts the teams of the organization, the
+        # validation also rejects the others when given one
+        serializer = TeamMoveSerializer(team)
+        serializer.__dict__['auth_organization_id'] = self.organization.id
+        with self.assertRaises(ValidationError):
+            serializer.validate_parent(other_team)
+
+    def test_move_checks_cycle_once_locked(self):
+        """Test a move validated before a concurrent reverse move is rejected."""
+        first, second = TeamFactory.create_batch(size=2, organization=self.organization)
+        is_in_subtree_of = Team.is_in_subtree_of
+
+        def move_concurrently(team, ancestor):
+            # The reverse move commits between the validation and the save
+            if not second.parent_id:
+                second.parent = first
+                second.save()
+                return False
+            return is_in_subtree_of(team, ancestor)
+
+        with mock.patch.object(Team, 'is_in_subtree_of', move_concurrently):
+            response = self.client.post(
+                reverse('teams:teams-move', args=[first.id]),
+                data={'parent': second.id},
+                format='json',
+            )
+        self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+        self.assertIn('parent', response.data)
+        first.refresh_from_db()
+        self.assertIsNone(first.parent_id)
+
+    def test_move_locks_organization(self):
+        """Test the moves of the teams of an organization are serialized."""
+        first, second, third = TeamFactory.create_batch(
+            size=3, organization=self.organization
+        )
+        with mock.patch.object(
+            QuerySet,
+            'select_for_update',
+            autospec=True,
+            side_effect=QuerySet.select_for_update,
+        ) as lock:
+            for team, parent in [(first, second), (second, third), (third, first)]:
+                response = self.client.post(
+                    reverse('teams:teams-move', args=[team.id]),
+                    data={'parent': parent.id},
+                    format='json',
+                )
+        # The last move would close a cycle through teams the first one does not
+        # lock, so every move locks the organization
+        self.assertEqual(response.status_code, http_status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [call.args[0].model for call in lock.call_args_list], [Organization] * 2
+        )
+
     def test_delete_team(self):
         """Test the delete view of the teams."""
         team = TeamFactory(organization=self.organization)
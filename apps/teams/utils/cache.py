@@ -0,0 +1,40 @@
+from django.conf import settings
+
+from apps.generics.utils.cache import VersionedTwoTierCache
+from apps.teams.models.team_member import TeamMember
+
+MEMBER_SCOPE = 'member'
+
+team_roles_cache = VersionedTwoTierCache(
+    prefix='auth_team_roles',
+    timeout=settings.AUTH_CONTEXT_CACHE_TIMEOUT,
+    local_timeout=settings.AUTH_CONTEXT_CACHE_LOCAL_TIMEOUT,
+    local_maxsize=settings.AUTH_CONTEXT_CACHE_LOCAL_MAXSIZE,
+)
+
+
+def load_team_roles(member_id: int) -> dict[int, str]:
+    """Load the role of a member in each of the teams they are active in."""
+    return dict(
+        TeamMember.objects.filter(member_id=member_id, is_active=True).values_list(
+            'team_id', 'role'
+        )
+    )
+
+
+def get_member_team_roles(member_id: int) -> dict[int, str]:
+    """
+    Get the role of a member in each of their teams, by team ID, from the cache,
+    loading them from the database on a miss.
+    """
+    if not settings.AUTH_CONTEXT_CACHE_ENABLED:
+        return load_team_roles(member_id)
+    return team_roles_cache.get_or_set(
+        scopes={MEMBER_SCOPE: member_id},
+        default=lambda: load_team_roles(member_id),
+    )
+
+
+def invalidate_team_roles(*member_ids: int):
+    """Invalidate the cached team roles of the given members."""
+    team_roles_cache.invalidate(MEMBER_SCOPE, *set(member_ids))
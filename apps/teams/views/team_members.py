@@ -1,17 +1,24 @@
+from django.conf import settings
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import backends
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework import status as http_status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
-from apps.generics.utils.models import get_verbose_name
+from apps.generics.choices import BulkResultStatusChoices
+from apps.generics.utils.models import get_verbose_name, get_verbose_name_plural
 from apps.generics.utils.schema import extend_schema_model_view_set
 from apps.generics.views.mixins import ModelViewSetMixin, OrganizationScopedViewSetMixin
 from apps.teams.filters.team_member import TeamMemberFilter
 from apps.teams.models.team_member import TeamMember
 from apps.teams.permissions.team_member import TeamMemberPermission
 from apps.teams.serializers.team_member import (
+    TeamMemberBulkResponseSerializer,
+    TeamMemberBulkSerializer,
     TeamMemberSerializer,
     TeamMemberUpdateSerializer,
 )
@@ -28,6 +35,20 @@ from apps.teams.serializers.team_member import (
             http_status.HTTP_400_BAD_REQUEST: OpenApiTypes.NONE,
         },
     ),
+    bulk=extend_schema(
+        tags=TeamMember.schema_tags(),
+        description=_(
+            'Add, reactivate, update the role of and remove many %(name_plural)s of '
+            'a team at once, with a result per row. Nothing is changed if any row '
+            'is invalid, unless `atomic` is false.'
+            % {'name_plural': get_verbose_name_plural(TeamMember).lower()}
+        ),
+        request=TeamMemberBulkSerializer,
+        responses={
+            http_status.HTTP_200_OK: TeamMemberBulkResponseSerializer,
+            http_status.HTTP_400_BAD_REQUEST: TeamMemberBulkResponseSerializer,
+        },
+    ),
 )
 class TeamMemberViewSet(
     OrganizationScopedViewSetMixin, ModelViewSetMixin, viewsets.ModelViewSet
@@ -39,16 +60,44 @@ class TeamMemberViewSet(
     filterset_class = TeamMemberFilter
     filter_backends = [backends.DjangoFilterBackend]
     label_expression = TeamMember.label_expression()
+    keyset_ordering = ('-id',)
+    choices_cache_models = ('teams.Team', 'accounts.Member', settings.AUTH_USER_MODEL)
+    last_modified_fields = (
+        'updated_at',
+        'member__updated_at',
+        'member__user__updated_at',
+    )
+    fast_read = True
 
+    permission_select_related = ('team',)
     organization_filter = 'team__organization_id'
-    base_filters = {
-        'is_active': True,
-        'team__is_active': True,
-        'member__is_active': True,
-    }
+    base_filters = {'is_active': True}
 
     def get_serializer_class(self):
         """Get the serializer class for the view."""
         if self.action in ['update', 'partial_update']:
             return TeamMemberUpdateSerializer
+        elif self.action == 'bulk':
+            return TeamMemberBulkSerializer
         return super().get_serializer_class()
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """Add, reactivate and remove many members of a team at once."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            result = serializer.save()
+        applied = result['removed'] or any(
+            row['status']
+            not in [BulkResultStatusChoices.INVALID, BulkResultStatusChoices.SKIPPED]
+            for row in result['results']
+        )
+        return Response(
+            data=TeamMemberBulkResponseSerializer(result).data,
+            status=(
+                http_status.HTTP_400_BAD_REQUEST
+                if result['failed'] and not applied
+                else http_status.HTTP_200_OK
+            ),
+        )
@@ -1,15 +1,62 @@
+from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import backends
+from drf_spectacular.utils import OpenApiTypes, extend_schema
+from rest_framework import status as http_status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 
+from apps.accounts.models.member import Member
+from apps.accounts.serializers.member import MemberModelSerializer
+from apps.generics.utils.models import get_verbose_name, get_verbose_name_plural
 from apps.generics.utils.schema import extend_schema_model_view_set
 from apps.generics.views.mixins import ModelViewSetMixin, OrganizationScopedViewSetMixin
 from apps.teams.filters.team import TeamFilter
 from apps.teams.models.team import Team
+from apps.teams.models.team_member import TeamMember
 from apps.teams.permissions.team import TeamPermission
-from apps.teams.serializers.team import TeamSerializer
+from apps.teams.serializers.team import TeamMoveSerializer, TeamSerializer
 
 
-@extend_schema_model_view_set(model=Team)
+@extend_schema_model_view_set(
+    model=Team,
+    subtree=extend_schema(
+        responses=TeamSerializer(many=True),
+        tags=Team.schema_tags(),
+        description=_(
+            'List the %(name_plural)s of the subtree of a %(name)s, the %(name)s '
+            'included.'
+            % {
+                'name': get_verbose_name(Team),
+                'name_plural': get_verbose_name_plural(Team),
+            }
+        ),
+    ),
+    members=extend_schema(
+        responses=MemberModelSerializer(many=True),
+        tags=Team.schema_tags(),
+        description=_(
+            'List the %(name_plural)s of the subtree of a %(name)s, each once.'
+            % {
+                'name': get_verbose_name(Team),
+                'name_plural': get_verbose_name_plural(Member),
+            }
+        ),
+    ),
+    move=extend_schema(
+        request=TeamMoveSerializer,
+        responses={
+            http_status.HTTP_200_OK: TeamSerializer,
+            http_status.HTTP_400_BAD_REQUEST: OpenApiTypes.NONE,
+        },
+        tags=Team.schema_tags(),
+        description=_(
+            'Move a %(name)s, with its subtree, under another %(name)s or to the '
+            'root.' % {'name': get_verbose_name(Team)}
+        ),
+    ),
+)
 class TeamViewSet(
     OrganizationScopedViewSetMixin, ModelViewSetMixin, viewsets.ModelViewSet
 ):
@@ -20,3 +67,61 @@ class TeamViewSet(
     filterset_class = TeamFilter
     filter_backends = [backends.DjangoFilterBackend]
     label_expression = 'name'
+    keyset_ordering = ('-id',)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'subtree':
+            return queryset.filter_subtree(self.kwargs[self.lookup_field])
+        return queryset
+
+    def get_subtree_root(self) -> Team:
+        """Get the team at the root of a subtree, whatever the filters of the list."""
+        team = get_object_or_404(
+            super().get_queryset(),
+            **{self.lookup_field: self.kwargs[self.lookup_field]},
+        )
+        self.check_object_permissions(self.request, team)
+        return team
+
+    @action(detail=True, methods=['get'])
+    def subtree(self, request, *args, **kwargs):
+        """List the teams of the subtree of a team."""
+        self.get_subtree_root()
+        return self.list(request, *args, **kwargs)
+
+    @action(
+        detail=True,
+        methods=['get'],
+        serializer_class=MemberModelSerializer,
+        filter_backends=[],
+    )
+    def members(self, request, *args, **kwargs):
+        """List the members of the subtree of a team, each once."""
+        team = self.get_object()
+        queryset = (
+            Member.objects.select_related('user')
+            .filter(
+                is_active=True,
+                id__in=TeamMember.objects.filter_actives()
+                .filter_subtree(team.id)
+                .values('member_id'),
+            )
+            .order_by('-id')
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=True, methods=['post'], serializer_class=TeamMoveSerializer)
+    def move(self, request, *args, **kwargs):
+        """Move a team, with its subtree, under another team."""
+        team = self.get_object()
+        serializer = self.get_serializer(team, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(
+            TeamSerializer(team, context=self.get_serializer_context()).data
+        )
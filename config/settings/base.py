@@ -51,6 +51,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'apps.generics',
     'apps.accounts',
     'apps.teams',
 ]
@@ -74,7 +75,12 @@ MIDDLEWARE_THIRD_PARTY = [
 
 MIDDLEWARE_LOCAL = []
 
-MIDDLEWARE = MIDDLEWARE_THIRD_PARTY + MIDDLEWARE_DJANGO + MIDDLEWARE_LOCAL
+# Outermost, so the metrics cover the whole middleware stack
+MIDDLEWARE_METRICS = ['apps.generics.middleware.MetricsMiddleware']
+
+MIDDLEWARE = (
+    MIDDLEWARE_METRICS + MIDDLEWARE_THIRD_PARTY + MIDDLEWARE_DJANGO + MIDDLEWARE_LOCAL
+)
 
 ROOT_URLCONF = 'config.urls'
 
@@ -186,6 +192,21 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 FROM_MAIL = os.environ.get('FROM_MAIL', DEFAULT_FROM_EMAIL)
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 
+# Email outbox, delivered by the `deliver_emails` command
+EMAIL_OUTBOX_ENABLED = os.environ.get('EMAIL_OUTBOX_ENABLED', 'False').lower() == 'true'
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', 100))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.environ.get('EMAIL_OUTBOX_RETRY_DELAY', 60))
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(os.environ.get('EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600))
+EMAIL_OUTBOX_LEASE = int(os.environ.get('EMAIL_OUTBOX_LEASE', 600))
+
+# Email rendering cache, per template variant
+EMAIL_RENDER_CACHE_ENABLED = (
+    os.environ.get('EMAIL_RENDER_CACHE_ENABLED', 'True').lower() == 'true'
+)
+EMAIL_RENDER_CACHE_TIMEOUT = int(os.environ.get('EMAIL_RENDER_CACHE_TIMEOUT', 300))
+EMAIL_RENDER_CACHE_MAXSIZE = int(os.environ.get('EMAIL_RENDER_CACHE_MAXSIZE', 256))
+
 # Frontend URLs
 FRONTEND_URL = os.environ.get('FRONTEND_URL')
 FRONTEND_RESET_URL = os.environ.get('FRONTEND_RESET_URL')
@@ -202,7 +223,7 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ('django_filters.rest_framework.DjangoFilterBackend',),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.OrganizationJWTAuthentication',
     ),
 }
 
@@ -217,6 +238,11 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Carry the organization scope in the access token claims instead of the session
+ORGANIZATION_TOKEN_MODE = (
+    os.environ.get('ORGANIZATION_TOKEN_MODE', 'False').lower() == 'true'
+)
+
 # Drf Spectacular
 SPECTACULAR_SETTINGS = {
     'TITLE': gettext_lazy('CrewForge API'),
@@ -246,3 +272,77 @@ if cors_origins := os.environ.get('CORS_ALLOWED_ORIGINS'):
 
 # System settings
 SYSTEM_TITLE = os.environ.get('SYSTEM_TITLE', gettext_lazy('CrewForge'))
+
+# Cache shared by the workers, which the versioned caches below need to see each
+# other's invalidations, e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# and CACHE_LOCATION=redis://redis:6379/0 to use Redis. Over the default
+# process-local backend, or the database cache, the versioned caches are bypassed.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Auth context cache
+AUTH_CONTEXT_CACHE_ENABLED = (
+    os.environ.get('AUTH_CONTEXT_CACHE_ENABLED', 'True').lower() == 'true'
+)
+AUTH_CONTEXT_CACHE_TIMEOUT = int(os.environ.get('AUTH_CONTEXT_CACHE_TIMEOUT', 300))
+AUTH_CONTEXT_CACHE_LOCAL_TIMEOUT = int(
+    os.environ.get('AUTH_CONTEXT_CACHE_LOCAL_TIMEOUT', 5)
+)
+AUTH_CONTEXT_CACHE_LOCAL_MAXSIZE = int(
+    os.environ.get('AUTH_CONTEXT_CACHE_LOCAL_MAXSIZE', 1024)
+)
+
+# Choices action cache
+CHOICES_CACHE_ENABLED = (
+    os.environ.get('CHOICES_CACHE_ENABLED', 'True').lower() == 'true'
+)
+CHOICES_CACHE_TIMEOUT = int(os.environ.get('CHOICES_CACHE_TIMEOUT', 300))
+CHOICES_CACHE_LOCAL_TIMEOUT = int(os.environ.get('CHOICES_CACHE_LOCAL_TIMEOUT', 5))
+CHOICES_CACHE_LOCAL_MAXSIZE = int(os.environ.get('CHOICES_CACHE_LOCAL_MAXSIZE', 1024))
+
+# Query plans of the viewsets, computed from the shape of their serializers
+QUERY_PLAN_CACHE_MAXSIZE = int(os.environ.get('QUERY_PLAN_CACHE_MAXSIZE', 1024))
+
+# Invitation expiry compaction, run by the `expire_invites` command
+EXPIRE_INVITES_BATCH_SIZE = int(os.environ.get('EXPIRE_INVITES_BATCH_SIZE', 1000))
+EXPIRE_INVITES_SLEEP = float(os.environ.get('EXPIRE_INVITES_SLEEP', 0.1))
+
+# Counter repair, run by the `reconcile_counters` command
+RECONCILE_COUNTERS_CHUNK_SIZE = int(
+    os.environ.get('RECONCILE_COUNTERS_CHUNK_SIZE', 1000)
+)
+RECONCILE_COUNTERS_SLEEP = float(os.environ.get('RECONCILE_COUNTERS_SLEEP', 0.1))
+
+# Cascade repair, run by the `reconcile_cascades` command
+RECONCILE_CASCADES_CHUNK_SIZE = int(
+    os.environ.get('RECONCILE_CASCADES_CHUNK_SIZE', 1000)
+)
+RECONCILE_CASCADES_SLEEP = float(os.environ.get('RECONCILE_CASCADES_SLEEP', 0.1))
+
+# Prometheus metrics, exposed at METRICS_PATH. With METRICS_DIR, each worker
+# dumps its metrics to that directory and the exposition merges them.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_PATH = os.environ.get('METRICS_PATH', '/metrics')
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+# Bulk actions
+BULK_MAX_ROWS = int(os.environ.get('BULK_MAX_ROWS', 5000))
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 500))
+
+# Benchmark suite: seeded tenant size, timed requests and regression threshold
+BENCHMARK_MEMBERS = int(os.environ.get('BENCHMARK_MEMBERS', 1000))
+BENCHMARK_TEAMS = int(os.environ.get('BENCHMARK_TEAMS', 100))
+BENCHMARK_TEAM_MEMBERS = int(os.environ.get('BENCHMARK_TEAM_MEMBERS', 5000))
+BENCHMARK_ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 20))
+BENCHMARK_BASELINE = os.environ.get(
+    'BENCHMARK_BASELINE', os.path.join(BASE_DIR, 'benchmarks', 'baseline.json')
+)
+BENCHMARK_THRESHOLD = float(os.environ.get('BENCHMARK_THRESHOLD', 0.25))
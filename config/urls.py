@@ -9,6 +9,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from apps.generics.views.metrics import metrics_view
+
 django_urlpatterns = [
     path('admin/', admin.site.urls),
 ]
@@ -38,6 +40,7 @@ third_party_urlpatterns = [
 local_urlpatterns = [
     path('', include('apps.accounts.urls')),
     path('', include('apps.teams.urls')),
+    path(settings.METRICS_PATH.lstrip('/'), metrics_view, name='metrics'),
 ]
 
 urlpatterns = (
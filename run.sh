@@ -11,6 +11,11 @@ if [ "$ENVIRONMENT" = "production" ]; then
   uv run python manage.py migrate --settings="$DJANGO_SETTINGS_MODULE" --noinput
   uv run python manage.py collectstatic --no-input --settings="$DJANGO_SETTINGS_MODULE" --noinput --clear
 
+  # Drop the metrics of the workers of a previous run
+  if [ -n "${METRICS_DIR:-}" ]; then
+    rm -rf "$METRICS_DIR" && mkdir -p "$METRICS_DIR"
+  fi
+
   # Start Gunicorn
   exec uv run gunicorn ${DJANGO_WSGI_MODULE:-config.wsgi}:application \
     --bind 0.0.0.0:8000 \